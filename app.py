@@ -1,10 +1,210 @@
-from flask import Flask, render_template, request, jsonify
-from logic.expression_processor import ExpressionProcessor
-from logic.truth_table_generator import TruthTableGenerator
-from logic.normal_form_converter import NormalFormConverter
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from flask import Flask, Response, g, render_template, request, jsonify, stream_with_context
+from flask.json.provider import DefaultJSONProvider
+from logic.expression_processor import ExpressionError
 from logic.scheme_calculator import SchemeCalculator
+from logic.budget import Budget, BudgetExceeded
+from logic.task_pool import TaskPool, TaskPoolError, PoolSaturated, warm_up
+from logic import tasks
+from logic.tracing import tracing
+from logic.cache import ExpressionCache, CircuitCache, LRUCache
+from logic.result_store import open_store
+from logic.circuit import CircuitError
+from logic.circuit_session import CircuitSession
+from logic import metrics
+from logic.serialization import BINARY_MIMETYPE, compress, encode_binary, json_with_raw, rows_json
+
+
+class TimedJSONProvider(DefaultJSONProvider):
+    """Сериализация JSON как отдельный этап в метриках и Server-Timing"""
+
+    def dumps(self, obj, **kwargs):
+        with metrics.stage('serialize'):
+            return super().dumps(obj, **kwargs)
+
 
 app = Flask(__name__)
+app.json = TimedJSONProvider(app)
+app.config.setdefault('EXPRESSION_CACHE_SIZE', 512)
+app.config.setdefault('EXPRESSION_CACHE_TTL', 3600)  # секунд
+app.config.setdefault('CIRCUIT_CACHE_SIZE', 256)
+app.config.setdefault('CIRCUIT_CACHE_TTL', 3600)  # секунд
+# Сессии редактирования схем хранят столбцы всех блоков, поэтому таблица ограничена сильнее
+app.config.setdefault('SCHEME_SESSIONS_MAX', 64)
+app.config.setdefault('SCHEME_SESSION_TTL', 1800)  # секунд без обращений
+app.config.setdefault('SCHEME_SESSION_MAX_VARIABLES', 14)
+app.config.setdefault('BUDGET_MAX_VARIABLES', 20)
+app.config.setdefault('BUDGET_MAX_ROWS', 1 << 20)
+app.config.setdefault('BUDGET_MAX_EXPRESSION_SIZE', 2000)  # символов выражения или блоков схемы
+app.config.setdefault('BUDGET_TIME_LIMIT', 10.0)  # секунд на запрос
+app.config.setdefault('BATCH_MAX_JOBS', 1000)
+app.config.setdefault('BATCH_TIME_LIMIT', 30.0)  # секунд на весь пакет
+app.config.setdefault('SAT_MAX_MODELS', 1000)  # моделей в одном ответе режима models
+app.config.setdefault('SAT_MAX_CUBES', 10000)  # кубов при подсчете моделей (иначе нижняя оценка)
+# Число процессов для вычислений SymPy (0 - вычисления в потоке запроса)
+app.config.setdefault('TASK_POOL_WORKERS', int(os.environ.get('BOOLTRAINER_POOL_WORKERS', 0)))
+app.config.setdefault('TASK_POOL_MAX_PENDING', 32)
+app.config.setdefault('TASK_POOL_TIMEOUT_GRACE', 2.0)  # секунд сверх BUDGET_TIME_LIMIT
+# Уровень логов вычислительных модулей (DEBUG включает трассировку в лог)
+app.config.setdefault('LOG_LEVEL', os.environ.get('BOOLTRAINER_LOG_LEVEL', 'WARNING'))
+logging.getLogger('logic').setLevel(app.config['LOG_LEVEL'])
+# Файл SQLite с заранее вычисленными результатами (см. precompute.py); воркеры пула
+# открывают его по той же переменной окружения
+app.config.setdefault('RESULT_STORE_PATH', os.environ.get(tasks.STORE_ENV))
+# Метрики запросов для /metrics и время этапов в заголовке Server-Timing
+app.config.setdefault('METRICS_ENABLED', True)
+app.config.setdefault('SERVER_TIMING', True)
+# Сжатие ответов gzip (и brotli, если установлен модуль brotli) по Accept-Encoding
+app.config.setdefault('COMPRESSION_ENABLED', True)
+app.config.setdefault('COMPRESSION_MIN_SIZE', 1024)  # байт; меньшие ответы не сжимаются
+app.config.setdefault('COMPRESSION_LEVEL', 6)
+# Фоновый импорт SymPy после старта: импорт app его не загружает
+app.config.setdefault('WARMUP_ON_START', os.environ.get('BOOLTRAINER_WARMUP', '1') == '1')
+
+result_store = open_store(app.config['RESULT_STORE_PATH'])
+expression_cache = tasks.configure_cache(maxsize=app.config['EXPRESSION_CACHE_SIZE'],
+                                         ttl=app.config['EXPRESSION_CACHE_TTL'], store=result_store)
+circuit_cache = CircuitCache(maxsize=app.config['CIRCUIT_CACHE_SIZE'], ttl=app.config['CIRCUIT_CACHE_TTL'],
+                             store=result_store)
+scheme_sessions = LRUCache(maxsize=app.config['SCHEME_SESSIONS_MAX'], ttl=app.config['SCHEME_SESSION_TTL'])
+_task_pool = None
+_task_pool_lock = threading.Lock()
+
+STREAM_BATCH_ROWS = 1024  # Строк таблицы в одном фрагменте потокового ответа
+
+REQUEST_SECONDS = metrics.REGISTRY.histogram('booltrainer_request_seconds', 'Длительность обработки запроса',
+                                             ('endpoint',))
+REQUESTS = metrics.REGISTRY.counter('booltrainer_requests_total', 'Обработано запросов', ('endpoint', 'status'))
+
+
+@metrics.REGISTRY.register_collector
+def _cache_metrics():
+    """Счетчики кэшей процесса веб-сервера (кэши воркеров пула у каждого свои)"""
+    caches = {'expressions': expression_cache.stats(), 'circuits': circuit_cache.stats(),
+              'scheme_sessions': scheme_sessions.stats()}
+    if result_store is not None:
+        caches['result_store'] = result_store.stats()
+    families = [
+        ('booltrainer_cache_hits_total', 'counter', 'Попадания в кэш', 'hits'),
+        ('booltrainer_cache_misses_total', 'counter', 'Промахи кэша', 'misses'),
+        ('booltrainer_cache_evictions_total', 'counter', 'Вытеснения из кэша', 'evictions'),
+        ('booltrainer_cache_size', 'gauge', 'Записей в кэше', 'size'),
+    ]
+    return [(name, kind, help_text, [({'cache': cache}, stats[field]) for cache, stats in caches.items()])
+            for name, kind, help_text, field in families]
+
+
+@app.before_request
+def _start_request_metrics():
+    if app.config['METRICS_ENABLED']:
+        g.metrics_started = time.perf_counter()
+        metrics.start_timing()
+
+
+@app.after_request
+def _finish_request_metrics(response):
+    started = g.pop('metrics_started', None)
+    if started is None:
+        return response
+    elapsed = time.perf_counter() - started
+    endpoint = request.endpoint or 'unknown'
+    REQUEST_SECONDS.observe(elapsed, endpoint=endpoint)
+    REQUESTS.inc(endpoint=endpoint, status=response.status_code)
+    current = metrics.current_timings()
+    if app.config['SERVER_TIMING'] and current is not None:
+        # Для потоковых ответов учитывается время до начала выдачи
+        response.headers['Server-Timing'] = current.header(total=elapsed)
+    metrics.stop_timing()
+    return response
+
+
+@app.after_request
+def _compress_response(response):
+    """Сжатие больших ответов (выполняется до записи Server-Timing: хуки идут в обратном порядке)"""
+    if not app.config['COMPRESSION_ENABLED'] or response.status_code != 200 \
+            or response.direct_passthrough or response.is_streamed or 'Content-Encoding' in response.headers:
+        return response
+    body = response.get_data()
+    if len(body) < app.config['COMPRESSION_MIN_SIZE']:
+        return response
+    response.vary.add('Accept-Encoding')
+    with metrics.stage('compress'):
+        data, encoding = compress(body, request.accept_encodings, app.config['COMPRESSION_LEVEL'])
+    if encoding is not None:
+        response.set_data(data)
+        response.headers['Content-Encoding'] = encoding
+    return response
+
+
+def _budget_limits(with_deadline=True):
+    """Лимиты бюджета запроса по настройкам приложения"""
+    return {
+        'max_variables': app.config['BUDGET_MAX_VARIABLES'],
+        'max_rows': app.config['BUDGET_MAX_ROWS'],
+        'max_expression_size': app.config['BUDGET_MAX_EXPRESSION_SIZE'],
+        'time_limit': app.config['BUDGET_TIME_LIMIT'] if with_deadline else None
+    }
+
+def _request_budget(with_deadline=True):
+    """Бюджет текущего запроса по настройкам приложения"""
+    return Budget(**_budget_limits(with_deadline))
+
+def get_task_pool():
+    """Пул процессов (создается при первом обращении), None - если отключен"""
+    global _task_pool
+    if app.config['TASK_POOL_WORKERS'] <= 0:
+        return None
+    with _task_pool_lock:
+        if _task_pool is None:
+            _task_pool = TaskPool(workers=app.config['TASK_POOL_WORKERS'],
+                                  max_pending=app.config['TASK_POOL_MAX_PENDING'])
+        return _task_pool
+
+def _run_task(func, *args, trace=False, time_limit=None):
+    """Выполнение тяжелой задачи в пуле процессов или в потоке запроса
+
+    Возвращает пару (результат, события трассировки или None).
+    time_limit - срок задачи, если он отличается от BUDGET_TIME_LIMIT.
+    """
+    if trace:
+        func, args = tasks.traced, (func, *args)
+    pool = get_task_pool()
+    if pool is None:
+        result = func(*args)
+    else:
+        timeout = (time_limit or app.config['BUDGET_TIME_LIMIT']) + app.config['TASK_POOL_TIMEOUT_GRACE']
+        # Этапы, замеренные в воркере, учитываются в метриках веб-сервера
+        result, timings = pool.submit(tasks.timed, func, *args, timeout=timeout)
+        metrics.merge(timings)
+    return result if trace else (result, None)
+
+def _trace_payload(events):
+    """Поле trace ответа (только если трассировка запрошена)"""
+    return {'trace': events} if events is not None else {}
+
+def _pool_error(error):
+    """Ответ при перегрузке пула: 429 - очередь заполнена, 503 - воркер не ответил"""
+    status = 429 if isinstance(error, PoolSaturated) else 503
+    response = jsonify({'success': False, 'error': str(error), 'retry': True})
+    response.status_code = status
+    response.headers['Retry-After'] = '1'
+    return response
+
+def _budget_error(error):
+    """Структурированный ответ о превышении бюджета"""
+    return {'success': False, 'error': str(error), 'budget_exceeded': error.to_dict()}
+
+def _expression_error(error):
+    """Ответ об ошибке выражения (с позицией, если ошибка синтаксическая)"""
+    payload = {'success': False, 'error': str(error)}
+    if error.position is not None:
+        payload['position'] = error.position
+    return payload
 
 @app.route('/')
 def index():
@@ -18,22 +218,119 @@ def calculate_truth_table():
         variables_str = data.get('variables', '').strip()
         if not expression or not variables_str:
             return jsonify({'success': False, 'error': 'Expression and variables are required'})
-        processor = ExpressionProcessor(expression, variables_str) # Обработка выражения
-        processor.parse()
-        generator = TruthTableGenerator(processor.sympy_expression, processor.sympy_variables) # Генерация таблицы истинности
-        table = generator.generate()
-        analysis = generator.analyze()
-        return jsonify({
+        if data.get('stream'):
+            # Потоковая выдача идет в потоке запроса и ограничена размером таблицы, но не временем;
+            # построчный режим (выражение не компилируется) на порядки медленнее и получает срок
+            budget = _request_budget(with_deadline=False)
+            budget.check_expression(len(expression))
+            entry = expression_cache.get(expression, variables_str)
+            budget.check_variables(len(entry.variables))
+            generator = entry.generator(budget)
+            if generator.compile() is None:
+                generator = entry.generator(_request_budget())
+            return Response(stream_with_context(_stream_truth_table(entry.processor, generator)),
+                            mimetype='application/x-ndjson')
+        # Обработка выражения и генерация таблицы истинности (с кэшем)
+        extra = {}
+        truth_table = None
+        if data.get('kmap'):
+            # Карта Карно и импликанты - по той же таблице, без второго запроса
+            try:
+                (expression_str, truth_table, extra['kmap']), events = _run_task(
+                    tasks.karnaugh, expression, variables_str, _budget_limits(), trace=data.get('trace'))
+            except BudgetExceeded as e:
+                # Карта слишком велика, но таблица вычислима - отдаем таблицу без карты
+                if e.limit != 'max_kmap_variables':
+                    raise
+                extra = {'kmap': None, 'kmap_error': str(e)}
+        if truth_table is None:
+            (expression_str, truth_table), events = _run_task(tasks.truth_table, expression, variables_str,
+                                                              _budget_limits(), trace=data.get('trace'))
+        return _table_response(data, {
             'success': True,
-            'expression': str(processor.sympy_expression),
-            'table': table,
-            'analysis': analysis
-        })
+            'expression': expression_str,
+            'analysis': truth_table.analyze(),
+            **extra,
+            **_trace_payload(events)
+        }, truth_table)
+    except TaskPoolError as e:
+        return _pool_error(e)
+    except BudgetExceeded as e:
+        return jsonify(_budget_error(e))
     except ExpressionError as e:
-        return jsonify({'success': False, 'error': str(e)})
+        return jsonify(_expression_error(e))
     except Exception as e:
         return jsonify({'success': False, 'error': f'Server error: {str(e)}'})
 
+def _table_payload(data, truth_table):
+    """Таблица в запрошенном формате: список строк или упакованный столбец результата"""
+    if data.get('format') == 'packed':
+        return {'table_packed': truth_table.to_packed(data.get('encoding', 'base64'))}
+    return {'table': truth_table.rows()}
+
+
+def _table_response(data, payload, truth_table):
+    """Ответ с таблицей: двоичный (по Accept), упакованный JSON или список строк
+
+    Список строк собирается текстом по битовому столбцу (rows_json), без
+    словарей строк; двоичный формат - заголовок с полями payload и
+    упакованные столбцы выходов (см. logic.serialization).
+    """
+    if request.accept_mimetypes.best_match(['application/json', BINARY_MIMETYPE]) == BINARY_MIMETYPE:
+        with metrics.stage('serialize'):
+            body = encode_binary(truth_table, payload)
+        return Response(body, mimetype=BINARY_MIMETYPE)
+    if data.get('format') == 'packed':
+        return jsonify({**payload, **_table_payload(data, truth_table)})
+    with metrics.stage('serialize'):
+        body = json_with_raw(payload, table=rows_json(truth_table))
+    return Response(body, mimetype='application/json')
+
+
+def _stream_truth_table(processor, generator):
+    """Потоковая выдача таблицы истинности в формате NDJSON
+
+    Первая строка - заголовок со списком столбцов, далее по строке-массиву
+    на каждую строку таблицы, последняя строка - анализ (или ошибка).
+    """
+    columns = [str(var) for var in processor.sympy_variables] + ['result']
+    yield json.dumps({
+        'type': 'header',
+        'success': True,
+        'expression': str(processor.sympy_expression),
+        'columns': columns,
+        'total_rows': 1 << len(processor.sympy_variables)
+    }) + '\n'
+
+    try:
+        total, true_count = 0, 0
+        lines = []
+        for values, result in generator.iter_rows():
+            total += 1
+            true_count += result
+            lines.append(json.dumps([*values, result]))
+            if len(lines) >= STREAM_BATCH_ROWS:
+                yield '\n'.join(lines) + '\n'
+                lines = []
+        if lines:
+            yield '\n'.join(lines) + '\n'
+
+        yield json.dumps({
+            'type': 'analysis',
+            'analysis': {
+                'total_rows': total,
+                'true_results': true_count,
+                'false_results': total - true_count,
+                'is_tautology': true_count == total,
+                'is_contradiction': true_count == 0,
+                'is_satisfiable': true_count > 0
+            }
+        }) + '\n'
+    except BudgetExceeded as e:
+        yield json.dumps({'type': 'error', **_budget_error(e)}) + '\n'
+    except Exception as e:
+        yield json.dumps({'type': 'error', 'success': False, 'error': f'Server error: {str(e)}'}) + '\n'
+
 @app.route('/api/normal_forms', methods=['POST'])
 def calculate_normal_forms():
     try:
@@ -42,19 +339,21 @@ def calculate_normal_forms():
         variables_str = data.get('variables', '').strip()
         if not expression or not variables_str:
             return jsonify({'success': False, 'error': 'Expression and variables are required'})
-        processor = ExpressionProcessor(expression, variables_str)
-        processor.parse()
-        converter = NormalFormConverter(processor.sympy_expression)
-        cnf = converter.to_cnf()
-        dnf = converter.to_dnf()
+        (original, cnf, dnf), events = _run_task(tasks.normal_forms, expression, variables_str,
+                                                 _budget_limits(), trace=data.get('trace'))
         return jsonify({
             'success': True,
-            'original': str(processor.sympy_expression),
+            'original': original,
             'cnf': cnf,
-            'dnf': dnf
+            'dnf': dnf,
+            **_trace_payload(events)
         })
+    except TaskPoolError as e:
+        return _pool_error(e)
+    except BudgetExceeded as e:
+        return jsonify(_budget_error(e))
     except ExpressionError as e:
-        return jsonify({'success': False, 'error': str(e)})
+        return jsonify(_expression_error(e))
     except Exception as e:
         return jsonify({'success': False, 'error': f'Server error: {str(e)}'})
 
@@ -72,21 +371,344 @@ def calculate_scheme():
         if not scheme_data or not scheme_data.get('blocks'):
             return jsonify({'success': False, 'error': 'Схема не содержит элементов'})
 
-        calculator = SchemeCalculator(scheme_data, variables_str)
-        table = calculator.calculate_truth_table()
+        with tracing(bool(data.get('trace'))) as current:
+            calculator = SchemeCalculator(scheme_data, variables_str, budget=_request_budget(),
+                                          cache=circuit_cache)
+            truth_table = calculator.calculate_compact()
 
-        return jsonify({
+        return _table_response(data, {
             'success': True,
             'expression': 'Логическая схема',
-            'table': table
+            'outputs': truth_table.output_names,
+            **_trace_payload(current.to_list() if current is not None else None)
+        }, truth_table)
+    except BudgetExceeded as e:
+        return jsonify(_budget_error(e))
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)})
+
+def _session_budget():
+    """Бюджет запроса сессии схемы (с отдельным лимитом переменных)"""
+    limits = _budget_limits()
+    limits['max_variables'] = min(limits['max_variables'], app.config['SCHEME_SESSION_MAX_VARIABLES'])
+    return Budget(**limits)
+
+def _session_payload(data, session_id, session, recomputed):
+    """Ответ сессии схемы: таблица или ошибка незавершенной схемы"""
+    payload = {'session_id': session_id, 'recomputed': recomputed, 'blocks_count': len(session.blocks)}
+    try:
+        truth_table = session.truth_table()
+    except CircuitError as e:
+        return {'success': False, 'error': str(e), **payload}
+    return {'success': True, 'expression': 'Логическая схема', 'outputs': truth_table.output_names,
+            **payload, **_table_payload(data, truth_table)}
+
+@app.route('/api/scheme_session', methods=['POST'])
+def create_scheme_session():
+    """Сессия инкрементального расчета схемы: сервер хранит столбцы всех блоков"""
+    try:
+        data = request.get_json()
+        scheme_data = data.get('scheme') or {}
+        variables_str = data.get('variables', '').strip()
+        if not variables_str:
+            return jsonify({'success': False, 'error': 'Variables are required'})
+        variables = [v.strip() for v in variables_str.split(',') if v.strip()]
+
+        with tracing(bool(data.get('trace'))) as current:
+            session = CircuitSession.from_scheme(scheme_data, variables, budget=_session_budget(),
+                                                 cache=circuit_cache)
+        session_id = uuid.uuid4().hex
+        scheme_sessions.set(session_id, session)
+        return jsonify({
+            **_session_payload(data, session_id, session, len(session.blocks)),
+            **_trace_payload(current.to_list() if current is not None else None)
         })
+    except BudgetExceeded as e:
+        return jsonify(_budget_error(e))
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)})
+
+@app.route('/api/scheme_session/<session_id>', methods=['POST'])
+def edit_scheme_session(session_id):
+    """Применение правок (edits) к схеме сессии и пересчет только затронутых блоков
+
+    При ошибке правки сессия удаляется: клиент создает ее заново по полной схеме.
+    """
+    try:
+        data = request.get_json()
+        session = scheme_sessions.get(session_id)
+        if session is None:
+            return jsonify({'success': False, 'error': 'Session not found', 'session_expired': True})
+        edits = data.get('edits') or []
+        if not isinstance(edits, list):
+            return jsonify({'success': False, 'error': 'Edits must be a list'})
+
+        with session.lock, tracing(bool(data.get('trace'))) as current:
+            try:
+                for edit in edits:
+                    session.apply(edit)
+                recomputed = session.recompute(_session_budget())
+            except (CircuitError, BudgetExceeded):
+                scheme_sessions.delete(session_id)
+                raise
+            payload = _session_payload(data, session_id, session, recomputed)
+        return jsonify({**payload, **_trace_payload(current.to_list() if current is not None else None)})
+    except BudgetExceeded as e:
+        return jsonify({**_budget_error(e), 'session_expired': True})
+    except CircuitError as e:
+        return jsonify({'success': False, 'error': str(e), 'session_expired': True})
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)})
 
+@app.route('/api/scheme_session/<session_id>', methods=['DELETE'])
+def delete_scheme_session(session_id):
+    scheme_sessions.delete(session_id)
+    return jsonify({'success': True})
+
+@app.route('/api/equivalence', methods=['POST'])
+def check_equivalence():
+    """Равносильность выражения эталону с контрпримером, без построения таблицы"""
+    try:
+        data = request.get_json()
+        expression = data.get('expression', '').strip()
+        reference = data.get('reference', '').strip()
+        variables_str = data.get('variables', '').strip()
+        if not expression or not reference or not variables_str:
+            return jsonify({'success': False, 'error': 'Expression, reference and variables are required'})
+        (answer, expected, result), events = _run_task(tasks.equivalence, expression, reference, variables_str,
+                                                       _budget_limits(), trace=data.get('trace'))
+        counterexample = result['counterexample']
+        return jsonify({
+            'success': True,
+            'expression': answer,
+            'reference': expected,
+            'equivalent': result['equivalent'],
+            'method': result['method'],
+            'counterexample': counterexample and {
+                'values': counterexample['values'],
+                'expression': counterexample['first'],
+                'reference': counterexample['second']
+            },
+            **_trace_payload(events)
+        })
+    except TaskPoolError as e:
+        return _pool_error(e)
+    except BudgetExceeded as e:
+        return jsonify(_budget_error(e))
+    except ExpressionError as e:
+        return jsonify(_expression_error(e))
+    except Exception as e:
+        return jsonify({'success': False, 'error': f'Server error: {str(e)}'})
+
+@app.route('/api/sat', methods=['POST'])
+def solve_sat():
+    """Выполнимость, перечисление (mode=models, limit) и подсчет (mode=count) моделей SAT-решателем
+
+    Таблица истинности не строится, поэтому число переменных не ограничивается.
+    """
+    try:
+        data = request.get_json()
+        expression = data.get('expression', '').strip()
+        variables_str = data.get('variables', '').strip()
+        mode = data.get('mode', 'solve')
+        if not expression or not variables_str:
+            return jsonify({'success': False, 'error': 'Expression and variables are required'})
+        if mode not in tasks.SAT_MODES:
+            return jsonify({'success': False, 'error': f"Unknown mode: {mode}"})
+        maximum = app.config['SAT_MAX_CUBES'] if mode == 'count' else app.config['SAT_MAX_MODELS']
+        try:
+            limit = min(int(data.get('limit', maximum if mode == 'count' else 10)), maximum)
+        except (TypeError, ValueError):
+            return jsonify({'success': False, 'error': 'Limit must be an integer'})
+        if limit < 1:
+            return jsonify({'success': False, 'error': 'Limit must be positive'})
+
+        if mode == 'models' and data.get('stream'):
+            # Модели выдаются по мере нахождения; срок бюджета действует на весь поток
+            budget = _request_budget()
+            budget.check_expression(len(expression))
+            entry = expression_cache.get(expression, variables_str)
+            return Response(stream_with_context(_stream_models(entry, tasks.sat_problem(entry, budget), limit)),
+                            mimetype='application/x-ndjson')
+
+        (expression_str, result), events = _run_task(tasks.sat, expression, variables_str, mode, limit,
+                                                     _budget_limits(), trace=data.get('trace'))
+        return jsonify({
+            'success': True,
+            'expression': expression_str,
+            'mode': mode,
+            **result,
+            **_trace_payload(events)
+        })
+    except TaskPoolError as e:
+        return _pool_error(e)
+    except BudgetExceeded as e:
+        return jsonify(_budget_error(e))
+    except ExpressionError as e:
+        return jsonify(_expression_error(e))
+    except Exception as e:
+        return jsonify({'success': False, 'error': f'Server error: {str(e)}'})
+
+def _stream_models(entry, problem, limit):
+    """Потоковая выдача моделей в формате NDJSON
+
+    Первая строка - заголовок со списком переменных, далее по строке-массиву
+    значений на каждую модель, последняя строка - итог (или ошибка).
+    """
+    yield json.dumps({
+        'type': 'header',
+        'success': True,
+        'expression': entry.text,
+        'columns': problem.variables
+    }) + '\n'
+
+    try:
+        count = 0
+        for model in problem.models(limit):
+            count += 1
+            yield json.dumps([model[name] for name in problem.variables]) + '\n'
+        yield json.dumps({
+            'type': 'done',
+            'models': count,
+            'complete': count < limit or problem.exhausted()
+        }) + '\n'
+    except BudgetExceeded as e:
+        yield json.dumps({'type': 'error', **_budget_error(e)}) + '\n'
+    except Exception as e:
+        yield json.dumps({'type': 'error', 'success': False, 'error': f'Server error: {str(e)}'}) + '\n'
+
+@app.route('/api/synthesize', methods=['POST'])
+def synthesize_scheme():
+    """Схема из элементов AND/OR/XOR/NOT по выражению (формат /api/calculate_scheme)"""
+    try:
+        data = request.get_json()
+        expression = data.get('expression', '').strip()
+        variables_str = data.get('variables', '').strip()
+        if not expression or not variables_str:
+            return jsonify({'success': False, 'error': 'Expression and variables are required'})
+
+        (expression_str, scheme, stats), events = _run_task(tasks.synthesis, expression, variables_str,
+                                                            _budget_limits(), trace=data.get('trace'))
+        return jsonify({
+            'success': True,
+            'expression': expression_str,
+            'scheme': scheme,
+            'stats': stats,
+            **_trace_payload(events)
+        })
+    except TaskPoolError as e:
+        return _pool_error(e)
+    except BudgetExceeded as e:
+        return jsonify(_budget_error(e))
+    except ExpressionError as e:
+        return jsonify(_expression_error(e))
+    except Exception as e:
+        return jsonify({'success': False, 'error': f'Server error: {str(e)}'})
+
+@app.route('/api/batch', methods=['POST'])
+def calculate_batch():
+    """Пакетная обработка заданий {expression, variables, operations}
+
+    Одинаковые задания вычисляются один раз, результаты возвращаются
+    в порядке заданий, ошибки - отдельно для каждого задания.
+    """
+    try:
+        data = request.get_json()
+        jobs = data.get('jobs')
+        if not isinstance(jobs, list) or not jobs:
+            return jsonify({'success': False, 'error': 'Jobs list is required'})
+        if len(jobs) > app.config['BATCH_MAX_JOBS']:
+            return jsonify({'success': False,
+                            'error': f"Too many jobs: {len(jobs)} > {app.config['BATCH_MAX_JOBS']}"})
+
+        unique = {}  # ключ задания -> (выражение, переменные, операции)
+        job_keys = []
+        for job in jobs:
+            key, error = _batch_job_key(job)
+            if key is not None and key not in unique:
+                unique[key] = (job['expression'].strip(), job['variables'].strip(), key[1])
+            job_keys.append(key if key is not None else error)
+
+        limits = {**_budget_limits(), 'time_limit': app.config['BATCH_TIME_LIMIT']}
+        results, events = _run_task(tasks.batch, list(unique.values()), limits,
+                                    trace=data.get('trace'), time_limit=app.config['BATCH_TIME_LIMIT'])
+        computed = dict(zip(unique, results))
+
+        output = []
+        for job, key in zip(jobs, job_keys):
+            if isinstance(key, str):
+                output.append({'success': False, 'error': key})
+            else:
+                output.append(_batch_result({**data, **job}, key[1], computed[key]))
+
+        return jsonify({
+            'success': True,
+            'results': output,
+            'jobs': len(jobs),
+            'unique_jobs': len(unique),
+            **_trace_payload(events)
+        })
+    except TaskPoolError as e:
+        return _pool_error(e)
+    except Exception as e:
+        return jsonify({'success': False, 'error': f'Server error: {str(e)}'})
+
+def _batch_job_key(job):
+    """Ключ задания для дедупликации: (канонический ключ выражения, операции) или (None, ошибка)"""
+    if not isinstance(job, dict):
+        return None, 'Job must be an object'
+    expression = job.get('expression')
+    variables_str = job.get('variables')
+    if not isinstance(expression, str) or not isinstance(variables_str, str) \
+            or not expression.strip() or not variables_str.strip():
+        return None, 'Expression and variables are required'
+    operations = job.get('operations') or ['truth_table']
+    if not isinstance(operations, list):
+        return None, 'Operations must be a list'
+    unknown = [op for op in operations if op not in tasks.BATCH_OPERATIONS]
+    if unknown:
+        return None, f"Unknown operations: {', '.join(map(str, unknown))}"
+    return (ExpressionCache.make_key(expression, variables_str), tuple(sorted(set(operations)))), None
+
+def _batch_result(options, operations, result):
+    """Ответ на одно задание пакета в формате одиночных endpoint'ов"""
+    if 'error' in result:
+        return {'success': False, **result}
+    payload = {'success': True, 'expression': result['expression']}
+    if 'truth_table' in operations:
+        payload.update(_table_payload(options, result['truth_table']))
+    if 'analysis' in result:
+        payload['analysis'] = result['analysis']
+    elif 'truth_table' in result:
+        payload['analysis'] = result['truth_table'].analyze()
+    if 'normal_forms' in operations:
+        payload['cnf'] = result['cnf']
+        payload['dnf'] = result['dnf']
+    if 'kmap' in operations:
+        payload['kmap'] = result['kmap']
+    return payload
+
+@app.route('/api/cache/stats', methods=['GET'])
+def cache_stats():
+    """Счетчики кэшей выражений и схем, хранилища результатов и пула процессов (кэши воркеров у каждого свои)"""
+    return jsonify({
+        'success': True,
+        'expressions': expression_cache.stats(),
+        'circuits': circuit_cache.stats(),
+        'result_store': result_store.stats() if result_store is not None else None,
+        'task_pool': _task_pool.stats() if _task_pool is not None else None
+    })
+
+@app.route('/metrics', methods=['GET'])
+def metrics_endpoint():
+    """Метрики в текстовом формате Prometheus"""
+    return Response(metrics.REGISTRY.render(), mimetype='text/plain; version=0.0.4')
+
 @app.route('/api/test', methods=['GET'])
 def test_endpoint():
     """Тестовый endpoint для проверки работы"""
     from sympy import symbols
+    from logic.truth_table_generator import TruthTableGenerator
 
     # Тестируем простое выражение
     a, b = symbols('a b')
@@ -102,6 +724,15 @@ def test_endpoint():
         'expected': 'False for (0,0), (0,1), (1,0); True for (1,1)'
     })
 
+def start_warmup():
+    """Прогрев вычислительных модулей в фоновом потоке"""
+    thread = threading.Thread(target=warm_up, name='logic-warmup', daemon=True)
+    thread.start()
+    return thread
+
+if app.config['WARMUP_ON_START']:
+    start_warmup()
+
 
 if __name__ == '__main__':
     app.run(debug=True, port=5000)
\ No newline at end of file
@@ -0,0 +1,255 @@
+"""ASGI-режим сервера: тонкий адаптер над Flask-приложением
+
+Запуск: uvicorn asgi:application (или любой другой ASGI-сервер).
+
+Дешевые запросы (страница, статика, счетчики) выполняются прямо в цикле
+событий. Запросы к вычислительным endpoint'ам передаются в пул потоков,
+поэтому медленный расчет не задерживает остальные запросы. Для каждого
+endpoint'а действует свой лимит одновременных запросов: запрос сверх
+лимита ждет в очереди не дольше ASGI_QUEUE_TIMEOUT и получает 429.
+"""
+import asyncio
+import io
+import json
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from werkzeug.exceptions import HTTPException
+
+from app import app
+
+app.config.setdefault('ASGI_EXECUTOR_WORKERS', 8)
+# Endpoint'ы, которые выполняются в цикле событий без передачи в пул потоков
+app.config.setdefault('ASGI_INLINE_ENDPOINTS', ('index', 'static', 'cache_stats', 'metrics_endpoint',
+                                                 'delete_scheme_session'))
+# Лимиты одновременных запросов по имени endpoint'а (остальные - ASGI_DEFAULT_LIMIT)
+app.config.setdefault('ASGI_ENDPOINT_LIMITS', {
+    'calculate_truth_table': 4,
+    'calculate_normal_forms': 4,
+    'check_equivalence': 4,
+    'solve_sat': 4,
+    'synthesize_scheme': 4,
+    'calculate_batch': 2,
+})
+app.config.setdefault('ASGI_DEFAULT_LIMIT', 8)
+app.config.setdefault('ASGI_QUEUE_TIMEOUT', 5.0)  # секунд ожидания свободного места
+
+
+class ASGIAdapter:
+    """ASGI-приложение поверх WSGI-приложения Flask"""
+
+    STREAM_QUEUE_SIZE = 16  # Фрагментов ответа между потоком пула и циклом событий
+
+    def __init__(self, wsgi_app):
+        self.wsgi_app = wsgi_app
+        self.config = wsgi_app.config
+        self._executor = None
+        self._semaphores = {}
+
+    @property
+    def executor(self):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.config['ASGI_EXECUTOR_WORKERS'],
+                                                thread_name_prefix='asgi')
+        return self._executor
+
+    def endpoint(self, method, path):
+        """Имя endpoint'а Flask для запроса (None - маршрут не найден)"""
+        try:
+            endpoint, _ = self.wsgi_app.url_map.bind('').match(path, method)
+        except HTTPException:
+            return None
+        return endpoint
+
+    def semaphore(self, endpoint):
+        """Семафор лимита endpoint'а (создается в цикле событий при первом запросе)"""
+        if endpoint not in self._semaphores:
+            limit = self.config['ASGI_ENDPOINT_LIMITS'].get(endpoint, self.config['ASGI_DEFAULT_LIMIT'])
+            self._semaphores[endpoint] = asyncio.Semaphore(limit)
+        return self._semaphores[endpoint]
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+        elif scope['type'] == 'http':
+            await self._http(scope, receive, send)
+        else:
+            raise RuntimeError(f"Неподдерживаемый тип соединения: {scope['type']}")
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                self.shutdown()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    async def _http(self, scope, receive, send):
+        body = await self._read_body(receive)
+        environ = self._environ(scope, body)
+        endpoint = self.endpoint(scope['method'], scope['path'])
+
+        if endpoint is None or endpoint in self.config['ASGI_INLINE_ENDPOINTS']:
+            await self._respond(environ, send, offload=False)
+            return
+
+        semaphore = self.semaphore(endpoint)
+        try:
+            await asyncio.wait_for(semaphore.acquire(), self.config['ASGI_QUEUE_TIMEOUT'])
+        except asyncio.TimeoutError:
+            await self._saturated(send)
+            return
+        try:
+            await self._respond(environ, send, offload=True)
+        finally:
+            semaphore.release()
+
+    @staticmethod
+    async def _read_body(receive):
+        chunks = []
+        while True:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                break
+            chunks.append(message.get('body', b''))
+            if not message.get('more_body'):
+                break
+        return b''.join(chunks)
+
+    @staticmethod
+    def _environ(scope, body):
+        """WSGI environ по ASGI scope (PEP 3333)"""
+        server = scope.get('server') or ('localhost', 80)
+        client = scope.get('client') or ('', 0)
+        environ = {
+            'REQUEST_METHOD': scope['method'],
+            'SCRIPT_NAME': scope.get('root_path', '').encode('utf-8').decode('latin-1'),
+            'PATH_INFO': scope['path'].encode('utf-8').decode('latin-1'),
+            'QUERY_STRING': scope.get('query_string', b'').decode('latin-1'),
+            'SERVER_NAME': server[0],
+            'SERVER_PORT': str(server[1]),
+            'SERVER_PROTOCOL': f"HTTP/{scope.get('http_version', '1.1')}",
+            'REMOTE_ADDR': client[0],
+            'CONTENT_LENGTH': str(len(body)),
+            'wsgi.version': (1, 0),
+            'wsgi.url_scheme': scope.get('scheme', 'http'),
+            'wsgi.input': io.BytesIO(body),
+            'wsgi.errors': sys.stderr,
+            'wsgi.multithread': True,
+            'wsgi.multiprocess': False,
+            'wsgi.run_once': False,
+        }
+        for name, value in scope.get('headers', []):
+            name = name.decode('latin-1').upper().replace('-', '_')
+            value = value.decode('latin-1')
+            if name == 'CONTENT_TYPE':
+                environ['CONTENT_TYPE'] = value
+            elif name != 'CONTENT_LENGTH':
+                key = f'HTTP_{name}'
+                environ[key] = f'{environ[key]},{value}' if key in environ else value
+        return environ
+
+    def _call_wsgi(self, environ):
+        """Вызов приложения: (статус, заголовки, итератор тела)"""
+        started = {}
+
+        def start_response(status, headers, exc_info=None):
+            started['status'] = int(status.split(' ', 1)[0])
+            started['headers'] = [(name.lower().encode('latin-1'), value.encode('latin-1'))
+                                  for name, value in headers]
+
+        body = self.wsgi_app(environ, start_response)
+        return started['status'], started['headers'], body
+
+    async def _respond(self, environ, send, offload):
+        if not offload:
+            status, headers, body = self._call_wsgi(environ)
+            await send({'type': 'http.response.start', 'status': status, 'headers': headers})
+            try:
+                for chunk in body:
+                    if chunk:
+                        await send({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+            finally:
+                if hasattr(body, 'close'):
+                    body.close()
+            await send({'type': 'http.response.body', 'body': b'', 'more_body': False})
+            return
+
+        # Весь ответ (и вызов, и чтение тела) формируется в одном потоке пула: контекст
+        # запроса Flask нельзя переносить между потоками. Фрагменты передаются в цикл
+        # событий через ограниченную очередь: поток пула ждет, пока клиент заберет
+        # предыдущие, поэтому потоковые ответы (NDJSON) не накапливаются в памяти.
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue(maxsize=self.STREAM_QUEUE_SIZE)
+        cancelled = threading.Event()
+
+        def put(item):
+            """Передача фрагмента с ожиданием места; False - ответ больше не нужен"""
+            if cancelled.is_set():
+                return False
+            asyncio.run_coroutine_threadsafe(queue.put(item), loop).result()
+            return not cancelled.is_set()
+
+        def produce():
+            try:
+                status, headers, body = self._call_wsgi(environ)
+                try:
+                    if not put(('start', (status, headers))):
+                        return
+                    for chunk in body:
+                        if chunk and not put(('body', chunk)):
+                            return
+                finally:
+                    if hasattr(body, 'close'):
+                        body.close()
+                put(('end', None))
+            except BaseException as e:
+                put(('error', e))
+
+        producer = loop.run_in_executor(self.executor, produce)
+        finished = False
+        try:
+            while True:
+                kind, value = await queue.get()
+                if kind == 'start':
+                    await send({'type': 'http.response.start', 'status': value[0], 'headers': value[1]})
+                elif kind == 'body':
+                    await send({'type': 'http.response.body', 'body': value, 'more_body': True})
+                elif kind == 'end':
+                    break
+                else:
+                    await producer
+                    raise value
+            finished = True
+        finally:
+            if not finished:
+                # Клиент отключился или произошла ошибка: освобождаем очередь, чтобы
+                # поток пула не остался ждать места, и прекращаем чтение тела
+                cancelled.set()
+                while not queue.empty():
+                    queue.get_nowait()
+        await producer
+        await send({'type': 'http.response.body', 'body': b'', 'more_body': False})
+
+    @staticmethod
+    async def _saturated(send):
+        """429, как при переполнении пула процессов"""
+        body = json.dumps({'success': False, 'error': 'Сервер перегружен, повторите запрос позже',
+                           'retry': True}).encode('utf-8')
+        await send({'type': 'http.response.start', 'status': 429, 'headers': [
+            (b'content-type', b'application/json'),
+            (b'content-length', str(len(body)).encode('latin-1')),
+            (b'retry-after', b'1'),
+        ]})
+        await send({'type': 'http.response.body', 'body': body, 'more_body': False})
+
+
+application = ASGIAdapter(app)
@@ -0,0 +1,57 @@
+"""Сравнение разбора выражений через parse_expr SymPy и собственным парсером
+
+Запуск: python benchmarks/parser_benchmark.py [число повторов]
+"""
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sympy.parsing.sympy_parser import parse_expr, standard_transformations
+
+from logic.parser import parse, to_sympy
+
+
+EXPRESSIONS = [
+    'a & b',
+    '!(a && b) || c',
+    '(a | b) & (~a | c) & (b | ~c)',
+    ' | '.join(f'(x{i} & ~x{i + 1})' for i in range(16)),
+]
+
+
+def measure(func, expression, repeats):
+    started = time.perf_counter()
+    for _ in range(repeats):
+        func(expression)
+    return (time.perf_counter() - started) / repeats * 1e6
+
+
+def normalize_syntax(expression):
+    """Прежняя замена альтернативных обозначений перед parse_expr"""
+    return (expression
+            .replace('&&', '&')
+            .replace('||', '|')
+            .replace('!', '~'))
+
+
+def sympy_parse(expression):
+    normalized = normalize_syntax(expression)
+    return parse_expr(normalized, transformations=standard_transformations, evaluate=False)
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+
+    print(f"{'length':>6} {'parse_expr, us':>15} {'ast, us':>9} {'ast+sympy, us':>14} {'speedup':>8}")
+    for expression in EXPRESSIONS:
+        sympy_time = measure(sympy_parse, expression, repeats)
+        ast_time = measure(parse, expression, repeats)
+        full_time = measure(lambda text: to_sympy(parse(text)), expression, repeats)
+        print(f"{len(expression):>6} {sympy_time:>15.1f} {ast_time:>9.1f} {full_time:>14.1f} "
+              f"{sympy_time / full_time:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
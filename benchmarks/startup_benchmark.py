@@ -0,0 +1,60 @@
+"""Время запуска приложения: импорт app, прогрев и первый запрос
+
+Каждое измерение выполняется в новом процессе интерпретатора.
+Запуск: python benchmarks/startup_benchmark.py [порог импорта app, мс]
+(при превышении порога скрипт завершается с кодом 1)
+"""
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCENARIOS = {
+    'import app': "import app",
+    'import app + warm_up': "import app; app.start_warmup().join()",
+    'import app + first request': (
+        "import app\n"
+        "client = app.app.test_client()\n"
+        "client.post('/api/truth_table', json={'expression': 'a & b', 'variables': 'a,b'})"
+    ),
+    'import sympy': "import sympy",
+}
+
+TEMPLATE = """
+import json, sys, time
+started = time.perf_counter()
+{code}
+print(json.dumps({{'ms': (time.perf_counter() - started) * 1000, 'sympy': 'sympy' in sys.modules}}))
+"""
+
+
+def measure(code, repeats):
+    env = {**os.environ, 'BOOLTRAINER_WARMUP': '0'}
+    samples = []
+    for _ in range(repeats):
+        result = subprocess.run([sys.executable, '-c', TEMPLATE.format(code=code)], cwd=ROOT, env=env,
+                                capture_output=True, text=True, check=True)
+        samples.append(json.loads(result.stdout.strip().splitlines()[-1]))
+    return min(sample['ms'] for sample in samples), samples[-1]['sympy']
+
+
+def main():
+    threshold = float(sys.argv[1]) if len(sys.argv) > 1 else None
+    repeats = 3
+
+    print(f"{'scenario':<28} {'best, ms':>9} {'sympy loaded':>13}")
+    results = {}
+    for name, code in SCENARIOS.items():
+        elapsed, sympy_loaded = measure(code, repeats)
+        results[name] = elapsed
+        print(f"{name:<28} {elapsed:>9.1f} {str(sympy_loaded):>13}")
+
+    if threshold is not None and results['import app'] > threshold:
+        print(f"Импорт app дольше порога: {results['import app']:.1f} > {threshold:.1f} мс")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,374 @@
+"""Набор бенчмарков вычислительных модулей и endpoint'ов API
+
+Сценарии масштабируются по числу переменных, глубине выражения и числу
+блоков схемы. Для каждого сценария измеряются пропускная способность
+(операций в секунду), задержки p50/p99 и пиковая память (tracemalloc -
+отдельным прогоном, чтобы трассировка памяти не искажала время).
+Входные данные генерируются детерминированно, поэтому прогоны сравнимы.
+
+Результаты сравниваются с эталоном (benchmarks/baseline.json): сценарий
+считается регрессией, если p50 или пиковая память выросли больше порога.
+Эталон зависит от машины - после смены окружения его нужно пересохранить.
+
+Запуск:
+    python benchmarks/suite.py                    измерение и сравнение с эталоном
+    python benchmarks/suite.py --quick            малые размеры, меньше повторов
+    python benchmarks/suite.py --filter endpoint  только сценарии с подстрокой в имени
+    python benchmarks/suite.py --save-baseline    сохранить результаты как эталон
+Код возврата 1 - найдены регрессии.
+"""
+import argparse
+import json
+import math
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+os.environ.setdefault('BOOLTRAINER_WARMUP', '0')
+
+BASELINE_PATH = os.path.join(ROOT, 'benchmarks', 'baseline.json')
+DEFAULT_THRESHOLD = 0.25         # допустимый рост p50
+DEFAULT_MEMORY_THRESHOLD = 0.25  # допустимый рост пиковой памяти
+MIN_DIFFERENCE_MS = 0.05         # более мелкие расхождения p50 считаются шумом
+MIN_DIFFERENCE_KIB = 64          # то же для пиковой памяти (кэши SymPy дают разброс)
+
+OPERATIONS = ('&', '|', '^', '->')
+
+
+def build_expression(count, depth, seed=0):
+    """Случайное выражение глубины depth на переменных x0..x{count-1}
+
+    Листья перебирают переменные по кругу, поэтому при достаточной глубине
+    в выражение входят все переменные.
+    """
+    rng = random.Random(seed)
+    names = [f'x{i}' for i in range(count)]
+    leaves = iter(range(1 << depth))
+
+    def node(level):
+        if level == 0:
+            name = names[next(leaves) % count]
+            return f'~{name}' if rng.random() < 0.3 else name
+        text = f'({node(level - 1)} {rng.choice(OPERATIONS)} {node(level - 1)})'
+        return f'~{text}' if rng.random() < 0.1 else text
+
+    return node(depth), ','.join(names)
+
+
+def depth_for(count):
+    """Глубина, при которой листьев хватает на все переменные"""
+    return max(2, math.ceil(math.log2(count)) + 1)
+
+
+def build_scheme(count, size, seed=0):
+    """Схема из size элементов на переменных x0..x{count-1} в формате фронтенда
+
+    Каждый элемент берет выход предыдущего, поэтому выход у схемы один.
+    """
+    rng = random.Random(seed)
+    names = [f'x{i}' for i in range(count)]
+    blocks = [{'id': f'var_{name}', 'type': 'VARIABLE', 'variable': name} for name in names]
+    wires = []
+    nodes = [block['id'] for block in blocks]
+    for index in range(size):
+        block_type = rng.choice(('AND', 'OR', 'XOR', 'NOT')) if index else 'AND'
+        block_id = f'{block_type.lower()}_{index}'
+        wires.append((nodes[-1], block_id))
+        if block_type != 'NOT':
+            other = nodes[index] if index < count - 1 else rng.choice(nodes[:-1])
+            wires.append((other, block_id))
+        blocks.append({'id': block_id, 'type': block_type})
+        nodes.append(block_id)
+    return {
+        'blocks': blocks,
+        'connections': [{'id': '|'.join(sorted([f'{source}_output', f'{target}_input']))}
+                        for source, target in wires]
+    }, ','.join(names)
+
+
+class Case:
+    """Сценарий: setup() готовит данные и возвращает измеряемую функцию без аргументов"""
+
+    def __init__(self, group, name, parameter, value, setup):
+        self.group = group
+        self.name = f'{group}.{name}[{parameter}={value}]'
+        self.setup = setup
+
+
+def engine_cases(quick):
+    """Сценарии вычислительных модулей (разбор уже выполнен, кроме сценария разбора)"""
+    from logic.expression_processor import ExpressionProcessor
+    from logic.truth_table_generator import TruthTableGenerator
+    from logic.normal_form_converter import NormalFormConverter
+    from logic.equivalence import EquivalenceChecker
+    from logic.scheme_calculator import SchemeCalculator
+
+    def parsed(expression, variables):
+        processor = ExpressionProcessor(expression, variables)
+        processor.parse()
+        return processor
+
+    def parse_case(depth):
+        expression, variables = build_expression(8, depth)
+        return lambda: ExpressionProcessor(expression, variables).parse()
+
+    def sympy_case(depth):
+        expression, variables = build_expression(8, depth)
+        processor = parsed(expression, variables)
+
+        def run():
+            processor._sympy_expression = None
+            return processor.sympy_expression
+        return run
+
+    def truth_table_case(count):
+        processor = parsed(*build_expression(count, depth_for(count)))
+        expression, variables = processor.sympy_expression, processor.sympy_variables
+        return lambda: TruthTableGenerator(expression, variables).generate_compact()
+
+    def normal_forms_case(count):
+        processor = parsed(*build_expression(count, depth_for(count)))
+        expression, variables = processor.sympy_expression, processor.sympy_variables
+
+        def run():
+            converter = NormalFormConverter(expression, variables)
+            return converter.to_cnf(), converter.to_dnf()
+        return run
+
+    def bdd_case(count):
+        processor = parsed(*build_expression(count, depth_for(count)))
+        expression, variables = processor.sympy_expression, processor.sympy_variables
+        return lambda: TruthTableGenerator(expression, variables).analyze_bdd()
+
+    def equivalence_case(count):
+        expression, variables = build_expression(count, depth_for(count))
+        first = parsed(expression, variables)
+        second = parsed(f'~~({expression})', variables)
+        return lambda: EquivalenceChecker(first.sympy_expression, second.sympy_expression,
+                                          first.sympy_variables).check()
+
+    def scheme_case(size):
+        scheme, variables = build_scheme(10, size)
+        return lambda: SchemeCalculator(scheme, variables).calculate_compact()
+
+    sizes = {
+        'parse': (4, 6) if quick else (4, 6, 8, 10),
+        'sympy': (4, 6) if quick else (4, 6, 8),
+        'truth_table': (8, 12) if quick else (8, 12, 16, 20),
+        'normal_forms': (4, 6) if quick else (4, 6, 8),
+        'bdd': (16, 24) if quick else (16, 24, 32, 48),
+        'equivalence': (8, 24) if quick else (8, 16, 24, 32),
+        'scheme': (16, 64) if quick else (16, 64, 256, 1024),
+    }
+    factories = [
+        ('parse', 'depth', parse_case),
+        ('sympy', 'depth', sympy_case),
+        ('truth_table', 'vars', truth_table_case),
+        ('normal_forms', 'vars', normal_forms_case),
+        ('bdd', 'vars', bdd_case),
+        ('equivalence', 'vars', equivalence_case),
+        ('scheme', 'blocks', scheme_case),
+    ]
+    return [Case('engine', name, parameter, value, lambda factory=factory, value=value: factory(value))
+            for name, parameter, factory in factories for value in sizes[name]]
+
+
+def endpoint_cases(quick):
+    """Сценарии endpoint'ов через тестовый клиент Flask
+
+    Кэши выражений и схем очищаются перед каждым запросом, чтобы измерялся
+    полный путь запроса, а не попадание в кэш.
+    """
+    import app as app_module
+
+    client = app_module.app.test_client()
+
+    def request(path, payload):
+        def run():
+            app_module.expression_cache.clear()
+            app_module.circuit_cache.clear()
+            response = client.post(path, json=payload)
+            if not response.get_json().get('success'):
+                raise RuntimeError(f"{path}: {response.get_json().get('error')}")
+        return run
+
+    def truth_table_case(count):
+        expression, variables = build_expression(count, depth_for(count))
+        return request('/api/truth_table', {'expression': expression, 'variables': variables,
+                                            'format': 'packed'})
+
+    def normal_forms_case(count):
+        expression, variables = build_expression(count, depth_for(count))
+        return request('/api/normal_forms', {'expression': expression, 'variables': variables})
+
+    def equivalence_case(count):
+        expression, variables = build_expression(count, depth_for(count))
+        return request('/api/equivalence', {'expression': expression, 'reference': f'~~({expression})',
+                                            'variables': variables})
+
+    def scheme_case(size):
+        scheme, variables = build_scheme(10, size)
+        return request('/api/calculate_scheme', {'scheme': scheme, 'variables': variables,
+                                                 'format': 'packed'})
+
+    def batch_case(jobs):
+        payload = {'jobs': [dict(zip(('expression', 'variables'), build_expression(6, 4, seed)),
+                                 operations=['truth_table', 'analysis'])
+                            for seed in range(jobs)],
+                   'format': 'packed'}
+        return request('/api/batch', payload)
+
+    sizes = {
+        'truth_table': (8,) if quick else (8, 12, 16),
+        'normal_forms': (4,) if quick else (4, 6, 8),
+        'equivalence': (8,) if quick else (8, 24),
+        'calculate_scheme': (64,) if quick else (64, 256),
+        'batch': (10,) if quick else (10, 100),
+    }
+    factories = [
+        ('truth_table', 'vars', truth_table_case),
+        ('normal_forms', 'vars', normal_forms_case),
+        ('equivalence', 'vars', equivalence_case),
+        ('calculate_scheme', 'blocks', scheme_case),
+        ('batch', 'jobs', batch_case),
+    ]
+    return [Case('endpoint', name, parameter, value, lambda factory=factory, value=value: factory(value))
+            for name, parameter, factory in factories for value in sizes[name]]
+
+
+def percentile(samples, fraction):
+    """Перцентиль по ближайшему рангу"""
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(fraction * len(ordered)))
+    return ordered[rank - 1]
+
+
+def measure(func, min_repeats=5, max_repeats=200, min_time=0.5, warmup=1):
+    """Метрики функции: пропускная способность, p50/p99 (мс), пиковая память (КиБ)
+
+    Повторы продолжаются, пока не набрано min_repeats замеров и min_time секунд.
+    """
+    for _ in range(warmup):
+        func()
+
+    samples = []
+    total = 0.0
+    while len(samples) < max_repeats and (len(samples) < min_repeats or total < min_time):
+        started = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - started
+        samples.append(elapsed)
+        total += elapsed
+
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'repeats': len(samples),
+        'throughput': len(samples) / total,
+        'p50_ms': percentile(samples, 0.5) * 1000,
+        'p99_ms': percentile(samples, 0.99) * 1000,
+        'peak_kib': peak / 1024,
+    }
+
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD, memory_threshold=DEFAULT_MEMORY_THRESHOLD):
+    """Регрессии относительно эталона: список строк-описаний
+
+    Сравниваются только сценарии, которые есть и в результатах, и в эталоне.
+    """
+    regressions = []
+    for name, current in results.items():
+        reference = baseline.get(name)
+        if reference is None:
+            continue
+        limit = reference['p50_ms'] * (1 + threshold)
+        if current['p50_ms'] > limit and current['p50_ms'] - reference['p50_ms'] > MIN_DIFFERENCE_MS:
+            regressions.append(f"{name}: p50 {current['p50_ms']:.2f} мс > {reference['p50_ms']:.2f} мс "
+                               f"(+{current['p50_ms'] / reference['p50_ms'] - 1:.0%})")
+        memory_limit = reference['peak_kib'] * (1 + memory_threshold)
+        if current['peak_kib'] > memory_limit and current['peak_kib'] - reference['peak_kib'] > MIN_DIFFERENCE_KIB:
+            regressions.append(f"{name}: память {current['peak_kib']:.0f} КиБ > {reference['peak_kib']:.0f} КиБ "
+                               f"(+{current['peak_kib'] / reference['peak_kib'] - 1:.0%})")
+    return regressions
+
+
+def load_baseline(path):
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding='utf-8') as file:
+        return json.load(file)['results']
+
+
+def save_results(path, results):
+    data = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': results,
+    }
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(data, file, indent=2, ensure_ascii=False, sort_keys=True)
+        file.write('\n')
+
+
+def run(cases, name_filter=None, quick=False):
+    """Измерение сценариев с выводом таблицы; словарь {имя: метрики}"""
+    limits = {'min_repeats': 3, 'min_time': 0.2} if quick else {}
+    results = {}
+    print(f"{'case':<44} {'ops/s':>9} {'p50, ms':>9} {'p99, ms':>9} {'peak, KiB':>10}")
+    for case in cases:
+        if name_filter and name_filter not in case.name:
+            continue
+        metrics = measure(case.setup(), **limits)
+        results[case.name] = metrics
+        print(f"{case.name:<44} {metrics['throughput']:>9.1f} {metrics['p50_ms']:>9.2f} "
+              f"{metrics['p99_ms']:>9.2f} {metrics['peak_kib']:>10.0f}")
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Бенчмарки BoolTrainer')
+    parser.add_argument('--quick', action='store_true', help='малые размеры и меньше повторов')
+    parser.add_argument('--filter', dest='name_filter', help='подстрока имени сценария')
+    parser.add_argument('--baseline', default=BASELINE_PATH, help='файл эталона')
+    parser.add_argument('--save-baseline', action='store_true', help='сохранить результаты как эталон')
+    parser.add_argument('--output', help='файл для сохранения результатов')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='допустимый рост p50 (доля, по умолчанию 0.25)')
+    parser.add_argument('--memory-threshold', type=float, default=DEFAULT_MEMORY_THRESHOLD,
+                        help='допустимый рост пиковой памяти (доля)')
+    args = parser.parse_args(argv)
+
+    results = run(engine_cases(args.quick) + endpoint_cases(args.quick), args.name_filter, args.quick)
+
+    if args.output:
+        save_results(args.output, results)
+    if args.save_baseline:
+        save_results(args.baseline, results)
+        print(f"Эталон сохранен: {args.baseline}")
+        return 0
+
+    baseline = load_baseline(args.baseline)
+    if baseline is None:
+        print(f"Эталон не найден: {args.baseline} (сохраните его с --save-baseline)")
+        return 0
+    regressions = compare(results, baseline, args.threshold, args.memory_threshold)
+    for regression in regressions:
+        print(f"Регрессия: {regression}")
+    if not regressions:
+        print(f"Регрессий нет (сценариев сравнено: {len(set(results) & set(baseline))})")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,54 @@
+"""Сравнение построчного и скомпилированного построения таблицы истинности
+
+Запуск: python benchmarks/truth_table_benchmark.py [макс. число переменных]
+"""
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from logic.expression_processor import ExpressionProcessor
+from logic.truth_table_generator import TruthTableGenerator
+
+
+def build_expression(count):
+    """Выражение вида (x0 & ~x1) | (x1 & x2) | ... на count переменных"""
+    names = [f'x{i}' for i in range(count)]
+    terms = [f'({names[i]} & ~{names[(i + 1) % count]})' for i in range(count)]
+    return ' | '.join(terms), ','.join(names)
+
+
+def measure(expression, variables, mode):
+    processor = ExpressionProcessor(expression, variables)
+    processor.parse()
+    generator = TruthTableGenerator(processor.sympy_expression, processor.sympy_variables, mode=mode)
+    started = time.perf_counter()
+    table = generator.generate()
+    elapsed = time.perf_counter() - started
+    return elapsed, [row['result'] for row in table]
+
+
+def main():
+    max_variables = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    per_row_limit = 10  # построчный режим дальше слишком медленный
+
+    print(f"{'vars':>4} {'rows':>8} {'per_row, s':>12} {'compiled, s':>12} {'speedup':>9}")
+    for count in range(2, max_variables + 1):
+        expression, variables = build_expression(count)
+        compiled_time, compiled_results = measure(expression, variables, TruthTableGenerator.MODE_COMPILED)
+
+        if count <= per_row_limit:
+            per_row_time, per_row_results = measure(expression, variables, TruthTableGenerator.MODE_PER_ROW)
+            assert per_row_results == compiled_results, f"Расхождение результатов для {count} переменных"
+            speedup = f"{per_row_time / compiled_time:8.1f}x"
+            per_row_column = f"{per_row_time:12.4f}"
+        else:
+            speedup = f"{'-':>9}"
+            per_row_column = f"{'-':>12}"
+
+        print(f"{count:>4} {1 << count:>8} {per_row_column} {compiled_time:12.4f} {speedup}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,267 @@
+import logging
+
+from sympy import Symbol
+from sympy.logic.boolalg import (And, Or, Not, Xor, Implies, Equivalent, ITE,
+                                 Nand, Nor, Xnor, BooleanTrue, BooleanFalse)
+
+from logic.budget import UNLIMITED
+from logic.tracing import trace
+
+logger = logging.getLogger(__name__)
+
+
+class BDDError(Exception):
+    """Выражение не может быть представлено диаграммой (или она слишком велика)"""
+    pass
+
+
+ORDER_GIVEN = 'given'
+ORDER_DFS = 'dfs'
+ORDER_FREQUENCY = 'frequency'
+
+
+def variable_order(expressions, variables, heuristic=ORDER_DFS):
+    """Порядок переменных диаграммы
+
+    given - порядок списка переменных; dfs - порядок первого появления при
+    обходе выражений в глубину (связанные переменные оказываются рядом);
+    frequency - сначала переменные, чаще встречающиеся в выражениях.
+    Переменные, не входящие в выражения, идут в конце.
+    """
+    variables = list(variables)
+    if heuristic == ORDER_GIVEN:
+        return variables
+
+    known = set(variables)
+    counts = {}
+    for expression in expressions:
+        stack = [expression]
+        while stack:
+            node = stack.pop()
+            if node in known:
+                counts[node] = counts.get(node, 0) + 1
+            else:
+                stack.extend(reversed(getattr(node, 'args', ())))
+
+    if heuristic == ORDER_DFS:
+        ordered = list(counts)  # словарь сохраняет порядок первого появления
+    elif heuristic == ORDER_FREQUENCY:
+        ordered = sorted(counts, key=lambda var: -counts[var])
+    else:
+        raise ValueError(f"Неизвестная эвристика порядка: {heuristic}")
+    return ordered + [var for var in variables if var not in counts]
+
+
+class BDD:
+    """Сокращенная упорядоченная диаграмма решений (ROBDD)
+
+    Узел - номер в таблице узлов: (уровень переменной, low, high), где low/high -
+    потомки для значений False/True. Номера 0 и 1 - терминалы FALSE и TRUE.
+    Таблица уникальности гарантирует, что одинаковые функции имеют один
+    номер узла, поэтому равносильность проверяется сравнением номеров.
+    Результаты ITE кэшируются.
+    """
+
+    FALSE = 0
+    TRUE = 1
+
+    MAX_NODES = 500000
+    CHECK_INTERVAL = 4096  # проверка бюджета через каждые N новых узлов
+
+    _NARY_OPS = (And, Or, Xor, Nand, Nor, Xnor)
+
+    def __init__(self, variables, budget=UNLIMITED, max_nodes=MAX_NODES):
+        self.variables = list(variables)
+        self.budget = budget
+        self.max_nodes = max_nodes
+        self._levels = {var: level for level, var in enumerate(self.variables)}
+        terminal_level = len(self.variables)
+        self._nodes = [(terminal_level, None, None), (terminal_level, None, None)]
+        self._unique = {}
+        self._ite_cache = {}
+
+    @classmethod
+    def for_expressions(cls, expressions, variables, order=ORDER_DFS, **kwargs):
+        """Пустая диаграмма с порядком переменных, выбранным по выражениям"""
+        return cls(variable_order(expressions, variables, order), **kwargs)
+
+    def __len__(self):
+        return len(self._nodes)
+
+    def level(self, node):
+        return self._nodes[node][0]
+
+    def _make(self, level, low, high):
+        """Узел из таблицы уникальности (избыточная проверка сокращается)"""
+        if low == high:
+            return low
+        key = (level, low, high)
+        node = self._unique.get(key)
+        if node is None:
+            node = len(self._nodes)
+            if node >= self.max_nodes:
+                raise BDDError(f"Диаграмма превысила {self.max_nodes} узлов")
+            if node % self.CHECK_INTERVAL == 0:
+                self.budget.check()
+            self._nodes.append(key)
+            self._unique[key] = node
+        return node
+
+    def variable(self, var):
+        """Узел функции, равной переменной var"""
+        if var not in self._levels:
+            raise BDDError(f"Переменная {var} не указана в списке переменных")
+        return self._make(self._levels[var], self.FALSE, self.TRUE)
+
+    def _cofactors(self, node, level):
+        node_level, low, high = self._nodes[node]
+        if node_level != level:
+            return node, node
+        return low, high
+
+    def ite(self, f, g, h):
+        """if f then g else h - базовая операция, через которую выражаются остальные"""
+        if f == self.TRUE:
+            return g
+        if f == self.FALSE:
+            return h
+        if g == h:
+            return g
+        if g == self.TRUE and h == self.FALSE:
+            return f
+
+        key = (f, g, h)
+        result = self._ite_cache.get(key)
+        if result is not None:
+            return result
+
+        level = min(self._nodes[f][0], self._nodes[g][0], self._nodes[h][0])
+        f0, f1 = self._cofactors(f, level)
+        g0, g1 = self._cofactors(g, level)
+        h0, h1 = self._cofactors(h, level)
+        result = self._make(level, self.ite(f0, g0, h0), self.ite(f1, g1, h1))
+        self._ite_cache[key] = result
+        return result
+
+    def negate(self, f):
+        return self.ite(f, self.FALSE, self.TRUE)
+
+    def conjunction(self, f, g):
+        return self.ite(f, g, self.FALSE)
+
+    def disjunction(self, f, g):
+        return self.ite(f, self.TRUE, g)
+
+    def exclusive(self, f, g):
+        return self.ite(f, self.negate(g), g)
+
+    def build(self, expression):
+        """Узел диаграммы для выражения SymPy"""
+        return self._build(expression, {})
+
+    def _build(self, expr, memo):
+        if expr in memo:
+            return memo[expr]
+
+        if isinstance(expr, Symbol):
+            node = self.variable(expr)
+        elif isinstance(expr, BooleanTrue) or expr is True:
+            node = self.TRUE
+        elif isinstance(expr, BooleanFalse) or expr is False:
+            node = self.FALSE
+        elif isinstance(expr, Not):
+            if len(expr.args) != 1:
+                raise BDDError(f"Некорректное отрицание: {expr}")
+            node = self.negate(self._build(expr.args[0], memo))
+        elif isinstance(expr, self._NARY_OPS):
+            operands = [self._build(arg, memo) for arg in expr.args]
+            if isinstance(expr, (And, Nand)):
+                node = self.TRUE
+                for operand in operands:
+                    node = self.conjunction(node, operand)
+            elif isinstance(expr, (Or, Nor)):
+                node = self.FALSE
+                for operand in operands:
+                    node = self.disjunction(node, operand)
+            else:
+                node = self.FALSE
+                for operand in operands:
+                    node = self.exclusive(node, operand)
+            if isinstance(expr, (Nand, Nor, Xnor)):
+                node = self.negate(node)
+        elif isinstance(expr, Implies):
+            premise, conclusion = [self._build(arg, memo) for arg in expr.args]
+            node = self.ite(premise, conclusion, self.TRUE)
+        elif isinstance(expr, Equivalent):
+            operands = [self._build(arg, memo) for arg in expr.args]
+            all_true, all_false = self.TRUE, self.TRUE
+            for operand in operands:
+                all_true = self.conjunction(all_true, operand)
+                all_false = self.conjunction(all_false, self.negate(operand))
+            node = self.disjunction(all_true, all_false)
+        elif isinstance(expr, ITE):
+            node = self.ite(*[self._build(arg, memo) for arg in expr.args])
+        else:
+            raise BDDError(f"Неподдерживаемая операция: {type(expr).__name__}")
+
+        memo[expr] = node
+        return node
+
+    def node_count(self, node):
+        """Число узлов (включая терминалы), достижимых из node"""
+        seen = set()
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            if current in seen:
+                continue
+            seen.add(current)
+            if current > self.TRUE:
+                _, low, high = self._nodes[current]
+                stack.extend((low, high))
+        return len(seen)
+
+    def sat_count(self, node):
+        """Число наборов всех переменных диаграммы, на которых функция истинна"""
+        counts = {self.FALSE: 0, self.TRUE: 1}
+
+        def count(current):
+            # Число моделей над переменными с уровнями от level(current) и ниже
+            if current not in counts:
+                level, low, high = self._nodes[current]
+                counts[current] = (count(low) << (self._nodes[low][0] - level - 1)) + \
+                                   (count(high) << (self._nodes[high][0] - level - 1))
+            return counts[current]
+
+        return count(node) << self._nodes[node][0]
+
+    def any_sat(self, node):
+        """Выполняющий набор {переменная: значение} или None
+
+        Непройденные переменные получают False, поэтому набор полный.
+        """
+        if node == self.FALSE:
+            return None
+        assignment = {var: False for var in self.variables}
+        while node != self.TRUE:
+            level, low, high = self._nodes[node]
+            if low != self.FALSE:
+                node = low
+            else:
+                assignment[self.variables[level]] = True
+                node = high
+        return assignment
+
+    def analyze(self, node):
+        """Анализ функции в формате TruthTable.analyze без перебора строк"""
+        total = 1 << len(self.variables)
+        true_count = self.sat_count(node)
+        trace(logger, 'Диаграмма: узлов функции %d, всего %d', self.node_count(node), len(self))
+        return {
+            'total_rows': total,
+            'true_results': true_count,
+            'false_results': total - true_count,
+            'is_tautology': node == self.TRUE,
+            'is_contradiction': node == self.FALSE,
+            'is_satisfiable': node != self.FALSE
+        }
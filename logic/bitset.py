@@ -0,0 +1,70 @@
+"""Столбцы таблицы истинности в виде целых чисел (бит j - строка j)
+
+Модуль не зависит от SymPy: его используют и вычислитель выражений,
+и симулятор схем.
+"""
+
+
+def variable_column(position, size):
+    """Маска столбца переменной для блока из size строк
+
+    position - номер бита переменной в индексе строки (0 - младший).
+    """
+    half = 1 << position
+    period = half << 1
+    block = ((1 << half) - 1) << half
+    return ((1 << size) - 1) // ((1 << period) - 1) * block
+
+
+def variable_columns(count, start, size):
+    """Столбцы count переменных для строк [start, start + size)
+
+    Первая переменная - старший бит номера строки (порядок itertools.product).
+    Переменные, чей бит не меняется внутри блока, дают константный столбец.
+    """
+    full = (1 << size) - 1
+    chunk_bits = size.bit_length() - 1
+    columns = []
+    for i in range(count):
+        position = count - 1 - i
+        if position < chunk_bits:
+            columns.append(variable_column(position, size))
+        else:
+            columns.append(full if (start >> position) & 1 else 0)
+    return columns
+
+
+def evaluate_in_chunks(evaluate, rows_count, check=None, chunk_bits=16):
+    """Вычисление столбца блоками по 2**chunk_bits строк
+
+    evaluate(start, size) - функция вычисления блока, check() - проверка
+    бюджета между блоками (для кооперативной отмены длинных вычислений).
+    """
+    size = 1 << chunk_bits
+    if rows_count <= size:
+        return evaluate(0, rows_count)
+
+    chunks = []
+    for start in range(0, rows_count, size):
+        if check is not None:
+            check()
+        chunks.append(evaluate(start, size).to_bytes(size // 8, 'little'))
+    return int.from_bytes(b''.join(chunks), 'little')
+
+
+def evaluate_columns_in_chunks(evaluate, rows_count, check=None, chunk_bits=16):
+    """Как evaluate_in_chunks, но evaluate(start, size) возвращает список столбцов"""
+    size = 1 << chunk_bits
+    if rows_count <= size:
+        return evaluate(0, rows_count)
+
+    chunks = None
+    for start in range(0, rows_count, size):
+        if check is not None:
+            check()
+        columns = evaluate(start, size)
+        if chunks is None:
+            chunks = [[] for _ in columns]
+        for column_chunks, column in zip(chunks, columns):
+            column_chunks.append(column.to_bytes(size // 8, 'little'))
+    return [int.from_bytes(b''.join(column_chunks), 'little') for column_chunks in chunks]
@@ -0,0 +1,80 @@
+import time
+
+
+class BudgetExceeded(Exception):
+    """Превышен бюджет запроса (размер входных данных или время вычисления)"""
+
+    def __init__(self, limit, value, maximum):
+        self.limit = limit
+        self.value = value
+        self.maximum = maximum
+        super().__init__(f"Превышен лимит {limit}: {value} > {maximum}")
+
+    def __reduce__(self):
+        # Для передачи исключения из процесса пула
+        return type(self), (self.limit, self.value, self.maximum)
+
+    def to_dict(self):
+        return {
+            'limit': self.limit,
+            'value': self.value,
+            'maximum': self.maximum
+        }
+
+
+class Budget:
+    """Бюджет одного запроса: лимиты размера и срок выполнения
+
+    Вычислительные модули вызывают check_*() перед работой и check()
+    внутри циклов, чтобы прервать вычисление исключением BudgetExceeded.
+    None в любом лимите - ограничение отключено.
+    """
+
+    def __init__(self, max_variables=None, max_rows=None, max_expression_size=None,
+                 time_limit=None, clock=time.monotonic):
+        self.max_variables = max_variables
+        self.max_rows = max_rows
+        self.max_expression_size = max_expression_size
+        self.time_limit = time_limit
+        self._clock = clock
+        self.started_at = clock()
+        self.deadline = self.started_at + time_limit if time_limit is not None else None
+
+    @staticmethod
+    def _check_limit(limit, value, maximum):
+        if maximum is not None and value > maximum:
+            raise BudgetExceeded(limit, value, maximum)
+
+    def check_variables(self, count):
+        self._check_limit('max_variables', count, self.max_variables)
+        self.check_rows(1 << count)
+
+    def check_rows(self, count):
+        self._check_limit('max_rows', count, self.max_rows)
+
+    def check_expression(self, size):
+        """Размер выражения: длина строки или число блоков схемы"""
+        self._check_limit('max_expression_size', size, self.max_expression_size)
+
+    def remaining(self):
+        """Оставшееся время в секундах (None - без ограничения)"""
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - self._clock())
+
+    def check(self):
+        """Проверка срока выполнения (вызывается внутри циклов)"""
+        if self.deadline is not None and self._clock() > self.deadline:
+            elapsed = round(self._clock() - self.started_at, 3)
+            raise BudgetExceeded('time_limit', elapsed, self.time_limit)
+
+    def limits(self):
+        return {
+            'max_variables': self.max_variables,
+            'max_rows': self.max_rows,
+            'max_expression_size': self.max_expression_size,
+            'time_limit': self.time_limit
+        }
+
+
+UNLIMITED = Budget()
@@ -0,0 +1,293 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+from logic.budget import UNLIMITED
+from logic.circuit import structure_hash, make_table
+from logic.expression_processor import ExpressionProcessor
+from logic.kmap import KarnaughMap
+from logic.metrics import rows_evaluated
+from logic.parser import ParseError, tokenize
+from logic.tracing import trace
+
+logger = logging.getLogger(__name__)
+
+
+class LRUCache:
+    """Ограниченный LRU-кэш с временем жизни записей и счетчиками"""
+
+    def __init__(self, maxsize=1024, ttl=None, clock=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._data = OrderedDict()  # key -> (время записи, значение)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def _is_expired(self, stored_at):
+        return self.ttl is not None and self._clock() - stored_at > self.ttl
+
+    def get(self, key, default=None):
+        with self._lock:
+            item = self._data.get(key)
+            if item is not None and self._is_expired(item[0]):
+                del self._data[key]
+                self.expirations += 1
+                item = None
+            if item is None:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return item[1]
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (self._clock(), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_create(self, key, factory):
+        """Значение из кэша или результат factory() (сохраняется в кэш)"""
+        marker = object()
+        value = self.get(key, marker)
+        if value is marker:
+            value = factory()
+            self.set(key, value)
+        return value
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            return item is not None and not self._is_expired(item[0])
+
+    def stats(self):
+        """Счетчики кэша"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._data),
+                'maxsize': self.maxsize,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
+
+
+class CachedExpression:
+    """Результаты вычислений для одного выражения (заполняются лениво)
+
+    stored - результаты из ResultStore.expression: они не пересчитываются.
+    """
+
+    def __init__(self, processor, stored=None):
+        self.processor = processor
+        self._lock = threading.Lock()
+        self._text = None
+        self._truth_table = None
+        self._analysis = None
+        self._normal_forms = None
+        self._karnaugh = None
+        if stored is not None:
+            self._text = stored['text']
+            self._truth_table = stored['truth_table']
+            self._normal_forms = stored['normal_forms']
+
+    @property
+    def expression(self):
+        return self.processor.sympy_expression
+
+    @property
+    def text(self):
+        """Строка выражения в виде SymPy (из хранилища - без построения выражения)"""
+        if self._text is None:
+            self._text = str(self.expression)
+        return self._text
+
+    @property
+    def variables(self):
+        return self.processor.sympy_variables
+
+    def generator(self, budget=UNLIMITED):
+        """Новый генератор таблицы для разобранного выражения"""
+        from logic.truth_table_generator import TruthTableGenerator
+        return TruthTableGenerator(self.expression, self.variables, budget=budget)
+
+    def truth_table(self, budget=UNLIMITED):
+        """Компактная таблица истинности"""
+        with self._lock:
+            if self._truth_table is None:
+                self._truth_table = self.generator(budget).generate_compact()
+            return self._truth_table
+
+    def analysis(self, budget=UNLIMITED):
+        """Анализ таблицы истинности (по готовой таблице или по диаграмме решений)"""
+        with self._lock:
+            if self._analysis is None:
+                if self._truth_table is not None:
+                    self._analysis = self._truth_table.analyze()
+                else:
+                    self._analysis = self.generator(budget).analyze()
+            return self._analysis
+
+    def normal_forms(self, budget=UNLIMITED):
+        """Пара (КНФ, ДНФ) в строковом виде"""
+        with self._lock:
+            if self._normal_forms is None:
+                converter = self._normal_form_converter(budget)
+                self._normal_forms = (converter.to_cnf(), converter.to_dnf())
+            return self._normal_forms
+
+    def karnaugh(self, budget=UNLIMITED):
+        """Карта Карно и импликанты по компактной таблице (KarnaughMap.to_dict)"""
+        truth_table = self.truth_table(budget)
+        with self._lock:
+            if self._karnaugh is None:
+                self._karnaugh = KarnaughMap(truth_table, budget).to_dict()
+            return self._karnaugh
+
+    def _normal_form_converter(self, budget):
+        """Конвертер, переиспользующий уже построенную таблицу истинности"""
+        from logic.normal_form_converter import NormalFormConverter
+        free_symbols = getattr(self.expression, 'free_symbols', set())
+        if self._truth_table is not None and free_symbols <= set(self.variables):
+            return NormalFormConverter(self.expression, self.variables, budget=budget,
+                                       result_bits=self._truth_table.bits)
+        return NormalFormConverter(self.expression, budget=budget)
+
+
+class ExpressionCache:
+    """Общий кэш разобранных выражений и результатов для всех endpoint'ов
+
+    store - ResultStore с заранее вычисленными результатами (None - без него):
+    при промахе кэша запись заполняется из хранилища.
+    """
+
+    def __init__(self, maxsize=512, ttl=3600, store=None):
+        self.entries = LRUCache(maxsize=maxsize, ttl=ttl)
+        self.store = store
+
+    @staticmethod
+    def make_key(expression_str, variables_str):
+        """Канонический ключ: лексемы выражения и список переменных
+
+        Ключ строится по лексемам парсера, а не по тексту без пробелов:
+        'a b' и 'ab' или 'a - > b' и 'a -> b' - разные выражения. Текст,
+        который не разбивается на лексемы, остается ключом как есть (ошибки
+        разбора не кэшируются).
+        """
+        variables = tuple(v.strip() for v in variables_str.split(',') if v.strip())
+        try:
+            tokens = tokenize(expression_str)
+        except ParseError:
+            return expression_str, variables
+        return ' '.join(str(int(value)) if kind == 'const' else value
+                        for kind, value, _ in tokens[:-1]), variables
+
+    def get(self, expression_str, variables_str):
+        """Запись кэша для выражения (разбор выполняется только при промахе)
+
+        Ошибки разбора (ExpressionError) не кэшируются.
+        """
+        key = self.make_key(expression_str, variables_str)
+
+        def parse():
+            trace(logger, 'Промах кэша, разбор выражения %r', expression_str)
+            processor = ExpressionProcessor(expression_str, variables_str)
+            processor.parse()
+            stored = self.store.expression(key) if self.store is not None else None
+            if stored is not None:
+                trace(logger, 'Результаты выражения взяты из хранилища')
+            return CachedExpression(processor, stored)
+
+        return self.entries.get_or_create(key, parse)
+
+    def clear(self):
+        self.entries.clear()
+
+    def stats(self):
+        return self.entries.stats()
+
+
+class CachedCircuit:
+    """Скомпилированная схема и ее таблица истинности (вычисляется лениво)"""
+
+    def __init__(self, circuit, truth_table=None):
+        self.circuit = circuit
+        self._lock = threading.Lock()
+        self._truth_table = truth_table
+
+    def truth_table(self, budget=UNLIMITED):
+        with self._lock:
+            if self._truth_table is None:
+                self._truth_table = self.circuit.truth_table(budget.check)
+                rows_evaluated(self._truth_table.rows_count, 'circuit')
+            return self._truth_table
+
+    def seed(self, truth_table):
+        """Таблица, вычисленная вне записи (сессией схемы); возвращает таблицу записи"""
+        with self._lock:
+            if self._truth_table is None:
+                self._truth_table = truth_table
+            return self._truth_table
+
+
+class CircuitCache:
+    """Кэш схем по каноническому хэшу структуры
+
+    Схемы, отличающиеся только расположением блоков или их id, получают
+    одну запись, поэтому повторный расчет после перемещения блока и
+    одинаковые схемы разных пользователей не пересчитываются.
+    """
+
+    def __init__(self, maxsize=256, ttl=3600, store=None):
+        """store - ResultStore с заранее вычисленными схемами (None - без него)"""
+        self.entries = LRUCache(maxsize=maxsize, ttl=ttl)
+        self.store = store
+
+    @staticmethod
+    def make_key(blocks, wiring, variables):
+        return structure_hash(blocks, wiring, variables)
+
+    def get(self, key, compile_circuit):
+        """Запись кэша; compile_circuit() вызывается только при промахе
+
+        Ошибки компиляции (CircuitError) не кэшируются.
+        """
+        def create():
+            trace(logger, 'Промах кэша схем, компиляция %s', key)
+            circuit = compile_circuit()
+            columns = self.store.circuit(key) if self.store is not None else None
+            if columns is not None and len(columns) == len(circuit.outputs):
+                # Имена выходов - по текущей схеме, столбцы - из хранилища
+                trace(logger, 'Таблица схемы взята из хранилища')
+                return CachedCircuit(circuit, make_table(circuit.variables, circuit.output_names, columns))
+            return CachedCircuit(circuit)
+
+        return self.entries.get_or_create(key, create)
+
+    def clear(self):
+        self.entries.clear()
+
+    def stats(self):
+        return self.entries.stats()
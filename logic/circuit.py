@@ -0,0 +1,270 @@
+import hashlib
+from collections import deque
+
+from logic.bitset import variable_columns, evaluate_columns_in_chunks
+from logic.truth_table import TruthTable, MultiOutputTable
+
+
+class CircuitError(Exception):
+    """Ошибка структуры логической схемы"""
+    pass
+
+
+SOURCES = ('VARIABLE', 'INPUT')
+GATES = ('AND', 'OR', 'NOT', 'XOR')
+SINKS = ('OUTPUT',)
+
+
+def topological_order(blocks, inputs):
+    """Топологическая сортировка (алгоритм Кана), обнаружение циклов
+
+    Возвращает пару (порядок блоков, словарь id блока -> потребители).
+    """
+    consumers = {block_id: [] for block_id in blocks}
+    in_degree = {}
+    for block_id, sources in inputs.items():
+        in_degree[block_id] = len(sources)
+        for source in sources:
+            if source not in consumers:
+                raise CircuitError(f"Соединение с несуществующим блоком {source}")
+            consumers[source].append(block_id)
+
+    queue = deque(block_id for block_id in blocks if in_degree[block_id] == 0)
+    order = []
+    while queue:
+        block_id = queue.popleft()
+        order.append(block_id)
+        for consumer in consumers[block_id]:
+            in_degree[consumer] -= 1
+            if in_degree[consumer] == 0:
+                queue.append(consumer)
+
+    if len(order) != len(blocks):
+        cycle = sorted(block_id for block_id, degree in in_degree.items() if degree > 0)
+        raise CircuitError(f"Схема содержит цикл через блоки: {', '.join(cycle)}")
+    return order, consumers
+
+
+def find_outputs(blocks, consumers):
+    """Выходы схемы: все блоки OUTPUT (в порядке описания) или единственный элемент без потребителей"""
+    outputs = [block_id for block_id, block in blocks.items() if block.get('type') in SINKS]
+    if outputs:
+        return outputs
+
+    sinks = [block_id for block_id, block in blocks.items()
+             if block.get('type') in GATES and not consumers[block_id]]
+    if not sinks:
+        raise CircuitError("Схема не содержит логических элементов")
+    if len(sinks) > 1:
+        raise CircuitError("Не удалось определить выход схемы: добавьте блок OUTPUT")
+    return sinks
+
+
+def output_names(blocks, outputs):
+    """Имена столбцов выходов: единственный выход - result, иначе name блока или out1, out2, ..."""
+    if len(outputs) == 1:
+        return ['result']
+    return [blocks[block_id].get('name') or f'out{i}' for i, block_id in enumerate(outputs, 1)]
+
+
+def gate_value(op, operands, full):
+    """Выход элемента op по столбцам входов (full - маска всех строк блока)"""
+    if op == 'AND':
+        value = full
+        for operand in operands:
+            value &= operand
+    elif op == 'OR':
+        value = 0
+        for operand in operands:
+            value |= operand
+    elif op == 'XOR':
+        value = 0
+        for operand in operands:
+            value ^= operand
+    elif op == 'NOT':
+        value = full ^ operands[0]
+    else:  # OUTPUT
+        value = operands[0]
+    return value
+
+
+def _digest(value):
+    return hashlib.blake2b(repr(value).encode(), digest_size=16).hexdigest()
+
+
+def structure_hash(blocks, wiring, variables):
+    """Канонический хэш структуры схемы
+
+    Учитываются только типы блоков, переменные входов и соединения; id блоков,
+    координаты и порядок описаний не влияют на хэш. Подпись блока строится
+    по подписям его входов (все элементы коммутативны, поэтому входы
+    сортируются), хэш схемы - по мультимножеству подписей блоков, именам и
+    подписям выходов и списку переменных. Одинаковый хэш - одинаковая таблица истинности.
+    """
+    inputs = {block_id: list(wiring.get(block_id, [])) for block_id in blocks}
+    order, consumers = topological_order(blocks, inputs)
+
+    signatures = {}
+    for block_id in order:
+        block = blocks[block_id]
+        block_type = block.get('type')
+        variable = block.get('variable') if block_type in SOURCES else None
+        sources = sorted(signatures[source] for source in inputs[block_id])
+        signatures[block_id] = _digest((block_type, variable, tuple(sources)))
+
+    try:
+        outputs = find_outputs(blocks, consumers)
+        output = tuple(zip(output_names(blocks, outputs), (signatures[block_id] for block_id in outputs)))
+    except CircuitError:
+        output = None  # ошибка будет выброшена при компиляции
+    return _digest((tuple(variables), tuple(sorted(signatures.values())), output))
+
+
+class Circuit:
+    """Скомпилированная логическая схема (netlist)
+
+    Блоки один раз сортируются топологически и раскладываются по уровням.
+    Вычисление идет по плану уровней над битовыми множествами: бит j
+    значения узла - его выход в строке j таблицы истинности. У схемы может
+    быть несколько выходов (блоков OUTPUT); общие для них элементы
+    вычисляются один раз.
+    """
+
+    SOURCES = SOURCES
+    GATES = GATES
+    SINKS = SINKS
+
+    def __init__(self, blocks, wiring, variables):
+        """
+        blocks - словарь id блока -> описание блока ({'type', 'variable', ...})
+        wiring - словарь id блока -> список id блоков, подключенных к его входам
+        variables - список имен переменных (порядок столбцов таблицы)
+        """
+        self.blocks = blocks
+        self.variables = list(variables)
+        self.inputs = {block_id: list(wiring.get(block_id, [])) for block_id in blocks}
+        self._check_structure()
+
+        self.order = self._topological_order()
+        self.levels = self._levelize()
+        self.slots = {block_id: i for i, block_id in enumerate(self.order)}
+        self.plan = self._build_plan()
+        self.outputs = find_outputs(self.blocks, self.consumers)
+        self.output = self.outputs[0]
+        self.output_names = output_names(self.blocks, self.outputs)
+        self.output_plan = self._build_output_plan()
+
+    @property
+    def rows_count(self):
+        return 1 << len(self.variables)
+
+    def _check_structure(self):
+        """Проверка типов блоков и подключенных входов"""
+        for block_id, block in self.blocks.items():
+            block_type = block.get('type')
+            sources = self.inputs[block_id]
+
+            for source in sources:
+                if source not in self.blocks:
+                    raise CircuitError(f"Соединение с несуществующим блоком {source}")
+
+            if block_type in self.SOURCES:
+                if sources:
+                    raise CircuitError(f"Блок {block_id} ({block_type}) не имеет входов")
+                if block.get('variable') not in self.variables:
+                    raise CircuitError(f"Блок {block_id}: переменная "
+                                       f"'{block.get('variable') or ''}' не указана в списке переменных")
+            elif block_type in self.GATES or block_type in self.SINKS:
+                if not sources:
+                    raise CircuitError(f"У блока {block_type} ({block_id}) не подключены входы")
+                if block_type in ('NOT', 'OUTPUT') and len(sources) != 1:
+                    raise CircuitError(f"Блок {block_type} ({block_id}) должен иметь ровно один вход")
+            else:
+                raise CircuitError(f"Неизвестный тип блока: {block_type}")
+
+            for source in sources:
+                if self.blocks[source].get('type') in self.SINKS:
+                    raise CircuitError(f"Выход блока OUTPUT ({source}) не может быть подключен")
+
+    def _topological_order(self):
+        order, self.consumers = topological_order(self.blocks, self.inputs)
+        return order
+
+    def _levelize(self):
+        """Разбиение блоков на уровни (длина самого длинного пути от входов)"""
+        level_of = {}
+        levels = []
+        for block_id in self.order:
+            level = max((level_of[source] + 1 for source in self.inputs[block_id]), default=0)
+            level_of[block_id] = level
+            if level == len(levels):
+                levels.append([])
+            levels[level].append(block_id)
+        self.level_of = level_of
+        return levels
+
+    def _build_plan(self):
+        """План вычисления: (слот, операция, слоты входов) в порядке уровней"""
+        plan = []
+        for level in self.levels:
+            for block_id in level:
+                block = self.blocks[block_id]
+                block_type = block['type']
+                if block_type in self.SOURCES:
+                    plan.append((self.slots[block_id], 'VAR', (self.variables.index(block['variable']),)))
+                else:
+                    sources = tuple(self.slots[source] for source in self.inputs[block_id])
+                    plan.append((self.slots[block_id], block_type, sources))
+        return plan
+
+    def _build_output_plan(self):
+        """Часть плана, от которой зависят выходы (остальные блоки не вычисляются)"""
+        needed = set()
+        stack = list(self.outputs)
+        while stack:
+            block_id = stack.pop()
+            if block_id not in needed:
+                needed.add(block_id)
+                stack.extend(self.inputs[block_id])
+        slots = {self.slots[block_id] for block_id in needed}
+        return [step for step in self.plan if step[0] in slots]
+
+    def evaluate(self, start=0, size=None, plan=None):
+        """Значения узлов для строк [start, start + size) (список по слотам)
+
+        plan - часть плана для вычисления (по умолчанию весь; остальные слоты - 0).
+        """
+        if size is None:
+            size = self.rows_count
+        full = (1 << size) - 1
+        columns = variable_columns(len(self.variables), start, size)
+        values = [0] * len(self.order)
+
+        for slot, op, args in (self.plan if plan is None else plan):
+            if op == 'VAR':
+                values[slot] = columns[args[0]]
+            else:
+                values[slot] = gate_value(op, [values[arg] for arg in args], full)
+
+        return values
+
+    def output_bits(self, start=0, size=None):
+        """Столбец первого выхода схемы для строк [start, start + size) (по умолчанию - вся таблица)"""
+        return self.evaluate(start, size, self.output_plan)[self.slots[self.output]]
+
+    def outputs_bits(self, start=0, size=None):
+        """Столбцы всех выходов за одно вычисление плана"""
+        values = self.evaluate(start, size, self.output_plan)
+        return [values[self.slots[block_id]] for block_id in self.outputs]
+
+    def truth_table(self, check=None):
+        """TruthTable для схемы с одним выходом, MultiOutputTable - с несколькими"""
+        columns = evaluate_columns_in_chunks(self.outputs_bits, self.rows_count, check)
+        return make_table(self.variables, self.output_names, columns)
+
+
+def make_table(variables, names, columns):
+    """Таблица истинности по столбцам выходов"""
+    if len(columns) == 1:
+        return TruthTable(variables, columns[0])
+    return MultiOutputTable(variables, zip(names, columns))
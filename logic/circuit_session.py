@@ -0,0 +1,219 @@
+import logging
+import threading
+
+from logic.bitset import variable_columns
+from logic.budget import UNLIMITED
+from logic.circuit import Circuit, CircuitError, SOURCES, GATES, SINKS, gate_value, find_outputs, \
+    output_names, make_table, structure_hash
+from logic.metrics import stage, rows_evaluated
+from logic.scheme_calculator import parse_connection
+from logic.tracing import trace
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitSession:
+    """Схема, редактируемая по шагам, с инкрементальным пересчетом
+
+    Для каждого блока хранится столбец его выхода по всей таблице истинности.
+    Правка (добавление/удаление блока или соединения) помечает измененные
+    блоки, а recompute() пересчитывает только их конус - блоки, до которых
+    изменение доходит по соединениям. Во время редактирования схема может
+    быть незавершенной: такие блоки имеют значение None.
+
+    cache - общий CircuitCache: таблица завершенной схемы ищется и
+    сохраняется в нем по хэшу структуры, как при /api/calculate_scheme.
+    Столбцы блоков сессия все равно вычисляет сама - они нужны для
+    следующих правок.
+    """
+
+    CHECK_INTERVAL = 256  # проверка бюджета через каждые N пересчитанных блоков
+
+    def __init__(self, variables, cache=None):
+        self.variables = list(variables)
+        self.cache = cache
+        self.blocks = {}
+        self.inputs = {}      # id блока -> id блоков, подключенных к входам
+        self.consumers = {}   # id блока -> id блоков, использующих его выход
+        self.values = {}      # id блока -> столбец выхода (None - блок не завершен)
+        self.lock = threading.Lock()
+        self._dirty = set()
+        self._rows_count = 1 << len(self.variables)
+        self._full = (1 << self._rows_count) - 1
+        self._columns = variable_columns(len(self.variables), 0, self._rows_count)
+
+    @classmethod
+    def from_scheme(cls, scheme_data, variables, budget=UNLIMITED, cache=None):
+        """Сессия по схеме в формате фронтенда (как для SchemeCalculator)"""
+        budget.check_variables(len(variables))
+        session = cls(variables, cache=cache)
+        for block in scheme_data.get('blocks', []):
+            session.add_block(block)
+        for connection in scheme_data.get('connections', []):
+            wire = parse_connection(connection.get('id', ''))
+            if wire is not None and wire[0] in session.blocks and wire[1] in session.blocks:
+                session.add_connection(*wire)
+        session.recompute(budget)
+        return session
+
+    def add_block(self, block):
+        block_id = block.get('id')
+        if not block_id:
+            raise CircuitError("Не указан id блока")
+        if block_id in self.blocks:
+            raise CircuitError(f"Блок {block_id} уже существует")
+        self.blocks[block_id] = {'type': block.get('type'), 'variable': block.get('variable'),
+                                 'name': block.get('name')}
+        self.inputs[block_id] = []
+        self.consumers[block_id] = []
+        self._dirty.add(block_id)
+
+    def remove_block(self, block_id):
+        self._require(block_id)
+        for source in self.inputs.pop(block_id):
+            self.consumers[source].remove(block_id)
+        for consumer in self.consumers.pop(block_id):
+            self.inputs[consumer] = [source for source in self.inputs[consumer] if source != block_id]
+            self._dirty.add(consumer)
+        del self.blocks[block_id]
+        self.values.pop(block_id, None)
+        self._dirty.discard(block_id)
+
+    def add_connection(self, source, target):
+        self._require(source)
+        self._require(target)
+        if self._reaches(target, source):
+            raise CircuitError(f"Соединение {source} -> {target} образует цикл")
+        self.inputs[target].append(source)
+        self.consumers[source].append(target)
+        self._dirty.add(target)
+
+    def remove_connection(self, source, target):
+        self._require(source)
+        self._require(target)
+        if source not in self.inputs[target]:
+            raise CircuitError(f"Соединение {source} -> {target} не найдено")
+        self.inputs[target].remove(source)
+        self.consumers[source].remove(target)
+        self._dirty.add(target)
+
+    def apply(self, edit):
+        """Правка в формате {'op': ..., 'block' | 'id' | 'connection' | 'source'/'target': ...}"""
+        op = edit.get('op')
+        if op == 'add_block':
+            self.add_block(edit.get('block') or {})
+        elif op == 'remove_block':
+            self.remove_block(edit.get('id'))
+        elif op in ('add_connection', 'remove_connection'):
+            wire = self._edit_wire(edit)
+            if wire is None:
+                # Как и SchemeCalculator, соединения без направления пропускаются
+                trace(logger, 'Пропущено соединение %s: неопределенное направление', edit.get('id'))
+            elif op == 'add_connection':
+                self.add_connection(*wire)
+            else:
+                self.remove_connection(*wire)
+        else:
+            raise CircuitError(f"Неизвестная операция правки: {op}")
+
+    @staticmethod
+    def _edit_wire(edit):
+        if 'id' in edit:
+            return parse_connection(edit['id'] or '')
+        return edit.get('source'), edit.get('target')
+
+    def _require(self, block_id):
+        if block_id not in self.blocks:
+            raise CircuitError(f"Блок {block_id} не найден")
+
+    def _reaches(self, start, goal):
+        """Достижим ли goal из start по соединениям (для обнаружения циклов)"""
+        stack = [start]
+        seen = set()
+        while stack:
+            block_id = stack.pop()
+            if block_id == goal:
+                return True
+            if block_id not in seen:
+                seen.add(block_id)
+                stack.extend(self.consumers[block_id])
+        return False
+
+    def _cone(self):
+        """Измененные блоки и все блоки ниже по соединениям в топологическом порядке"""
+        cone = set()
+        stack = list(self._dirty)
+        while stack:
+            block_id = stack.pop()
+            if block_id not in cone:
+                cone.add(block_id)
+                stack.extend(self.consumers[block_id])
+
+        in_degree = {block_id: sum(source in cone for source in self.inputs[block_id]) for block_id in cone}
+        ready = [block_id for block_id, degree in in_degree.items() if degree == 0]
+        order = []
+        while ready:
+            block_id = ready.pop()
+            order.append(block_id)
+            for consumer in self.consumers[block_id]:
+                in_degree[consumer] -= 1
+                if in_degree[consumer] == 0:
+                    ready.append(consumer)
+        return order
+
+    def recompute(self, budget=UNLIMITED):
+        """Пересчет конуса измененных блоков, возвращает число пересчитанных блоков"""
+        budget.check_variables(len(self.variables))
+        budget.check_expression(len(self.blocks))
+        with stage('scheme_session'):
+            order = self._cone()
+            for count, block_id in enumerate(order, 1):
+                if count % self.CHECK_INTERVAL == 0:
+                    budget.check()
+                self.values[block_id] = self._evaluate(block_id)
+        self._dirty.clear()
+        if order:
+            rows_evaluated(self._rows_count, 'circuit')
+        trace(logger, 'Пересчитано блоков: %d из %d', len(order), len(self.blocks))
+        return len(order)
+
+    def _evaluate(self, block_id):
+        """Столбец выхода блока (None, если блок или его входы не завершены)"""
+        block = self.blocks[block_id]
+        block_type = block['type']
+        sources = self.inputs[block_id]
+
+        if block_type in SOURCES:
+            if sources or block['variable'] not in self.variables:
+                return None
+            return self._columns[self.variables.index(block['variable'])]
+        if block_type not in GATES and block_type not in SINKS:
+            return None
+        if not sources or (block_type in ('NOT', 'OUTPUT') and len(sources) != 1):
+            return None
+
+        operands = []
+        for source in sources:
+            value = self.values.get(source)
+            if value is None or self.blocks[source]['type'] in SINKS:
+                return None
+            operands.append(value)
+        return gate_value(block_type, operands, self._full)
+
+    def truth_table(self):
+        """Таблица истинности текущей схемы (CircuitError, если схема не завершена)"""
+        if self._dirty:
+            raise CircuitError("Схема изменена, требуется пересчет")
+        if any(value is None for value in self.values.values()):
+            # Причину сообщает полная проверка структуры
+            Circuit(self.blocks, self.inputs, self.variables)
+            raise CircuitError("Схема не завершена")
+
+        outputs = find_outputs(self.blocks, self.consumers)
+        truth_table = make_table(self.variables, output_names(self.blocks, outputs),
+                                 [self.values[block_id] for block_id in outputs])
+        if self.cache is None:
+            return truth_table
+        key = structure_hash(self.blocks, self.inputs, self.variables)
+        entry = self.cache.get(key, lambda: Circuit(self.blocks, self.inputs, self.variables))
+        return entry.seed(truth_table)
@@ -0,0 +1,130 @@
+from sympy import Symbol
+from sympy.logic.boolalg import (And, Or, Not, Xor, Implies, Equivalent, ITE,
+                                 Nand, Nor, Xnor, BooleanTrue, BooleanFalse)
+
+from logic.bitset import variable_columns
+
+
+class CompilationError(Exception):
+    """Выражение не может быть скомпилировано в побитовую программу"""
+    pass
+
+
+class CompiledEvaluator:
+    """Побитово-параллельный вычислитель логического выражения
+
+    Выражение один раз компилируется в линейную программу над слотами.
+    Каждый слот - целое число, в котором бит j хранит значение узла
+    в строке j таблицы истинности (порядок строк как у itertools.product).
+    """
+
+    _BINARY_OPS = {
+        And: 'AND',
+        Or: 'OR',
+        Xor: 'XOR',
+        Nand: 'NAND',
+        Nor: 'NOR',
+        Xnor: 'XNOR',
+    }
+
+    def __init__(self, expression, variables):
+        self.variables = list(variables)
+        self.program = []
+        self._slots = {var: i for i, var in enumerate(self.variables)}
+        self._slot_count = len(self.variables)
+        self.output = self._compile(expression)
+
+    @property
+    def rows_count(self):
+        return 1 << len(self.variables)
+
+    def _emit(self, op, *args):
+        """Добавление инструкции, возвращает номер слота результата"""
+        self.program.append((op, args))
+        slot = self._slot_count
+        self._slot_count += 1
+        return slot
+
+    def _compile(self, expr):
+        """Рекурсивная компиляция узла (общие подвыражения переиспользуются)"""
+        if expr in self._slots:
+            return self._slots[expr]
+
+        if isinstance(expr, Symbol):
+            raise CompilationError(f"Переменная {expr} не указана в списке переменных")
+        if isinstance(expr, BooleanTrue) or expr is True:
+            slot = self._emit('CONST', 1)
+        elif isinstance(expr, BooleanFalse) or expr is False:
+            slot = self._emit('CONST', 0)
+        elif isinstance(expr, Not):
+            if len(expr.args) != 1:
+                raise CompilationError(f"Некорректное отрицание: {expr}")
+            slot = self._emit('NOT', self._compile(expr.args[0]))
+        elif type(expr) in self._BINARY_OPS:
+            operands = [self._compile(arg) for arg in expr.args]
+            slot = self._emit(self._BINARY_OPS[type(expr)], *operands)
+        elif isinstance(expr, Implies):
+            slot = self._emit('IMPLIES', *[self._compile(arg) for arg in expr.args])
+        elif isinstance(expr, Equivalent):
+            slot = self._emit('EQUIV', *[self._compile(arg) for arg in expr.args])
+        elif isinstance(expr, ITE):
+            slot = self._emit('ITE', *[self._compile(arg) for arg in expr.args])
+        else:
+            raise CompilationError(f"Неподдерживаемая операция: {type(expr).__name__}")
+
+        self._slots[expr] = slot
+        return slot
+
+    def evaluate(self, start=0, size=None):
+        """Вычисление результата для строк [start, start + size)
+
+        size должен быть степенью двойки, start - кратен size.
+        Возвращает целое число, бит j которого - результат строки start + j.
+        """
+        if size is None:
+            size = self.rows_count
+        full = (1 << size) - 1
+        slots = variable_columns(len(self.variables), start, size)
+
+        for op, args in self.program:
+            if op == 'CONST':
+                value = full if args[0] else 0
+            elif op == 'NOT':
+                value = full ^ slots[args[0]]
+            elif op == 'AND' or op == 'NAND':
+                value = full
+                for arg in args:
+                    value &= slots[arg]
+                if op == 'NAND':
+                    value ^= full
+            elif op == 'OR' or op == 'NOR':
+                value = 0
+                for arg in args:
+                    value |= slots[arg]
+                if op == 'NOR':
+                    value ^= full
+            elif op == 'XOR' or op == 'XNOR':
+                value = 0
+                for arg in args:
+                    value ^= slots[arg]
+                if op == 'XNOR':
+                    value ^= full
+            elif op == 'IMPLIES':
+                value = (full ^ slots[args[0]]) | slots[args[1]]
+            elif op == 'EQUIV':
+                # Все аргументы равны: либо все истинны, либо все ложны
+                all_true, all_false = full, full
+                for arg in args:
+                    all_true &= slots[arg]
+                    all_false &= full ^ slots[arg]
+                value = all_true | all_false
+            else:  # ITE
+                cond, then, other = (slots[arg] for arg in args)
+                value = (cond & then) | ((full ^ cond) & other)
+            slots.append(value)
+
+        return slots[self.output]
+
+    def result_bits(self):
+        """Столбец результата для всей таблицы"""
+        return self.evaluate()
@@ -0,0 +1,117 @@
+import logging
+
+from logic.bdd import BDD, BDDError
+from logic.budget import UNLIMITED
+from logic.compiled_evaluator import CompiledEvaluator, CompilationError
+from logic.metrics import stage
+from logic.parser import Node, from_sympy
+from logic.sat import SatProblem, evaluate_partial
+from logic.tracing import trace
+
+logger = logging.getLogger(__name__)
+
+
+class EquivalenceChecker:
+    """Проверка равносильности двух выражений без построения таблицы
+
+    До BITSET_MAX_VARIABLES переменных оба выражения компилируются и
+    сравниваются блоками строк до первого расхождения. Иначе выражения
+    строятся в общей диаграмме решений (равносильны, если совпали узлы),
+    а если диаграмма слишком велика - проверяется выполнимость (SAT)
+    выражения first XOR second.
+    """
+
+    METHOD_BITSET = 'bitset'
+    METHOD_BDD = 'bdd'
+    METHOD_SAT = 'sat'
+
+    BITSET_MAX_VARIABLES = 20
+    BDD_MAX_NODES = BDD.MAX_NODES
+    CHUNK_BITS = 16
+
+    def __init__(self, first, second, variables, budget=UNLIMITED):
+        self.first = first
+        self.second = second
+        self.variables = self._all_variables(variables)
+        self.budget = budget
+
+    def _all_variables(self, variables):
+        """Указанные переменные и (в конце) встретившиеся в выражениях, но не указанные"""
+        result = list(variables)
+        extra = (self.first.free_symbols | self.second.free_symbols) - set(result)
+        return result + sorted(extra, key=str)
+
+    def check(self):
+        """Словарь {equivalent, counterexample, method}"""
+        with stage('equivalence'):
+            return self._check()
+
+    def _check(self):
+        if len(self.variables) <= self.BITSET_MAX_VARIABLES:
+            try:
+                return self._check_bitset()
+            except CompilationError as e:
+                trace(logger, 'Сравнение таблиц невозможно: %s', e)
+        try:
+            return self._check_bdd()
+        except BDDError as e:
+            trace(logger, 'Сравнение диаграмм невозможно: %s', e)
+        return self._check_sat()
+
+    def _result(self, method, assignment):
+        if assignment is None:
+            return {'equivalent': True, 'counterexample': None, 'method': method}
+        return {
+            'equivalent': False,
+            'counterexample': {
+                'values': {str(var): value for var, value in assignment.items()},
+                'first': self._value(self.first, assignment),
+                'second': self._value(self.second, assignment)
+            },
+            'method': method
+        }
+
+    @staticmethod
+    def _value(expression, assignment):
+        """Значение выражения на наборе по дереву разбора
+
+        subs() оставляет невычисленные подвыражения (например, Implies(True, False)
+        без evaluate), и bool() такого результата всегда истинен.
+        """
+        return bool(evaluate_partial(from_sympy(expression), {str(var): value for var, value in assignment.items()}))
+
+    def _check_bitset(self):
+        first = CompiledEvaluator(self.first, self.variables)
+        second = CompiledEvaluator(self.second, self.variables)
+        rows = first.rows_count
+
+        size = min(rows, 1 << self.CHUNK_BITS)
+        for start in range(0, rows, size):
+            self.budget.check()
+            difference = first.evaluate(start, size) ^ second.evaluate(start, size)
+            if difference:
+                index = start + (difference & -difference).bit_length() - 1
+                trace(logger, 'Расхождение в строке %d', index)
+                n = len(self.variables)
+                assignment = {var: bool((index >> (n - 1 - i)) & 1) for i, var in enumerate(self.variables)}
+                return self._result(self.METHOD_BITSET, assignment)
+        return self._result(self.METHOD_BITSET, None)
+
+    def _check_bdd(self):
+        bdd = BDD.for_expressions([self.first, self.second], self.variables,
+                                  budget=self.budget, max_nodes=self.BDD_MAX_NODES)
+        first = bdd.build(self.first)
+        second = bdd.build(self.second)
+        if first == second:
+            return self._result(self.METHOD_BDD, None)
+        model = bdd.any_sat(bdd.exclusive(first, second))
+        return self._result(self.METHOD_BDD, {var: model[var] for var in self.variables})
+
+    def _check_sat(self):
+        self.budget.check()
+        difference = Node('XOR', args=(from_sympy(self.first), from_sympy(self.second)))
+        names = [str(var) for var in self.variables]
+        model = SatProblem(difference, names, budget=self.budget).solve()
+        if model is None:
+            return self._result(self.METHOD_SAT, None)
+        return self._result(self.METHOD_SAT, {var: model[name] for var, name in zip(self.variables, names)})
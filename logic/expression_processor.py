@@ -1,46 +1,59 @@
-from sympy import symbols, sympify
-from sympy.logic.boolalg import BooleanFunction
-from sympy.parsing.sympy_parser import parse_expr
-from sympy.parsing.sympy_parser import standard_transformations
+from logic.metrics import stage
+from logic.parser import ParseError, parse, to_sympy
 
 class ExpressionError(Exception):
-    """Кастомное исключение для ошибок выражений"""
-    pass
+    """Кастомное исключение для ошибок выражений
+
+    position - номер символа в строке выражения, если ошибка синтаксическая.
+    """
+
+    def __init__(self, message, position=None):
+        super().__init__(message)
+        self.position = position
+
+    def __reduce__(self):
+        # Для передачи исключения из процесса пула
+        return type(self), (str(self), self.position)
 
 class ExpressionProcessor:
-    """Обработчик логических выражений"""
+    """Обработчик логических выражений
+
+    parse() строит только синтаксическое дерево (ast); выражение SymPy
+    создается при первом обращении к sympy_expression.
+    """
 
     def __init__(self, expression_str, variables_str):
         self.original_expression = expression_str
         self.variables_str = variables_str
-        self.sympy_expression = None
+        self.ast = None
         self.sympy_variables = None
         self.is_parsed = False
+        self._sympy_expression = None
 
     def parse(self):
         """Парсинг выражения и переменных"""
-        try:
-            # Нормализация синтаксиса
-            normalized_expr = self._normalize_syntax(self.original_expression)
-
+        with stage('parse'):
             # Парсинг переменных
             self.sympy_variables = self._parse_variables()
 
             # Парсинг выражения
-            self.sympy_expression = self._parse_expression(normalized_expr)
-            self.is_parsed = True
+            self.ast = self._parse_expression(self.original_expression)
+        self._sympy_expression = None
+        self.is_parsed = True
 
-            return True
+        return True
 
-        except Exception as e:
-            raise ExpressionError(f"Ошибка парсинга: {str(e)}")
-
-    def _normalize_syntax(self, expression):
-        """Приведение синтаксиса к формату SymPy"""
-        return (expression
-                .replace('&&', '&')
-                .replace('||', '|')
-                .replace('!', '~'))
+    @property
+    def sympy_expression(self):
+        """Выражение SymPy (строится по дереву лениво)"""
+        if self._sympy_expression is None and self.ast is not None:
+            known = {str(var): var for var in self.sympy_variables}
+            try:
+                with stage('sympy'):
+                    self._sympy_expression = to_sympy(self.ast, known)
+            except RecursionError:
+                raise ExpressionError("Ошибка парсинга: слишком глубокая вложенность")
+        return self._sympy_expression
 
     def _parse_variables(self):
         """Парсинг строки переменных"""
@@ -49,19 +62,19 @@ class ExpressionProcessor:
             raise ExpressionError("Не указаны переменные")
 
         # Создаем символы
-        sym_vars = symbols(','.join(variables))
+        from sympy import symbols
+        try:
+            sym_vars = symbols(','.join(variables))
+        except Exception as e:
+            raise ExpressionError(f"Ошибка парсинга переменных: {str(e)}")
         return [sym_vars] if len(variables) == 1 else list(sym_vars)
 
     def _parse_expression(self, expression_str):
-        """Парсинг выражения"""
+        """Парсинг выражения в синтаксическое дерево"""
         try:
-            transformations = standard_transformations
-            expr = parse_expr(expression_str,
-                            transformations=transformations,
-                            evaluate=False)
-            return expr
-        except Exception as e:
-            raise ExpressionError(f"Не удалось распарсить выражение: {str(e)}")
+            return parse(expression_str)
+        except ParseError as e:
+            raise ExpressionError(f"Ошибка парсинга: {str(e)}", position=e.position)
 
     def validate(self):
         """Валидация выражения"""
@@ -0,0 +1,143 @@
+"""Карты Карно и импликанты по компактной таблице истинности
+
+Модуль не зависит от SymPy: все вычисляется по битовому столбцу
+результата (бит r - строка r, первая переменная - старший бит номера).
+
+Куб - как в Minimizer: пара (value, mask), бит p маски означает, что
+переменная с позицией p = n - 1 - i входит в терм. Для клиента кубы
+выдаются шаблонами вида '1-0' (символ на переменную, '-' - не входит).
+"""
+from logic.bitset import variable_column
+from logic.budget import BudgetExceeded, UNLIMITED
+from logic.metrics import stage
+
+
+def gray_codes(count):
+    """Коды Грея из count бит в порядке обхода строк/столбцов карты"""
+    return [index ^ (index >> 1) for index in range(1 << count)]
+
+
+class KarnaughMap:
+    """Раскладка карты Карно, простые и существенные импликанты
+
+    Простые импликанты находятся за один проход по подмножествам свободных
+    переменных: для множества D столбец G[D] отмечает строки, чей куб со
+    свободными переменными D целиком лежит в единичном множестве, и
+    получается из G[D без p] одной операцией над всем столбцом.
+    """
+
+    MAX_VARIABLES = 12  # 2**n столбцов по 2**n бит
+    LAYOUT_MAX_VARIABLES = 6  # больше - карта не нужна клиенту (до 4 карт 4x4)
+    CHECK_INTERVAL = 256
+
+    def __init__(self, truth_table, budget=UNLIMITED):
+        self.variables = [str(var) for var in truth_table.variables]
+        self.n = len(self.variables)
+        self.bits = truth_table.bits
+        self.budget = budget
+        if self.n > self.MAX_VARIABLES:
+            raise BudgetExceeded('max_kmap_variables', self.n, self.MAX_VARIABLES)
+        self.size = 1 << self.n
+        self.columns = [variable_column(p, self.size) for p in range(self.n)]  # по позициям
+
+    def pattern(self, cube):
+        """Шаблон куба: '1', '0' или '-' для каждой переменной"""
+        value, mask = cube
+        return ''.join('-' if not (mask >> p) & 1 else '1' if (value >> p) & 1 else '0'
+                       for p in range(self.n - 1, -1, -1))
+
+    def cube_bits(self, cube):
+        """Множество строк куба"""
+        value, mask = cube
+        bits = 1 << value
+        for p in range(self.n):
+            if not (mask >> p) & 1:
+                bits |= bits << (1 << p)
+        return bits
+
+    def layout(self):
+        """Раскладка карты с кодами Грея или None, если переменных слишком много
+
+        Первые n - 4 переменных (при n > 4) выбирают карту 4x4, следующие -
+        строки, последние - столбцы; ячейки - строки из '0' и '1'.
+        """
+        if self.n > self.LAYOUT_MAX_VARIABLES:
+            return None
+        map_count = max(self.n - 4, 0)
+        row_count = (self.n - map_count) // 2
+        column_count = self.n - map_count - row_count
+        rows, columns = gray_codes(row_count), gray_codes(column_count)
+
+        maps = []
+        for fixed in range(1 << map_count):
+            cells = []
+            for row in rows:
+                base = (fixed << (row_count + column_count)) | (row << column_count)
+                cells.append(''.join('1' if (self.bits >> (base | column)) & 1 else '0' for column in columns))
+            maps.append({'fixed': format(fixed, f'0{map_count}b') if map_count else '', 'cells': cells})
+
+        return {
+            'map_variables': self.variables[:map_count],
+            'row_variables': self.variables[map_count:map_count + row_count],
+            'column_variables': self.variables[map_count + row_count:],
+            'row_codes': [format(code, f'0{row_count}b') if row_count else '' for code in rows],
+            'column_codes': [format(code, f'0{column_count}b') for code in columns],
+            'maps': maps
+        }
+
+    def prime_implicants(self):
+        """Простые импликанты (value, mask) в порядке шаблонов"""
+        if self.bits == 0:
+            return []
+        full_mask = self.size - 1
+        implicants = [0] * self.size  # D -> G[D]
+        implicants[0] = self.bits
+        for free in range(1, self.size):
+            if free % self.CHECK_INTERVAL == 0:
+                self.budget.check()
+            p = (free & -free).bit_length() - 1
+            previous = implicants[free ^ (1 << p)]
+            if previous:
+                # Строки с нулевым битом p, у которых и пара по биту p в G, и сами пары
+                pairs = previous & ~self.columns[p] & (previous >> (1 << p))
+                implicants[free] = pairs | (pairs << (1 << p))
+
+        primes = []
+        for free in range(self.size):
+            rows = implicants[free]
+            if not rows:
+                continue
+            if free % self.CHECK_INTERVAL == 0:
+                self.budget.check()
+            for p in range(self.n):
+                if not (free >> p) & 1:
+                    rows &= ~implicants[free | (1 << p)]
+                else:
+                    rows &= ~self.columns[p]  # представитель куба - строка с нулями в D
+            while rows:
+                low = rows & -rows
+                primes.append((low.bit_length() - 1, full_mask ^ free))
+                rows ^= low
+        return sorted(primes, key=self.pattern)
+
+    def essential_implicants(self, primes):
+        """Простые импликанты, единственные покрывающие какой-то минтерм"""
+        once, twice = 0, 0
+        covers = [self.cube_bits(cube) for cube in primes]
+        for bits in covers:
+            twice |= once & bits
+            once |= bits
+        single = once & ~twice
+        return [cube for cube, bits in zip(primes, covers) if bits & single]
+
+    def to_dict(self):
+        """Компактное описание для API"""
+        with stage('kmap'):
+            primes = self.prime_implicants()
+            essential = self.essential_implicants(primes)
+            return {
+                'variables': self.variables,
+                'layout': self.layout(),
+                'prime_implicants': [self.pattern(cube) for cube in primes],
+                'essential_implicants': [self.pattern(cube) for cube in essential]
+            }
@@ -0,0 +1,261 @@
+"""Метрики вычислений: счетчики, гистограммы и время этапов запроса
+
+Этапы (разбор, построение таблицы, анализ, КНФ/ДНФ, сериализация ...)
+оборачиваются в stage(): длительность попадает в гистограмму этапов и,
+если для текущего запроса включен сбор (timing), в Timings запроса -
+из нее формируется заголовок Server-Timing. Реестр выдается в текстовом
+формате Prometheus (REGISTRY.render()).
+
+Этапы крупные (одна операция, а не одна строка таблицы), поэтому накладные
+расходы - пара вызовов perf_counter и захват блокировки на этап.
+"""
+import bisect
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+
+
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in labels) + '}'
+
+
+class Counter:
+    """Монотонный счетчик с метками"""
+
+    kind = 'counter'
+
+    def __init__(self, name, help_text, labelnames=()):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(str(labels.get(name, '')) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        key = tuple(str(labels.get(name, '')) for name in self.labelnames)
+        return self._values.get(key, 0)
+
+    def samples(self):
+        """Тройки (имя, метки, значение) для вывода"""
+        with self._lock:
+            items = sorted(self._values.items())
+        return [(self.name, tuple(zip(self.labelnames, key)), value) for key, value in items]
+
+
+class Histogram:
+    """Гистограмма с кумулятивными корзинами (как в Prometheus)"""
+
+    kind = 'histogram'
+
+    def __init__(self, name, help_text, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._values = {}  # метки -> [счетчики корзин (последняя - +Inf), сумма, количество]
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(str(labels.get(name, '')) for name in self.labelnames)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    def count(self, **labels):
+        key = tuple(str(labels.get(name, '')) for name in self.labelnames)
+        state = self._values.get(key)
+        return state[2] if state is not None else 0
+
+    def samples(self):
+        with self._lock:
+            items = sorted((key, (list(state[0]), state[1], state[2])) for key, state in self._values.items())
+        result = []
+        for key, (counts, total, count) in items:
+            labels = tuple(zip(self.labelnames, key))
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += bucket_count
+                result.append((f'{self.name}_bucket', labels + (('le', _format_value(float(bound))),),
+                               cumulative))
+            result.append((f'{self.name}_sum', labels, total))
+            result.append((f'{self.name}_count', labels, count))
+        return result
+
+
+class Registry:
+    """Набор метрик и функций-сборщиков для вывода в формате Prometheus
+
+    Сборщик - функция без аргументов, возвращающая список кортежей
+    (имя, тип, описание, [(метки, значение), ...]); вызывается при выводе,
+    поэтому счетчики, которые уже ведутся в других местах (например, кэши),
+    не дублируются на горячем пути.
+    """
+
+    def __init__(self):
+        self._metrics = []
+        self._collectors = []
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        with self._lock:
+            self._metrics.append(metric)
+        return metric
+
+    def register_collector(self, collector):
+        with self._lock:
+            self._collectors.append(collector)
+        return collector
+
+    def counter(self, name, help_text, labelnames=()):
+        return self.register(Counter(name, help_text, labelnames))
+
+    def histogram(self, name, help_text, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self.register(Histogram(name, help_text, labelnames, buckets))
+
+    def render(self):
+        """Текстовый формат Prometheus (версия 0.0.4)"""
+        with self._lock:
+            metrics = list(self._metrics)
+            collectors = list(self._collectors)
+
+        lines = []
+        for metric in metrics:
+            lines.append(f'# HELP {metric.name} {metric.help_text}')
+            lines.append(f'# TYPE {metric.name} {metric.kind}')
+            for name, labels, value in metric.samples():
+                lines.append(f'{name}{_format_labels(labels)} {_format_value(value)}')
+        for collector in collectors:
+            for name, kind, help_text, samples in collector():
+                lines.append(f'# HELP {name} {help_text}')
+                lines.append(f'# TYPE {name} {kind}')
+                for labels, value in samples:
+                    lines.append(f'{name}{_format_labels(tuple(labels.items()))} {_format_value(value)}')
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = Registry()
+
+STAGE_SECONDS = REGISTRY.histogram('booltrainer_stage_seconds', 'Длительность этапов вычисления', ('stage',))
+ROWS_EVALUATED = REGISTRY.counter('booltrainer_rows_evaluated_total', 'Вычислено строк таблиц истинности',
+                                  ('source',))
+
+
+class Timings:
+    """Этапы одного запроса для заголовка Server-Timing"""
+
+    def __init__(self):
+        self.stages = []  # пары (этап, секунды) в порядке завершения
+        self.rows = {}    # источник -> число вычисленных строк
+
+    def add(self, name, seconds):
+        self.stages.append((name, seconds))
+
+    def totals(self):
+        """Суммарная длительность по этапам в порядке первого появления"""
+        result = {}
+        for name, seconds in self.stages:
+            result[name] = result.get(name, 0.0) + seconds
+        return result
+
+    def header(self, total=None):
+        """Значение заголовка Server-Timing (длительности в миллисекундах)"""
+        parts = [f'{name};dur={seconds * 1000:.3f}' for name, seconds in self.totals().items()]
+        if total is not None:
+            parts.append(f'total;dur={total * 1000:.3f}')
+        return ', '.join(parts)
+
+    def to_dict(self):
+        """Сериализуемый вид (для передачи из процесса пула)"""
+        return {'stages': list(self.stages), 'rows': dict(self.rows)}
+
+
+_current_timings = contextvars.ContextVar('logic_timings', default=None)
+
+
+def start_timing():
+    """Новый сбор этапов для текущего контекста (например, в before_request)"""
+    current = Timings()
+    _current_timings.set(current)
+    return current
+
+
+def stop_timing():
+    _current_timings.set(None)
+
+
+def current_timings():
+    return _current_timings.get()
+
+
+@contextmanager
+def timing():
+    """Сбор этапов в блоке with; возвращает Timings"""
+    previous = _current_timings.get()
+    current = start_timing()
+    try:
+        yield current
+    finally:
+        _current_timings.set(previous)
+
+
+@contextmanager
+def stage(name):
+    """Замер этапа: гистограмма этапов и Timings текущего запроса"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        STAGE_SECONDS.observe(elapsed, stage=name)
+        current = _current_timings.get()
+        if current is not None:
+            current.add(name, elapsed)
+
+
+def rows_evaluated(count, source):
+    """Учет вычисленных строк таблицы (source - expression, circuit, stream)"""
+    ROWS_EVALUATED.inc(count, source=source)
+    current = _current_timings.get()
+    if current is not None:
+        current.rows[source] = current.rows.get(source, 0) + count
+
+
+def merge(data):
+    """Учет этапов и строк, собранных в другом процессе (Timings.to_dict())"""
+    current = _current_timings.get()
+    for name, seconds in data['stages']:
+        STAGE_SECONDS.observe(seconds, stage=name)
+        if current is not None:
+            current.add(name, seconds)
+    for source, count in data['rows'].items():
+        ROWS_EVALUATED.inc(count, source=source)
+        if current is not None:
+            current.rows[source] = current.rows.get(source, 0) + count
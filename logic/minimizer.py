@@ -0,0 +1,244 @@
+import time
+
+from sympy import And, Or, Not, true, false
+from logic.budget import UNLIMITED
+from logic.bitset import variable_columns
+
+
+class Minimizer:
+    """Минимизация двухуровневых форм (ДНФ/КНФ) по таблице истинности
+
+    Куб - пара (value, mask) над битами номера строки: бит p маски означает,
+    что переменная с позицией p входит в терм, бит p value - ее значение.
+    Позиция переменной i равна n - 1 - i (первая переменная - старший бит).
+
+    Точный режим - метод Квайна-МакКласки с перебором покрытий,
+    эвристический - однопроходные EXPAND/IRREDUNDANT в духе Espresso.
+    """
+
+    MODE_AUTO = 'auto'
+    MODE_EXACT = 'exact'
+    MODE_HEURISTIC = 'heuristic'
+
+    EXACT_MAX_VARIABLES = 10
+
+    def __init__(self, variables, on_bits, time_limit=1.0, budget=UNLIMITED):
+        self.variables = list(variables)
+        self.n = len(self.variables)
+        self.full = (1 << (1 << self.n)) - 1
+        self.on_bits = on_bits & self.full
+        self.time_limit = time_limit
+        self.budget = budget
+        self.columns = variable_columns(self.n, 0, 1 << self.n)
+        self._deadline = None
+        self.used_mode = None
+
+    # ----- Публичный интерфейс -----
+
+    def minimize_sop(self, mode=MODE_AUTO):
+        """Минимальная ДНФ: список кубов единичного множества"""
+        return self._minimize(self.on_bits, mode)
+
+    def minimize_pos(self, mode=MODE_AUTO):
+        """Минимальная КНФ: список кубов нулевого множества (каждый - дизъюнкт)"""
+        return self._minimize(self.full ^ self.on_bits, mode)
+
+    def sop_expression(self, mode=MODE_AUTO):
+        """ДНФ в виде выражения SymPy"""
+        if self.on_bits == self.full:
+            return true
+        return Or(*[And(*self._literals(cube)) for cube in self.minimize_sop(mode)])
+
+    def pos_expression(self, mode=MODE_AUTO):
+        """КНФ в виде выражения SymPy"""
+        if self.on_bits == 0:
+            return false
+        # Куб нулевого множества x & ~y дает дизъюнкт ~x | y
+        return And(*[Or(*[Not(literal) for literal in self._literals(cube)])
+                      for cube in self.minimize_pos(mode)])
+
+    # ----- Кубы -----
+
+    def _positions(self, mask):
+        return [p for p in range(self.n) if (mask >> p) & 1]
+
+    def _literals(self, cube):
+        value, mask = cube
+        literals = []
+        for p in sorted(self._positions(mask), reverse=True):
+            symbol = self.variables[self.n - 1 - p]
+            literals.append(symbol if (value >> p) & 1 else Not(symbol))
+        return literals
+
+    def cube_bits(self, cube):
+        """Множество строк, покрываемых кубом"""
+        value, mask = cube
+        bits = self.full
+        for p in self._positions(mask):
+            column = self.columns[self.n - 1 - p]
+            bits &= column if (value >> p) & 1 else self.full ^ column
+        return bits
+
+    @staticmethod
+    def _covers(cube, minterm):
+        value, mask = cube
+        return minterm & mask == value
+
+    def _expired(self):
+        """Истек срок точного режима (при исчерпании бюджета - BudgetExceeded)"""
+        self.budget.check()
+        return self._deadline is not None and time.monotonic() > self._deadline
+
+    @staticmethod
+    def _minterms(bits):
+        return [index for index, bit in enumerate(format(bits, 'b')[::-1]) if bit == '1']
+
+    def _minimize(self, on_bits, mode):
+        if on_bits == 0:
+            return []
+        full_mask = (1 << self.n) - 1
+        if on_bits == self.full:
+            return [(0, 0)]
+
+        limits = [limit for limit in (self.time_limit, self.budget.remaining()) if limit is not None]
+        self._deadline = time.monotonic() + min(limits) if limits else None
+        if mode == self.MODE_AUTO:
+            mode = self.MODE_EXACT if self.n <= self.EXACT_MAX_VARIABLES else self.MODE_HEURISTIC
+
+        if mode == self.MODE_EXACT:
+            cover = self._exact(on_bits, full_mask)
+            if cover is not None:
+                self.used_mode = self.MODE_EXACT
+                return sorted(cover)
+
+        self.used_mode = self.MODE_HEURISTIC
+        return sorted(self._heuristic(on_bits, full_mask))
+
+    # ----- Точный режим (Квайн-МакКласки) -----
+
+    def _exact(self, on_bits, full_mask):
+        """Минимальное покрытие простыми импликантами (None при превышении времени)"""
+        primes = self._prime_implicants(self._minterms(on_bits), full_mask)
+        if primes is None:
+            return None
+        primes = [(cube, self.cube_bits(cube)) for cube in sorted(primes)]
+        if self._expired():
+            return None
+
+        # Существенные импликанты - единственные, покрывающие какой-то минтерм
+        once, twice = 0, 0
+        for _, bits in primes:
+            twice |= once & bits
+            once |= bits
+        single = once & ~twice
+        cover = [item for item in primes if item[1] & single]
+
+        uncovered = on_bits
+        for _, bits in cover:
+            uncovered &= ~bits
+        candidates = [item for item in primes if item[1] & uncovered and item not in cover]
+
+        best = self._greedy(uncovered, candidates)
+        exact = self._branch_and_bound(uncovered, candidates, [], best)
+        if exact is not None:
+            best = exact
+        return [cube for cube, _ in cover + best]
+
+    def _prime_implicants(self, minterms, full_mask):
+        current = {(m, full_mask) for m in minterms}
+        primes = set()
+        while current:
+            if self._expired():
+                return None
+            merged, used = set(), set()
+            for value, mask in current:
+                for p in self._positions(mask):
+                    bit = 1 << p
+                    if value & bit:
+                        continue
+                    partner = (value | bit, mask)
+                    if partner in current:
+                        merged.add((value, mask & ~bit))
+                        used.add((value, mask))
+                        used.add(partner)
+            primes |= current - used
+            current = merged
+        return primes
+
+    @staticmethod
+    def _cost(cover):
+        return len(cover), sum(bin(mask).count('1') for (_, mask), _ in cover)
+
+    def _branch_and_bound(self, uncovered, candidates, chosen, best):
+        """Перебор покрытий с отсечением (None, если не уложились во время)"""
+        if self._expired():
+            return None
+        if not uncovered:
+            if self._cost(chosen) < self._cost(best):
+                return list(chosen)
+            return best
+        if len(chosen) + 1 > len(best):
+            return best
+
+        # Ветвимся по младшему непокрытому минтерму: его покрывает хотя бы одна импликанта
+        minterm_bit = uncovered & -uncovered
+        options = [item for item in candidates if item[1] & minterm_bit]
+        options.sort(key=lambda item: -(item[1] & uncovered).bit_count())
+        for item in options:
+            chosen.append(item)
+            result = self._branch_and_bound(uncovered & ~item[1], candidates, chosen, best)
+            chosen.pop()
+            if result is None:
+                return None
+            best = result
+        return best
+
+    @staticmethod
+    def _greedy(uncovered, candidates):
+        """Жадное покрытие: каждый раз импликанта с наибольшим числом новых минтермов"""
+        cover = []
+        while uncovered:
+            item = max(candidates, key=lambda item: (item[1] & uncovered).bit_count())
+            cover.append(item)
+            uncovered &= ~item[1]
+        return cover
+
+    # ----- Эвристический режим (Espresso-подобный) -----
+
+    def _heuristic(self, on_bits, full_mask):
+        """EXPAND минтермов до простых импликант и удаление избыточных кубов"""
+        cover = []
+        pending = on_bits
+        while pending:
+            # Младший еще не покрытый минтерм
+            m = (pending & -pending).bit_length() - 1
+            cube = (m, full_mask) if self._expired() else self._expand((m, full_mask), on_bits)
+            bits = self.cube_bits(cube)
+            cover.append((cube, bits))
+            pending &= ~bits
+        return self._irredundant(cover)
+
+    def _expand(self, cube, on_bits):
+        """Удаление литералов, пока куб остается внутри единичного множества"""
+        value, mask = cube
+        for p in self._positions(mask):
+            bit = 1 << p
+            candidate = (value & ~bit, mask & ~bit)
+            if self.cube_bits(candidate) & ~on_bits == 0:
+                value, mask = candidate
+        return value, mask
+
+    def _irredundant(self, cover):
+        """Удаление кубов, покрытых объединением остальных"""
+        # Сначала пытаемся удалить кубы с наименьшим покрытием
+        cover = sorted(cover, key=lambda item: bin(item[1]).count('1'))
+        suffix = [0] * (len(cover) + 1)
+        for i in range(len(cover) - 1, -1, -1):
+            suffix[i] = suffix[i + 1] | cover[i][1]
+
+        kept, prefix = [], 0
+        for i, (cube, bits) in enumerate(cover):
+            if bits & ~(prefix | suffix[i + 1]):
+                kept.append(cube)
+                prefix |= bits
+        return kept
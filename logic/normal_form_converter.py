@@ -1,27 +1,76 @@
+import logging
 from sympy import to_cnf, to_dnf
+from logic.budget import UNLIMITED, BudgetExceeded
+from logic.bitset import evaluate_in_chunks
+from logic.compiled_evaluator import CompiledEvaluator, CompilationError
+from logic.metrics import stage, rows_evaluated
+from logic.minimizer import Minimizer
+from logic.tracing import trace
+
+logger = logging.getLogger(__name__)
 
 
 class NormalFormConverter:
     """Конвертер нормальных форм"""
 
-    def __init__(self, expression):
+    def __init__(self, expression, variables=None, mode=Minimizer.MODE_AUTO, budget=UNLIMITED,
+                 result_bits=None):
+        """result_bits - уже вычисленный столбец таблицы истинности по variables"""
         self.original_expression = expression
+        self.variables = variables if variables is not None else \
+            sorted(getattr(expression, 'free_symbols', ()), key=str)
+        self.mode = mode
+        self.budget = budget
+        self.result_bits = result_bits
         self.cnf_form = None
         self.dnf_form = None
+        self._minimizer = None
+
+    def _get_minimizer(self):
+        """Минимизатор по таблице истинности (None, если выражение не компилируется)"""
+        if self._minimizer is None:
+            self.budget.check_variables(len(self.variables))
+            if self.result_bits is None:
+                try:
+                    evaluator = CompiledEvaluator(self.original_expression, self.variables)
+                except CompilationError:
+                    return None
+                with stage('truth_table'):
+                    self.result_bits = evaluate_in_chunks(evaluator.evaluate, evaluator.rows_count,
+                                                          self.budget.check)
+                rows_evaluated(evaluator.rows_count, 'expression')
+            self._minimizer = Minimizer(self.variables, self.result_bits, budget=self.budget)
+        return self._minimizer
 
     def to_cnf(self):
         """Конъюнктивная нормальная форма"""
         try:
-            self.cnf_form = to_cnf(self.original_expression, simplify=True)
+            minimizer = self._get_minimizer()
+            with stage('cnf'):
+                if minimizer is not None:
+                    self.cnf_form = minimizer.pos_expression(self.mode)
+                    trace(logger, 'КНФ: режим минимизации %s', minimizer.used_mode)
+                else:
+                    self.cnf_form = to_cnf(self.original_expression, simplify=True)
             return str(self.cnf_form)
+        except BudgetExceeded:
+            raise
         except Exception as e:
             return f"Ошибка преобразования в КНФ: {str(e)}"
 
     def to_dnf(self):
         """Дизъюнктивная нормальная форма"""
         try:
-            self.dnf_form = to_dnf(self.original_expression, simplify=True)
+            minimizer = self._get_minimizer()
+            with stage('dnf'):
+                if minimizer is not None:
+                    self.dnf_form = minimizer.sop_expression(self.mode)
+                    trace(logger, 'ДНФ: режим минимизации %s', minimizer.used_mode)
+                else:
+                    self.dnf_form = to_dnf(self.original_expression, simplify=True)
             return str(self.dnf_form)
+        except BudgetExceeded:
+            raise
         except Exception as e:
             return f"Ошибка преобразования в ДНФ: {str(e)}"
 
@@ -0,0 +1,260 @@
+"""Разбор логических выражений в легкое синтаксическое дерево
+
+Поддерживаемый синтаксис (по возрастанию приоритета):
+    a <-> b         равносильность (левоассоциативна)
+    a -> b          импликация (правоассоциативна)
+    a | b, a || b   дизъюнкция
+    a ^ b           исключающее ИЛИ
+    a & b, a && b   конъюнкция
+    ~a, !a          отрицание
+Константы: True/False, true/false, 1/0. Скобки - круглые.
+
+Дерево строится без SymPy; преобразование в SymPy (to_sympy) выполняется
+отдельно, когда оно действительно нужно. SymPy импортируется только там.
+"""
+import re
+
+
+class ParseError(Exception):
+    """Синтаксическая ошибка; position - номер символа в строке (с нуля)"""
+
+    def __init__(self, message, position):
+        self.message = message
+        self.position = position
+        super().__init__(f"{message} (позиция {position})")
+
+
+class Node:
+    """Узел дерева: kind - VAR, CONST или операция (NOT, AND, OR, XOR, IMPLIES, EQUIV)"""
+
+    __slots__ = ('kind', 'value', 'args', 'position')
+
+    def __init__(self, kind, value=None, args=(), position=0):
+        self.kind = kind
+        self.value = value
+        self.args = args
+        self.position = position
+
+    def __repr__(self):
+        if self.kind in ('VAR', 'CONST'):
+            return f'{self.kind}({self.value!r})'
+        return f"{self.kind}({', '.join(map(repr, self.args))})"
+
+    def variables(self):
+        """Имена переменных в порядке первого появления"""
+        names = {}
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if node.kind == 'VAR':
+                names.setdefault(node.value, None)
+            else:
+                stack.extend(reversed(node.args))
+        return list(names)
+
+
+_TOKEN = re.compile(r'''
+    (?P<space>\s+)
+  | (?P<name>[A-Za-z_][A-Za-z0-9_]*)
+  | (?P<number>[0-9]+)
+  | (?P<op><->|->|&&|\|\||[&|^~!()])
+''', re.VERBOSE)
+
+_OPERATORS = {'&&': '&', '||': '|', '!': '~'}
+
+_CONSTANTS = {'True': True, 'true': True, 'False': False, 'false': False}
+
+# Инфиксные операторы: (вид узла, сила связывания слева, правоассоциативность)
+_INFIX = {
+    '<->': ('EQUIV', 10, False),
+    '->': ('IMPLIES', 20, True),
+    '|': ('OR', 30, False),
+    '^': ('XOR', 40, False),
+    '&': ('AND', 50, False),
+}
+_PREFIX_POWER = 60
+
+# Многоместные операции: цепочка a & b & c дает один узел
+_FLATTEN = ('AND', 'OR', 'XOR')
+
+def tokenize(text):
+    """Список лексем (тип, значение, позиция), последняя - ('end', None, len(text))"""
+    tokens = []
+    position = 0
+    while position < len(text):
+        match = _TOKEN.match(text, position)
+        if match is None:
+            raise ParseError(f"Недопустимый символ {text[position]!r}", position)
+        kind = match.lastgroup
+        value = match.group()
+        if kind == 'op':
+            tokens.append(('op', _OPERATORS.get(value, value), position))
+        elif kind == 'number':
+            if value not in ('0', '1'):
+                raise ParseError(f"Недопустимая константа {value!r}", position)
+            tokens.append(('const', value == '1', position))
+        elif kind == 'name':
+            if value in _CONSTANTS:
+                tokens.append(('const', _CONSTANTS[value], position))
+            else:
+                tokens.append(('name', value, position))
+        position = match.end()
+    tokens.append(('end', None, len(text)))
+    return tokens
+
+
+class Parser:
+    """Разбор методом Пратта (нисходящий разбор с приоритетами операторов)"""
+
+    def __init__(self, text):
+        self.text = text
+        self.tokens = tokenize(text)
+        self.index = 0
+
+    def parse(self):
+        if self.tokens[0][0] == 'end':
+            raise ParseError("Пустое выражение", 0)
+        try:
+            node = self._expression(0)
+        except RecursionError:
+            raise ParseError("Слишком глубокая вложенность", self.tokens[self.index][2])
+        kind, value, position = self.tokens[self.index]
+        if kind != 'end':
+            raise ParseError(f"Лишний фрагмент {self._describe(kind, value)}", position)
+        return node
+
+    @staticmethod
+    def _describe(kind, value):
+        if kind == 'end':
+            return 'конец выражения'
+        if kind == 'const':
+            return repr(str(int(value)))
+        return repr(value)
+
+    def _advance(self):
+        token = self.tokens[self.index]
+        self.index += 1
+        return token
+
+    def _expression(self, min_power):
+        left = self._prefix()
+        while True:
+            kind, value, position = self.tokens[self.index]
+            if kind != 'op' or value not in _INFIX:
+                return left
+            node_kind, power, right_assoc = _INFIX[value]
+            if power <= min_power:
+                return left
+            self.index += 1
+            right = self._expression(power - 1 if right_assoc else power)
+            left = self._combine(node_kind, left, right, position)
+
+    @staticmethod
+    def _combine(kind, left, right, position):
+        if kind in _FLATTEN:
+            args = left.args if left.kind == kind else (left,)
+            return Node(kind, args=args + (right,), position=left.position)
+        return Node(kind, args=(left, right), position=position)
+
+    def _prefix(self):
+        kind, value, position = self._advance()
+        if kind == 'name':
+            return Node('VAR', value, position=position)
+        if kind == 'const':
+            return Node('CONST', value, position=position)
+        if kind == 'op' and value == '~':
+            operand = self._expression(_PREFIX_POWER)
+            return Node('NOT', args=(operand,), position=position)
+        if kind == 'op' and value == '(':
+            node = self._expression(0)
+            closing, closing_value, closing_position = self._advance()
+            if closing != 'op' or closing_value != ')':
+                raise ParseError(f"Ожидалась ')', получено {self._describe(closing, closing_value)}",
+                                 closing_position)
+            return node
+        if kind == 'end':
+            raise ParseError("Неожиданный конец выражения", position)
+        raise ParseError(f"Ожидался операнд, получено {self._describe(kind, value)}", position)
+
+
+def parse(text):
+    """Синтаксическое дерево выражения (ParseError при ошибке)"""
+    return Parser(text).parse()
+
+
+def to_sympy(node, symbols=None):
+    """Преобразование дерева в выражение SymPy (без упрощения)
+
+    symbols - словарь {имя: Symbol}; недостающие символы создаются.
+    """
+    from sympy import Symbol, true, false
+    from sympy.logic.boolalg import And, Or, Not, Xor, Implies, Equivalent
+
+    operations = {'AND': And, 'OR': Or, 'XOR': Xor, 'IMPLIES': Implies, 'EQUIV': Equivalent}
+    symbols = {} if symbols is None else symbols
+
+    def convert(current):
+        if current.kind == 'VAR':
+            result = symbols.get(current.value)
+            if result is None:
+                result = symbols[current.value] = Symbol(current.value)
+        elif current.kind == 'CONST':
+            result = true if current.value else false
+        elif current.kind == 'NOT':
+            operand = convert(current.args[0])
+            # ~true без вычисления не сворачивается при подстановке значений
+            if operand is true or operand is false:
+                result = false if operand is true else true
+            else:
+                result = Not(operand, evaluate=False)
+        else:
+            result = operations[current.kind](*[convert(arg) for arg in current.args], evaluate=False)
+        return result
+
+    return convert(node)
+
+
+def from_sympy(expression):
+    """Дерево по выражению SymPy (для выражений, построенных не из строки)
+
+    Nand, Nor, Xnor и ITE выражаются через основные операции.
+    """
+    from sympy import Symbol
+    from sympy.logic.boolalg import (And, Or, Not, Xor, Implies, Equivalent, ITE, Nand, Nor, Xnor,
+                                     BooleanTrue, BooleanFalse)
+
+    kinds = [(And, 'AND'), (Or, 'OR'), (Xor, 'XOR'), (Implies, 'IMPLIES'), (Equivalent, 'EQUIV')]
+    negated = [(Nand, 'AND'), (Nor, 'OR'), (Xnor, 'XOR')]
+    memo = {}
+
+    def convert(current):
+        if current in memo:
+            return memo[current]
+        if isinstance(current, Symbol):
+            result = Node('VAR', str(current))
+        elif isinstance(current, BooleanTrue) or current is True:
+            result = Node('CONST', True)
+        elif isinstance(current, BooleanFalse) or current is False:
+            result = Node('CONST', False)
+        elif isinstance(current, Not):
+            result = Node('NOT', args=(convert(current.args[0]),))
+        elif isinstance(current, ITE):
+            condition, then, otherwise = [convert(arg) for arg in current.args]
+            result = Node('OR', args=(Node('AND', args=(condition, then)),
+                                      Node('AND', args=(Node('NOT', args=(condition,)), otherwise))))
+        else:
+            for cls, kind in negated:
+                if isinstance(current, cls):
+                    result = Node('NOT', args=(Node(kind, args=tuple(convert(arg) for arg in current.args)),))
+                    break
+            else:
+                for cls, kind in kinds:
+                    if isinstance(current, cls):
+                        result = Node(kind, args=tuple(convert(arg) for arg in current.args))
+                        break
+                else:
+                    raise ValueError(f"Неподдерживаемая операция: {type(current).__name__}")
+        memo[current] = result
+        return result
+
+    return convert(expression)
@@ -0,0 +1,191 @@
+"""Постоянное хранилище готовых результатов (SQLite)
+
+Банк упражнений вычисляется заранее (precompute.py) и сохраняется в файл
+SQLite. API открывает файл только для чтения с отображением в память (mmap):
+все потоки и процессы читают одни и те же страницы из кэша ОС, а после
+перезапуска или добавления воркеров результаты доступны сразу.
+
+Ключи - канонические: для выражений ExpressionCache.make_key, для схем
+хэш структуры (CircuitCache.make_key). Таблицы хранятся упакованными
+столбцами (как TruthTable.to_bytes).
+"""
+import json
+import logging
+import os
+import sqlite3
+import threading
+
+from logic.truth_table import TruthTable
+
+logger = logging.getLogger(__name__)
+
+# Версия формата результатов: при изменении семантики (например, минимизации
+# КНФ/ДНФ) хранилище старой версии не используется и пересчитывается
+RESULTS_VERSION = 2  # 2 - ключи выражений по лексемам (ExpressionCache.make_key)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS expressions (
+    key TEXT PRIMARY KEY,
+    text TEXT NOT NULL,
+    variables TEXT NOT NULL,
+    truth_table BLOB,
+    cnf TEXT,
+    dnf TEXT
+);
+CREATE TABLE IF NOT EXISTS circuits (
+    key TEXT PRIMARY KEY,
+    variables TEXT NOT NULL,
+    outputs INTEGER NOT NULL,
+    columns BLOB NOT NULL
+);
+"""
+
+
+class ResultStoreError(Exception):
+    """Хранилище недоступно или имеет другую версию формата"""
+    pass
+
+
+def expression_key(key):
+    """Строковый ключ по ключу ExpressionCache.make_key (выражение, переменные)"""
+    expression, variables = key
+    return json.dumps([expression, list(variables)], ensure_ascii=False)
+
+
+class ResultStore:
+    """Хранилище результатов для выражений и схем
+
+    readonly=True - режим API: файл должен существовать, запись невозможна.
+    Соединения создаются отдельно для каждого потока (и заново после fork).
+    """
+
+    MMAP_SIZE = 256 << 20  # байт файла, отображаемых в память
+
+    def __init__(self, path, readonly=True):
+        self.path = path
+        self.readonly = readonly
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        if readonly and not os.path.exists(path):
+            raise ResultStoreError(f"Файл хранилища не найден: {path}")
+        self._check_version(self._connection())
+
+    def _connect(self):
+        if self.readonly:
+            connection = sqlite3.connect(f'file:{self.path}?mode=ro', uri=True, check_same_thread=False)
+        else:
+            connection = sqlite3.connect(self.path, check_same_thread=False)
+            connection.executescript(_SCHEMA)
+            connection.execute("INSERT OR IGNORE INTO meta VALUES ('results_version', ?)",
+                               (str(RESULTS_VERSION),))
+            connection.commit()
+        connection.execute(f'PRAGMA mmap_size={self.MMAP_SIZE}')
+        return connection
+
+    def _connection(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None or self._local.pid != os.getpid():
+            connection = self._local.connection = self._connect()
+            self._local.pid = os.getpid()
+        return connection
+
+    def _check_version(self, connection):
+        try:
+            row = connection.execute("SELECT value FROM meta WHERE name = 'results_version'").fetchone()
+        except sqlite3.DatabaseError as e:
+            raise ResultStoreError(f"Некорректный файл хранилища {self.path}: {e}")
+        if row is None or int(row[0]) != RESULTS_VERSION:
+            raise ResultStoreError(f"Версия результатов хранилища {row and row[0]} "
+                                   f"не совпадает с {RESULTS_VERSION}, выполните precompute заново")
+
+    def _count(self, found):
+        with self._lock:
+            if found:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def expression(self, key):
+        """Сохраненные результаты выражения или None
+
+        Словарь {text, truth_table (TruthTable или None), normal_forms ((КНФ, ДНФ) или None)}.
+        """
+        row = self._connection().execute(
+            'SELECT text, variables, truth_table, cnf, dnf FROM expressions WHERE key = ?',
+            (expression_key(key),)).fetchone()
+        self._count(row is not None)
+        if row is None:
+            return None
+        text, variables, table, cnf, dnf = row
+        return {
+            'text': text,
+            'truth_table': TruthTable(json.loads(variables), int.from_bytes(table, 'little'))
+            if table is not None else None,
+            'normal_forms': (cnf, dnf) if cnf is not None and dnf is not None else None,
+        }
+
+    def circuit(self, key):
+        """Сохраненные столбцы выходов схемы (список битовых множеств) или None"""
+        row = self._connection().execute(
+            'SELECT variables, outputs, columns FROM circuits WHERE key = ?', (key,)).fetchone()
+        self._count(row is not None)
+        if row is None:
+            return None
+        variables, outputs, data = row
+        size = ((1 << len(json.loads(variables))) + 7) // 8
+        return [int.from_bytes(data[index * size:(index + 1) * size], 'little') for index in range(outputs)]
+
+    def save_expression(self, key, text, variables, truth_table=None, normal_forms=None):
+        cnf, dnf = normal_forms if normal_forms is not None else (None, None)
+        self._connection().execute(
+            'INSERT OR REPLACE INTO expressions VALUES (?, ?, ?, ?, ?, ?)',
+            (expression_key(key), text, json.dumps([str(var) for var in variables]),
+             truth_table.to_bytes() if truth_table is not None else None, cnf, dnf))
+
+    def save_circuit(self, key, variables, columns):
+        size = ((1 << len(variables)) + 7) // 8
+        self._connection().execute(
+            'INSERT OR REPLACE INTO circuits VALUES (?, ?, ?, ?)',
+            (key, json.dumps([str(var) for var in variables]), len(columns),
+             b''.join(bits.to_bytes(size, 'little') for bits in columns)))
+
+    def commit(self):
+        self._connection().commit()
+
+    def close(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+    def stats(self):
+        """Счетчики хранилища в формате LRUCache.stats"""
+        connection = self._connection()
+        expressions = connection.execute('SELECT COUNT(*) FROM expressions').fetchone()[0]
+        circuits = connection.execute('SELECT COUNT(*) FROM circuits').fetchone()[0]
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'path': self.path,
+                'size': expressions + circuits,
+                'expressions': expressions,
+                'circuits': circuits,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': 0,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
+
+
+def open_store(path):
+    """Хранилище для чтения или None (путь не задан или файл недоступен)"""
+    if not path:
+        return None
+    try:
+        return ResultStore(path)
+    except ResultStoreError as e:
+        logger.warning('Хранилище результатов отключено: %s', e)
+        return None
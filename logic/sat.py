@@ -0,0 +1,483 @@
+"""Проверка выполнимости без перебора таблицы: кодирование Цейтина и CDCL
+
+Выражение (синтаксическое дерево logic.parser) кодируется в КНФ по Цейтину:
+каждой операции соответствует вспомогательная переменная, равная значению
+подвыражения, поэтому размер КНФ линеен по размеру выражения, а модели КНФ
+взаимно однозначно соответствуют моделям выражения.
+
+Solver - решатель CDCL: два наблюдаемых литерала в клаузе, анализ
+конфликта до первой точки доминирования (1UIP) с выводом новой клаузы,
+нехронологический откат, активность переменных (VSIDS), сохранение фаз
+и перезапуски по последовательности Луби. SymPy не используется.
+"""
+import heapq
+import logging
+
+from logic.budget import UNLIMITED
+from logic.tracing import trace
+
+logger = logging.getLogger(__name__)
+
+
+class SATError(Exception):
+    """Выражение не может быть закодировано (неизвестная операция)"""
+    pass
+
+
+class Solver:
+    """CDCL-решатель для КНФ в формате DIMACS: литерал - ненулевое целое (-v - отрицание v)
+
+    Клаузы можно добавлять между вызовами solve() (например, блокирующие
+    клаузы при перечислении моделей); выведенные клаузы сохраняются.
+    """
+
+    CHECK_INTERVAL = 256   # проверка бюджета через каждые N конфликтов
+    RESTART_BASE = 100     # конфликтов в единице последовательности Луби
+    VAR_DECAY = 0.95
+
+    def __init__(self, budget=UNLIMITED):
+        self.budget = budget
+        self.num_vars = 0
+        self.ok = True
+        self.clauses = []       # литералы клаузы; наблюдаются clause[0] и clause[1]
+        # Внутренний литерал: 2 * v для v и 2 * v + 1 для -v
+        self._watches = [[], []]
+        self._assign = [-1]     # по переменной: -1 - не назначена, 0/1 - значение
+        self._level = [0]
+        self._reason = [None]   # номер клаузы, из которой выведено значение
+        self._phase = [False]
+        self._activity = [0.0]
+        self._seen = [False]
+        self._heap = []
+        self._var_inc = 1.0
+        self._trail = []
+        self._trail_lim = []
+        self._qhead = 0
+        self.stats = {'decisions': 0, 'propagations': 0, 'conflicts': 0, 'learned': 0, 'restarts': 0}
+
+    def new_var(self):
+        self.num_vars += 1
+        self._watches.extend(([], []))
+        self._assign.append(-1)
+        self._level.append(0)
+        self._reason.append(None)
+        self._phase.append(False)
+        self._activity.append(0.0)
+        self._seen.append(False)
+        heapq.heappush(self._heap, (0.0, self.num_vars))
+        return self.num_vars
+
+    def _value(self, lit):
+        """1 - литерал истинен, 0 - ложен, -1 - не назначен"""
+        value = self._assign[lit >> 1]
+        return value if value < 0 else value ^ (lit & 1)
+
+    def add_clause(self, literals):
+        """Добавление клаузы (выполняется на нулевом уровне решений)"""
+        if not self.ok:
+            return False
+        self._backtrack(0)
+        clause = []
+        for literal in literals:
+            while abs(literal) > self.num_vars:
+                self.new_var()
+            lit = 2 * abs(literal) + (literal < 0)
+            value = self._value(lit)
+            if value == 1 or lit ^ 1 in clause:
+                return True  # клауза уже выполнена или тавтологична
+            if value == -1 and lit not in clause:
+                clause.append(lit)
+
+        if not clause:
+            self.ok = False
+        elif len(clause) == 1:
+            self._enqueue(clause[0], None)
+            self.ok = self._propagate() is None
+        else:
+            self._attach(clause)
+        return self.ok
+
+    def _attach(self, clause):
+        index = len(self.clauses)
+        self.clauses.append(clause)
+        self._watches[clause[0]].append(index)
+        self._watches[clause[1]].append(index)
+        return index
+
+    def _enqueue(self, lit, reason):
+        var = lit >> 1
+        self._assign[var] = (lit & 1) ^ 1
+        self._level[var] = len(self._trail_lim)
+        self._reason[var] = reason
+        self._trail.append(lit)
+
+    def _propagate(self):
+        """Распространение единичных клауз; номер конфликтной клаузы или None"""
+        clauses = self.clauses
+        while self._qhead < len(self._trail):
+            false_lit = self._trail[self._qhead] ^ 1
+            self._qhead += 1
+            self.stats['propagations'] += 1
+            watchers = self._watches[false_lit]
+            i = j = 0
+            count = len(watchers)
+            while i < count:
+                index = watchers[i]
+                i += 1
+                clause = clauses[index]
+                if clause[0] == false_lit:
+                    clause[0], clause[1] = clause[1], false_lit
+                first = clause[0]
+                if self._value(first) == 1:
+                    watchers[j] = index
+                    j += 1
+                    continue
+                for k in range(2, len(clause)):
+                    if self._value(clause[k]) != 0:
+                        clause[1], clause[k] = clause[k], false_lit
+                        self._watches[clause[1]].append(index)
+                        break
+                else:
+                    watchers[j] = index
+                    j += 1
+                    if self._value(first) == 0:
+                        while i < count:
+                            watchers[j] = watchers[i]
+                            j += 1
+                            i += 1
+                        del watchers[j:]
+                        return index
+                    self._enqueue(first, index)
+            del watchers[j:]
+        return None
+
+    def _bump(self, var):
+        self._activity[var] += self._var_inc
+        if self._activity[var] > 1e100:
+            self._activity = [activity * 1e-100 for activity in self._activity]
+            self._var_inc *= 1e-100
+            self._heap = [(-self._activity[v], v) for v in range(1, self.num_vars + 1) if self._assign[v] < 0]
+            heapq.heapify(self._heap)
+        elif self._assign[var] < 0:
+            heapq.heappush(self._heap, (-self._activity[var], var))
+
+    def _analyze(self, conflict):
+        """Вывод клаузы по конфликту (1UIP): (клауза, уровень отката)"""
+        seen = self._seen
+        learned = [0]
+        counter = 0
+        lit = None
+        index = len(self._trail) - 1
+        current_level = len(self._trail_lim)
+        clause = self.clauses[conflict]
+
+        while True:
+            for q in (clause if lit is None else clause[1:]):
+                var = q >> 1
+                if not seen[var] and self._level[var] > 0:
+                    seen[var] = True
+                    self._bump(var)
+                    if self._level[var] == current_level:
+                        counter += 1
+                    else:
+                        learned.append(q)
+            while not seen[self._trail[index] >> 1]:
+                index -= 1
+            lit = self._trail[index]
+            index -= 1
+            seen[lit >> 1] = False
+            counter -= 1
+            if counter == 0:
+                break
+            clause = self.clauses[self._reason[lit >> 1]]
+        learned[0] = lit ^ 1
+
+        # Удаление литералов, следующих из остальных литералов клаузы
+        minimized = [learned[0]]
+        for q in learned[1:]:
+            reason = self._reason[q >> 1]
+            if reason is None or any(not seen[r >> 1] and self._level[r >> 1] > 0
+                                     for r in self.clauses[reason][1:]):
+                minimized.append(q)
+        for q in learned[1:]:
+            seen[q >> 1] = False
+
+        if len(minimized) == 1:
+            return minimized, 0
+        # Второй наблюдаемый литерал - с наибольшим уровнем (до него идет откат)
+        best = max(range(1, len(minimized)), key=lambda k: self._level[minimized[k] >> 1])
+        minimized[1], minimized[best] = minimized[best], minimized[1]
+        return minimized, self._level[minimized[1] >> 1]
+
+    def _backtrack(self, level):
+        if len(self._trail_lim) <= level:
+            return
+        start = self._trail_lim[level]
+        for lit in reversed(self._trail[start:]):
+            var = lit >> 1
+            self._phase[var] = bool(self._assign[var])
+            self._assign[var] = -1
+            self._reason[var] = None
+            heapq.heappush(self._heap, (-self._activity[var], var))
+        del self._trail[start:]
+        del self._trail_lim[level:]
+        self._qhead = len(self._trail)
+
+    def _pick(self):
+        """Неназначенная переменная с наибольшей активностью (None - все назначены)"""
+        while self._heap:
+            activity, var = heapq.heappop(self._heap)
+            if self._assign[var] < 0 and -activity == self._activity[var]:
+                return var
+        for var in range(1, self.num_vars + 1):
+            if self._assign[var] < 0:
+                return var
+        return None
+
+    @staticmethod
+    def _luby(index):
+        """index-й член последовательности Луби (1, 1, 2, 1, 1, 2, 4, ...), index с нуля"""
+        size, power = 1, 0
+        while size < index + 1:
+            power += 1
+            size = 2 * size + 1
+        while size - 1 != index:
+            size = (size - 1) >> 1
+            power -= 1
+            index %= size
+        return 1 << power
+
+    def solve(self):
+        """True - КНФ выполнима (модель в model()), False - нет"""
+        if not self.ok:
+            return False
+        self._backtrack(0)
+        if self._propagate() is not None:
+            self.ok = False
+            return False
+
+        restarts = 0
+        conflicts_left = self.RESTART_BASE * self._luby(restarts)
+        while True:
+            conflict = self._propagate()
+            if conflict is not None:
+                self.stats['conflicts'] += 1
+                if self.stats['conflicts'] % self.CHECK_INTERVAL == 0:
+                    self.budget.check()
+                if not self._trail_lim:
+                    self.ok = False
+                    return False
+                learned, level = self._analyze(conflict)
+                self._backtrack(level)
+                if len(learned) == 1:
+                    self._enqueue(learned[0], None)
+                else:
+                    self._enqueue(learned[0], self._attach(learned))
+                    self.stats['learned'] += 1
+                self._var_inc /= self.VAR_DECAY
+                conflicts_left -= 1
+                continue
+
+            if conflicts_left <= 0:
+                restarts += 1
+                self.stats['restarts'] += 1
+                conflicts_left = self.RESTART_BASE * self._luby(restarts)
+                self._backtrack(0)
+                continue
+
+            var = self._pick()
+            if var is None:
+                return True
+            self.stats['decisions'] += 1
+            self._trail_lim.append(len(self._trail))
+            self._enqueue(2 * var + (not self._phase[var]), None)
+
+    def model(self):
+        """Значения переменных {номер: bool} после успешного solve()"""
+        return {var: bool(self._assign[var]) for var in range(1, self.num_vars + 1)}
+
+
+class CNF:
+    """КНФ с именованными переменными выражения и вспомогательными переменными Цейтина"""
+
+    def __init__(self, solver):
+        self.solver = solver
+        self.names = {}  # имя переменной выражения -> номер
+        self._true = None
+
+    def variable(self, name):
+        if name not in self.names:
+            self.names[name] = self.solver.new_var()
+        return self.names[name]
+
+    def true(self):
+        if self._true is None:
+            self._true = self.solver.new_var()
+            self.solver.add_clause([self._true])
+        return self._true
+
+    def _gate(self, clauses_for):
+        output = self.solver.new_var()
+        for clause in clauses_for(output):
+            self.solver.add_clause(clause)
+        return output
+
+    def conjunction(self, operands):
+        return self._gate(lambda x: [[-x, a] for a in operands] + [[x] + [-a for a in operands]])
+
+    def disjunction(self, operands):
+        return self._gate(lambda x: [[x, -a] for a in operands] + [[-x] + list(operands)])
+
+    def exclusive(self, a, b):
+        return self._gate(lambda x: [[-x, a, b], [-x, -a, -b], [x, -a, b], [x, a, -b]])
+
+    def encode(self, node):
+        """Литерал, равный значению дерева (кодирование Цейтина без рекурсии)"""
+        literals = {}
+        stack = [(node, False)]
+        while stack:
+            current, expanded = stack.pop()
+            if id(current) in literals:
+                continue
+            if current.kind not in ('VAR', 'CONST') and not expanded:
+                stack.append((current, True))
+                stack.extend((arg, False) for arg in current.args)
+                continue
+            literals[id(current)] = self._encode_node(current, [literals[id(arg)] for arg in current.args])
+        return literals[id(node)]
+
+    def _encode_node(self, node, operands):
+        kind = node.kind
+        if kind == 'VAR':
+            return self.variable(node.value)
+        if kind == 'CONST':
+            return self.true() if node.value else -self.true()
+        if kind == 'NOT':
+            return -operands[0]
+        if kind == 'AND':
+            return self.conjunction(operands)
+        if kind == 'OR':
+            return self.disjunction(operands)
+        if kind == 'IMPLIES':
+            return self.disjunction([-operands[0], operands[1]])
+        if kind == 'XOR':
+            result = operands[0]
+            for operand in operands[1:]:
+                result = self.exclusive(result, operand)
+            return result
+        if kind == 'EQUIV':
+            equalities = [-self.exclusive(a, b) for a, b in zip(operands, operands[1:])]
+            return equalities[0] if len(equalities) == 1 else self.conjunction(equalities)
+        raise SATError(f"Неподдерживаемая операция: {kind}")
+
+
+def evaluate_partial(node, assignment):
+    """Трехзначное значение дерева при частичном наборе: True, False или None (не определено)"""
+    kind = node.kind
+    if kind == 'VAR':
+        return assignment.get(node.value)
+    if kind == 'CONST':
+        return node.value
+    values = [evaluate_partial(arg, assignment) for arg in node.args]
+    if kind == 'NOT':
+        return None if values[0] is None else not values[0]
+    if kind == 'AND':
+        return False if False in values else None if None in values else True
+    if kind == 'OR':
+        return True if True in values else None if None in values else False
+    if None in values:
+        return None
+    if kind == 'XOR':
+        return sum(values) % 2 == 1
+    if kind == 'IMPLIES':
+        return not values[0] or values[1]
+    return all(values) or not any(values)  # EQUIV
+
+
+class SatProblem:
+    """Выполнимость, перечисление и подсчет моделей выражения
+
+    variables - имена переменных ответа (в этом порядке); переменные
+    выражения, не вошедшие в список, добавляются в конец.
+    """
+
+    def __init__(self, node, variables=(), budget=UNLIMITED):
+        self.node = node
+        self.budget = budget
+        self.solver = Solver(budget)
+        self.cnf = CNF(self.solver)
+        self.variables = list(variables) + [name for name in node.variables() if name not in variables]
+        for name in self.variables:
+            self.cnf.variable(name)
+        self.solver.add_clause([self.cnf.encode(node)])
+        trace(logger, 'КНФ Цейтина: переменных %d, клауз %d', self.solver.num_vars, len(self.solver.clauses))
+
+    def _model(self):
+        values = self.solver.model()
+        return {name: values[self.cnf.names[name]] for name in self.variables}
+
+    def _block(self, assignment):
+        """Исключение набора (частичного) из дальнейшего поиска"""
+        self.solver.add_clause([-self.cnf.names[name] if value else self.cnf.names[name]
+                                for name, value in assignment.items()])
+
+    def solve(self):
+        """Выполняющий набор {имя: значение} или None"""
+        return self._model() if self.solver.solve() else None
+
+    def models(self, limit):
+        """Генератор до limit различных моделей (по переменным выражения)"""
+        for _ in range(limit):
+            if not self.solver.solve():
+                return
+            model = self._model()
+            yield model
+            self._block(model)
+
+    def exhausted(self):
+        """Все модели уже перечислены (после models или count)"""
+        return not self.solver.solve()
+
+    def count(self, max_cubes):
+        """Число моделей: {'count', 'exact', 'cubes'}
+
+        Каждая найденная модель сокращается до куба - частичного набора, при
+        котором выражение истинно при любых значениях остальных переменных и
+        который не пересекается с уже найденными кубами; куб дает 2**k моделей
+        (k - число свободных переменных) и блокируется целиком. Если кубов
+        больше max_cubes, возвращается нижняя оценка (exact=False).
+        """
+        count = 0
+        cubes = []
+        occurrences = {name: [] for name in self.variables}  # имя -> [(номер куба, значение)]
+        while len(cubes) < max_cubes:
+            if not self.solver.solve():
+                return {'count': count, 'exact': True, 'cubes': len(cubes)}
+            cube = self._shrink(self._model(), cubes, occurrences)
+            for name, value in cube.items():
+                occurrences[name].append((len(cubes), value))
+            cubes.append(cube)
+            count += 1 << (len(self.variables) - len(cube))
+            self._block(cube)
+            self.budget.check()
+        return {'count': count, 'exact': self.exhausted(), 'cubes': len(cubes)}
+
+    def _shrink(self, model, cubes, occurrences):
+        """Жадное удаление переменных из модели с сохранением истинности и непересечения
+
+        separating[i] - число переменных, по которым куб отличается от куба i;
+        пока оно положительно для всех i, кубы не пересекаются.
+        """
+        separating = [sum(model[name] != value for name, value in previous.items()) for previous in cubes]
+        cube = dict(model)
+        for name in list(cube):
+            self.budget.check()
+            value = cube.pop(name)
+            affected = [index for index, other in occurrences[name] if other != value]
+            if any(separating[index] == 1 for index in affected) or \
+                    evaluate_partial(self.node, cube) is not True:
+                cube[name] = value
+                continue
+            for index in affected:
+                separating[index] -= 1
+        return cube
@@ -0,0 +1,150 @@
+"""Сериализация больших таблиц истинности
+
+Прежний формат API - список словарей строк - строится для каждой строки
+заново и сериализуется json построчно; для таблиц в миллион строк это
+занимает столько же времени, сколько вычисление. Здесь тот же JSON
+собирается по битовому столбцу из заранее подготовленных фрагментов:
+текст значений переменных повторяется, поэтому строки для младших
+переменных рендерятся один раз и склеиваются с префиксом старших.
+
+Двоичный формат (BINARY_MIMETYPE, выбирается заголовком Accept):
+    b'BTT1' | длина заголовка (uint32, little-endian) | заголовок JSON (UTF-8)
+    | упакованный столбец каждого выхода ((rows + 7) // 8 байт, младший бит - первая строка)
+Заголовок содержит variables, rows, outputs, bit_order и поля ответа.
+"""
+import gzip
+import json
+import struct
+
+from logic.truth_table import TruthTable, MultiOutputTable
+
+try:
+    import brotli
+except ImportError:  # необязательная зависимость: без нее доступен только gzip
+    brotli = None
+
+BINARY_MIMETYPE = 'application/vnd.booltrainer.table'
+BINARY_MAGIC = b'BTT1'
+
+LOW_BITS = 8  # Младшие переменные, строки которых рендерятся заранее (2**LOW_BITS фрагментов)
+OUTPUT_COMBINATIONS_MAX = 8  # До стольких выходов фрагменты всех сочетаний результатов готовятся заранее
+
+
+def _columns(table):
+    """Пары (имя, биты) столбцов результата таблицы с одним или несколькими выходами"""
+    if isinstance(table, MultiOutputTable):
+        return table.outputs
+    return [('result', table.bits)]
+
+
+def _dumps(value):
+    return json.dumps(value, ensure_ascii=False)
+
+
+def _fragments(names):
+    """Тексты '"a":false,"b":true,' для всех наборов значений переменных names"""
+    keys = [_dumps(name) + ':' for name in names]
+    fragments = ['']
+    for key in keys:
+        fragments = [prefix + key + value + ',' for prefix in fragments for value in ('false', 'true')]
+    return fragments
+
+
+def rows_json(table):
+    """JSON-текст table.rows() без построения словарей строк (компактные разделители)"""
+    variables = table.variables
+    low_count = min(len(variables), LOW_BITS)
+    high = _fragments(variables[:len(variables) - low_count])
+    low = _fragments(variables[len(variables) - low_count:])
+    block = len(low)
+
+    columns = _columns(table)
+    rows = table.rows_count
+    digits = [format(bits, f'0{rows}b')[::-1] for _, bits in columns]
+    keys = [_dumps(name) + ':' for name, _ in columns]
+    if len(columns) == 1:
+        results = digits[0]
+        endings = {'0': keys[0] + 'false}', '1': keys[0] + 'true}'}
+    elif len(columns) <= OUTPUT_COMBINATIONS_MAX:
+        # Сочетание результатов строки - строка из '0' и '1' по выходам
+        results = [''.join(values) for values in zip(*digits)]
+        endings = {}
+        for index in range(1 << len(columns)):
+            pattern = format(index, f'0{len(columns)}b')
+            endings[pattern] = ','.join(key + ('true' if bit == '1' else 'false')
+                                        for key, bit in zip(keys, pattern)) + '}'
+    else:
+        results = [','.join(key + ('true' if bit == '1' else 'false') for key, bit in zip(keys, values)) + '}'
+                   for values in zip(*digits)]
+        endings = None
+
+    if endings is not None:
+        # Хвосты строк: младшие переменные вместе с результатами
+        tails = {value: [fragment + ending for fragment in low] for value, ending in endings.items()}
+    parts = []
+    for start, prefix in zip(range(0, rows, block), high):
+        prefix = '{' + prefix
+        chunk = results[start:start + block]
+        if endings is None:
+            parts.extend([prefix + fragment + ending for fragment, ending in zip(low, chunk)])
+        else:
+            parts.extend([prefix + tails[value][index] for index, value in enumerate(chunk)])
+    return '[' + ','.join(parts) + ']'
+
+
+def json_with_raw(payload, **raw):
+    """JSON объекта payload с дополнительными полями, уже сериализованными в текст raw"""
+    text = json.dumps(payload, ensure_ascii=False, separators=(',', ':'))
+    fields = ''.join(f',{_dumps(name)}:{value}' for name, value in raw.items())
+    if text == '{}':
+        return '{' + fields[1:] + '}'
+    return text[:-1] + fields + '}'
+
+
+def encode_binary(table, meta=None):
+    """Двоичное представление таблицы (формат BINARY_MIMETYPE); meta - поля заголовка"""
+    columns = _columns(table)
+    header = {
+        **(meta or {}),
+        'variables': table.variables,
+        'rows': table.rows_count,
+        'outputs': [name for name, _ in columns],
+        'bit_order': 'lsb-first'
+    }
+    encoded = json.dumps(header, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    size = (table.rows_count + 7) // 8
+    return b''.join([BINARY_MAGIC, struct.pack('<I', len(encoded)), encoded,
+                     *(bits.to_bytes(size, 'little') for _, bits in columns)])
+
+
+def decode_binary(data):
+    """Пара (заголовок, TruthTable или MultiOutputTable) из двоичного представления"""
+    if data[:4] != BINARY_MAGIC:
+        raise ValueError("Неизвестный двоичный формат таблицы")
+    length, = struct.unpack_from('<I', data, 4)
+    header = json.loads(data[8:8 + length].decode('utf-8'))
+    size = (header['rows'] + 7) // 8
+    offset = 8 + length
+    columns = [int.from_bytes(data[offset + index * size:offset + (index + 1) * size], 'little')
+               for index in range(len(header['outputs']))]
+    if header['outputs'] == ['result']:
+        return header, TruthTable(header['variables'], columns[0])
+    return header, MultiOutputTable(header['variables'], list(zip(header['outputs'], columns)))
+
+
+def supported_encodings():
+    return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+
+def compress(body, accept_encodings, level=6):
+    """Пара (сжатое тело, Content-Encoding) или (body, None)
+
+    accept_encodings - werkzeug Accept (request.accept_encodings); brotli
+    предпочитается, если установлен модуль brotli.
+    """
+    encoding = accept_encodings.best_match(supported_encodings())
+    if encoding == 'br':
+        return brotli.compress(body, quality=min(level, 11)), 'br'
+    if encoding == 'gzip':
+        return gzip.compress(body, compresslevel=level, mtime=0), 'gzip'
+    return body, None
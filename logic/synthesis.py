@@ -0,0 +1,260 @@
+"""Синтез логической схемы по выражению
+
+Дерево разбора (logic.parser) переводится в многоуровневую схему из
+двухвходовых элементов AND, OR, XOR и NOT в формате редактора схем
+({'blocks', 'connections'}), который принимает /api/calculate_scheme.
+
+Узлы создаются через таблицу структурного хэширования: одинаковые
+подвыражения (с учетом перестановки операндов) дают один элемент.
+При построении сворачиваются константы, двойные отрицания, повторы и
+пары x, ~x. Многоместные операции раскладываются в сбалансированное
+дерево, чтобы глубина схемы (число уровней моделирования) была меньше.
+Модуль не зависит от SymPy.
+"""
+from logic.metrics import stage
+
+FALSE, TRUE = 0, 1  # Номера узлов-констант
+
+# Смещения раскладки блоков в редакторе (пиксели)
+LEFT, TOP, COLUMN_WIDTH, ROW_HEIGHT = 20, 20, 120, 80
+
+
+def connection_id(source, target):
+    """id соединения в формате фронтенда ("<блок>_input|<блок>_output", части отсортированы)"""
+    return '|'.join(sorted([f'{source}_output', f'{target}_input']))
+
+
+class Synthesizer:
+    """Построение схемы с общими подвыражениями
+
+    Узел - пара (операция, операнды): ('CONST', значение), ('VAR', имя),
+    ('NOT', (x,)) или (AND/OR/XOR, (a, b)) с упорядоченными a < b.
+    Ссылка на узел - его номер в self.nodes.
+    """
+
+    def __init__(self, variables=()):
+        self.nodes = [('CONST', False), ('CONST', True)]
+        self._table = {node: ref for ref, node in enumerate(self.nodes)}
+        self.variables = []
+        for name in variables:
+            self.variable(name)
+
+    def _node(self, op, operands):
+        key = (op, operands)
+        ref = self._table.get(key)
+        if ref is None:
+            ref = self._table[key] = len(self.nodes)
+            self.nodes.append(key)
+        return ref
+
+    # ----- Построение узлов -----
+
+    def variable(self, name):
+        if ('VAR', name) not in self._table:
+            self.variables.append(name)
+        return self._node('VAR', name)
+
+    def negate(self, ref):
+        if ref in (FALSE, TRUE):
+            return TRUE - ref
+        op, operands = self.nodes[ref]
+        if op == 'NOT':
+            return operands[0]
+        return self._node('NOT', (ref,))
+
+    def _complement(self, ref):
+        """Операнд отрицания или None"""
+        op, operands = self.nodes[ref]
+        return operands[0] if op == 'NOT' else None
+
+    def _balanced(self, op, refs):
+        """Сбалансированное дерево двухвходовых элементов над различными операндами"""
+        refs = sorted(refs)
+        while len(refs) > 1:
+            paired = [self._node(op, (a, b) if a < b else (b, a)) for a, b in zip(refs[::2], refs[1::2])]
+            refs = paired + refs[len(paired) * 2:]
+        return refs[0]
+
+    def conjunction(self, refs):
+        return self._monotone('AND', refs, absorbing=FALSE)
+
+    def disjunction(self, refs):
+        return self._monotone('OR', refs, absorbing=TRUE)
+
+    def _monotone(self, op, refs, absorbing):
+        """AND/OR: поглощающая константа, нейтральная константа, повторы и пары x, ~x"""
+        neutral = TRUE - absorbing
+        operands = set(refs)
+        operands.discard(neutral)
+        if absorbing in operands or any(self._complement(ref) in operands for ref in operands):
+            return absorbing
+        if not operands:
+            return neutral
+        return self._balanced(op, operands)
+
+    def exclusive(self, refs):
+        """XOR: отрицания и константа TRUE выносятся, пары одинаковых операндов сокращаются"""
+        inverted = False
+        odd = set()
+        for ref in refs:
+            if ref in (FALSE, TRUE):
+                inverted ^= ref == TRUE
+                continue
+            inner = self._complement(ref)
+            if inner is not None:
+                inverted = not inverted
+                ref = inner
+            odd ^= {ref}
+        result = self._balanced('XOR', odd) if odd else FALSE
+        return self.negate(result) if inverted else result
+
+    def build(self, node):
+        """Узел схемы для дерева разбора (без рекурсии)"""
+        refs = {}
+        stack = [(node, False)]
+        while stack:
+            current, expanded = stack.pop()
+            if id(current) in refs:
+                continue
+            if current.kind in ('VAR', 'CONST'):
+                refs[id(current)] = self.variable(current.value) if current.kind == 'VAR' \
+                    else (TRUE if current.value else FALSE)
+                continue
+            operands = self._operands(current)
+            if not expanded:
+                stack.append((current, True))
+                stack.extend((arg, False) for arg in operands)
+                continue
+            refs[id(current)] = self._combine(current.kind, [refs[id(arg)] for arg in operands])
+        return refs[id(node)]
+
+    @staticmethod
+    def _operands(node):
+        """Операнды с раскрытыми вложенными узлами той же ассоциативной операции"""
+        if node.kind not in ('AND', 'OR', 'XOR'):
+            return node.args
+        operands = []
+        stack = list(reversed(node.args))
+        while stack:
+            arg = stack.pop()
+            if arg.kind == node.kind:
+                stack.extend(reversed(arg.args))
+            else:
+                operands.append(arg)
+        return operands
+
+    def _combine(self, kind, operands):
+        if kind == 'NOT':
+            return self.negate(operands[0])
+        if kind == 'AND':
+            return self.conjunction(operands)
+        if kind == 'OR':
+            return self.disjunction(operands)
+        if kind == 'XOR':
+            return self.exclusive(operands)
+        if kind == 'IMPLIES':
+            return self.disjunction([self.negate(operands[0]), operands[1]])
+        if kind == 'EQUIV':
+            return self.negate(self.exclusive(operands))
+        raise ValueError(f"Неподдерживаемая операция: {kind}")
+
+    # ----- Схема в формате редактора -----
+
+    def _constant(self, ref):
+        """Константный выход: v | ~v или v & ~v (в редакторе нет блока константы)"""
+        first = self._node('VAR', self.variables[0])
+        inverted = self._node('NOT', (first,))
+        return self._node('OR' if ref == TRUE else 'AND', (first, inverted))
+
+    def scheme(self, output):
+        """Пара (схема {'blocks', 'connections'}, статистика) для выхода output
+
+        В схему входят блоки всех переменных и только элементы, от которых
+        зависит выход.
+        """
+        with stage('synthesis'):
+            if output in (FALSE, TRUE):
+                if not self.variables:
+                    raise ValueError("Для константного выражения нужна хотя бы одна переменная")
+                output = self._constant(output)
+
+            order = self._reachable(output)
+            block_ids, levels = {}, {}
+            counters = {}
+            for ref in order:
+                op, operands = self.nodes[ref]
+                if op == 'VAR':
+                    block_ids[ref] = f'var_{operands}'
+                    levels[ref] = 0
+                else:
+                    counters[op] = counters.get(op, 0) + 1
+                    block_ids[ref] = f'{op.lower()}_{counters[op]}'
+                    levels[ref] = 1 + max(levels[operand] for operand in operands)
+
+            for name in self.variables:
+                ref = self._table[('VAR', name)]
+                if ref not in block_ids:
+                    block_ids[ref] = f'var_{name}'
+                    levels[ref] = 0
+                    order.append(ref)
+            depth = max(levels.values(), default=0)
+
+            rows = {}
+            blocks, connections = [], []
+            for ref in sorted(order, key=lambda ref: (levels[ref], ref)):
+                op, operands = self.nodes[ref]
+                level = levels[ref]
+                row = rows[level] = rows.get(level, -1) + 1
+                block = {'id': block_ids[ref], 'type': 'VARIABLE' if op == 'VAR' else op,
+                         'position': {'x': LEFT + level * COLUMN_WIDTH, 'y': TOP + row * ROW_HEIGHT}}
+                if op == 'VAR':
+                    block['variable'] = operands
+                else:
+                    connections.extend(self._connection(block_ids[operand], block_ids[ref])
+                                       for operand in operands)
+                blocks.append(block)
+
+            blocks.append({'id': 'output', 'type': 'OUTPUT',
+                           'position': {'x': LEFT + (depth + 1) * COLUMN_WIDTH, 'y': TOP}})
+            connections.append(self._connection(block_ids[output], 'output'))
+
+        stats = {
+            'gates': sum(counters.values()),
+            'gate_types': counters,
+            'depth': depth,
+            'variables': len(self.variables)
+        }
+        return {'blocks': blocks, 'connections': connections}, stats
+
+    @staticmethod
+    def _connection(source, target):
+        return {'id': connection_id(source, target), 'source': source, 'target': target}
+
+    def _reachable(self, output):
+        """Узлы, от которых зависит выход, в топологическом порядке"""
+        order, seen = [], set()
+        stack = [(output, False)]
+        while stack:
+            ref, expanded = stack.pop()
+            if expanded:
+                order.append(ref)
+                continue
+            if ref in seen:
+                continue
+            seen.add(ref)
+            stack.append((ref, True))
+            op, operands = self.nodes[ref]
+            if op not in ('VAR', 'CONST'):
+                stack.extend((operand, False) for operand in operands)
+        return order
+
+
+def synthesize(node, variables=()):
+    """Схема в формате редактора и статистика для дерева разбора
+
+    variables - переменные схемы в порядке столбцов; переменные выражения,
+    не вошедшие в список, добавляются в конец.
+    """
+    synthesizer = Synthesizer(variables)
+    output = synthesizer.build(node)
+    return synthesizer.scheme(output)
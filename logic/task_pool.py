@@ -0,0 +1,210 @@
+import importlib
+import multiprocessing
+import queue
+import threading
+import time
+
+
+# Модули, импортируемые при прогреве (SymPy и вычислительные модули,
+# которые logic.tasks загружает лениво)
+WARMUP_MODULES = (
+    'sympy',
+    'logic.tasks',
+    'logic.truth_table_generator',
+    'logic.normal_form_converter',
+    'logic.equivalence',
+)
+
+
+class TaskPoolError(Exception):
+    """Базовая ошибка пула процессов"""
+    pass
+
+
+class PoolSaturated(TaskPoolError):
+    """Очередь задач заполнена - запрос нужно повторить позже"""
+    pass
+
+
+class TaskTimeout(TaskPoolError):
+    """Задача не уложилась во время, воркер перезапущен"""
+    pass
+
+
+class WorkerCrashed(TaskPoolError):
+    """Процесс воркера завершился во время выполнения задачи"""
+    pass
+
+
+def warm_up(modules=WARMUP_MODULES):
+    """Импорт модулей заранее, чтобы первый запрос не платил за загрузку SymPy"""
+    for module_name in modules:
+        importlib.import_module(module_name)
+
+
+def _worker_main(conn, warmup_modules):
+    """Цикл процесса-воркера: прогрев, затем выполнение задач из канала"""
+    warm_up(warmup_modules)
+    conn.send(('ready', None))
+
+    while True:
+        try:
+            message = conn.recv()
+        except EOFError:
+            break
+        if message is None:
+            break
+
+        func, args, kwargs = message
+        try:
+            conn.send(('ok', func(*args, **kwargs)))
+        except Exception as e:
+            try:
+                conn.send(('error', e))
+            except Exception:
+                # Исключение не сериализуется - передаем его текст
+                conn.send(('error', RuntimeError(f'{type(e).__name__}: {e}')))
+
+
+class _Worker:
+    """Процесс-воркер и его конец канала"""
+
+    def __init__(self, process, conn):
+        self.process = process
+        self.conn = conn
+        self.ready = False
+
+    def kill(self):
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join(timeout=1)
+        self.conn.close()
+
+
+class TaskPool:
+    """Пул заранее прогретых процессов для тяжелых вычислений SymPy
+
+    Задача выполняется в отдельном процессе, поэтому не держит GIL потока
+    запроса. Зависший воркер убивается по таймауту и перезапускается.
+    Число ожидающих задач ограничено: при переполнении submit() сразу
+    выбрасывает PoolSaturated.
+    """
+
+    def __init__(self, workers=2, max_pending=None, timeout=30.0,
+                 warmup_modules=WARMUP_MODULES, start_method='spawn'):
+        self.workers = workers
+        self.max_pending = max_pending or workers * 4
+        self.timeout = timeout
+        self.warmup_modules = tuple(warmup_modules)
+        self._context = multiprocessing.get_context(start_method)
+        self._idle = queue.Queue()
+        self._pending = threading.BoundedSemaphore(self.max_pending)
+        self._lock = threading.Lock()
+        self._closed = False
+        self.counters = {
+            'submitted': 0,
+            'completed': 0,
+            'failed': 0,
+            'timeouts': 0,
+            'rejected': 0,
+            'respawns': 0
+        }
+        for _ in range(workers):
+            self._idle.put(self._spawn())
+
+    def _spawn(self):
+        parent_conn, child_conn = self._context.Pipe()
+        process = self._context.Process(target=_worker_main,
+                                        args=(child_conn, self.warmup_modules),
+                                        daemon=True)
+        process.start()
+        child_conn.close()
+        return _Worker(process, parent_conn)
+
+    def _count(self, name):
+        with self._lock:
+            self.counters[name] += 1
+
+    def _respawn(self, worker):
+        worker.kill()
+        self._count('respawns')
+        return self._spawn()
+
+    def submit(self, func, *args, timeout=None, **kwargs):
+        """Выполнение func(*args, **kwargs) в воркере, возвращает результат
+
+        func должна быть функцией верхнего уровня модуля (передается по ссылке).
+        Время ожидания свободного воркера входит в timeout.
+        """
+        if self._closed:
+            raise TaskPoolError('Пул процессов остановлен')
+        if not self._pending.acquire(blocking=False):
+            self._count('rejected')
+            raise PoolSaturated('Сервер перегружен, повторите запрос позже')
+
+        self._count('submitted')
+        deadline = time.monotonic() + (timeout if timeout is not None else self.timeout)
+        try:
+            try:
+                worker = self._idle.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                self._count('timeouts')
+                raise TaskTimeout('Нет свободного воркера')
+
+            try:
+                status, payload = self._run(worker, (func, args, kwargs), deadline)
+            except TaskTimeout:
+                self._count('timeouts')
+                worker = self._respawn(worker)
+                raise
+            except (EOFError, OSError):
+                self._count('failed')
+                worker = self._respawn(worker)
+                raise WorkerCrashed('Процесс воркера аварийно завершился')
+            finally:
+                self._idle.put(worker)
+        finally:
+            self._pending.release()
+
+        if status == 'error':
+            self._count('failed')
+            raise payload
+        self._count('completed')
+        return payload
+
+    @staticmethod
+    def _receive(worker, deadline):
+        if not worker.conn.poll(max(0.0, deadline - time.monotonic())):
+            raise TaskTimeout('Превышено время выполнения задачи')
+        return worker.conn.recv()
+
+    def _run(self, worker, message, deadline):
+        if not worker.ready:
+            self._receive(worker, deadline)  # ('ready', None) после прогрева
+            worker.ready = True
+        worker.conn.send(message)
+        return self._receive(worker, deadline)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'workers': self.workers,
+                'max_pending': self.max_pending,
+                'idle': self._idle.qsize(),
+                **self.counters
+            }
+
+    def shutdown(self):
+        """Остановка всех воркеров"""
+        self._closed = True
+        while True:
+            try:
+                worker = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                worker.conn.send(None)
+            except OSError:
+                pass
+            worker.process.join(timeout=1)
+            worker.kill()
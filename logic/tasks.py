@@ -0,0 +1,183 @@
+"""Тяжелые вычисления endpoint'ов в виде функций верхнего уровня
+
+Функции вызываются либо прямо в потоке запроса, либо в процессе пула
+(logic.task_pool), поэтому принимают и возвращают только сериализуемые
+значения. У каждого процесса свой кэш выражений. Веб-процесс передает
+кэш с открытым хранилищем готовых результатов (logic.result_store) через
+configure_cache; воркеры открывают хранилище при первой задаче по
+переменной окружения BOOLTRAINER_RESULT_STORE.
+
+Модуль не импортирует SymPy: вычислительные модули загружаются при первом
+вызове задачи (или заранее, см. logic.task_pool.warm_up).
+"""
+import os
+
+from logic.budget import Budget, BudgetExceeded
+from logic.cache import ExpressionCache
+from logic.expression_processor import ExpressionError
+from logic.metrics import stage, timing
+from logic.result_store import open_store
+from logic.sat import SatProblem
+from logic.synthesis import synthesize
+from logic.tracing import tracing
+
+
+STORE_ENV = 'BOOLTRAINER_RESULT_STORE'
+
+expression_cache = None  # создается configure_cache или при первой задаче (_cache)
+
+BATCH_OPERATIONS = ('truth_table', 'analysis', 'normal_forms', 'kmap')
+SAT_MODES = ('solve', 'models', 'count')
+
+
+def configure_cache(maxsize, ttl, store=None):
+    """Замена кэша выражений текущего процесса"""
+    global expression_cache
+    expression_cache = ExpressionCache(maxsize=maxsize, ttl=ttl, store=store)
+    return expression_cache
+
+
+def _cache():
+    """Кэш выражений процесса; в воркере пула открывает хранилище при первом вызове"""
+    global expression_cache
+    if expression_cache is None:
+        expression_cache = ExpressionCache(store=open_store(os.environ.get(STORE_ENV)))
+    return expression_cache
+
+
+def traced(func, *args):
+    """Выполнение задачи с трассировкой: пара (результат, события)"""
+    with tracing() as current:
+        result = func(*args)
+    return result, current.to_list()
+
+
+def timed(func, *args):
+    """Выполнение задачи со сбором этапов: пара (результат, Timings.to_dict())"""
+    with timing() as current:
+        result = func(*args)
+    return result, current.to_dict()
+
+
+def _parsed_entry(expression, variables_str, budget, enumerate_rows=True):
+    budget.check_expression(len(expression))
+    entry = _cache().get(expression, variables_str)
+    if enumerate_rows:
+        budget.check_variables(len(entry.variables))
+    return entry
+
+
+def truth_table(expression, variables_str, limits=None):
+    """Пара (строка выражения, компактная таблица истинности)"""
+    budget = Budget(**(limits or {}))
+    entry = _parsed_entry(expression, variables_str, budget)
+    return entry.text, entry.truth_table(budget)
+
+
+def karnaugh(expression, variables_str, limits=None):
+    """Тройка (строка выражения, компактная таблица, карта Карно с импликантами)"""
+    budget = Budget(**(limits or {}))
+    entry = _parsed_entry(expression, variables_str, budget)
+    return entry.text, entry.truth_table(budget), entry.karnaugh(budget)
+
+
+def normal_forms(expression, variables_str, limits=None):
+    """Тройка (строка выражения, КНФ, ДНФ)"""
+    budget = Budget(**(limits or {}))
+    entry = _parsed_entry(expression, variables_str, budget)
+    cnf, dnf = entry.normal_forms(budget)
+    return entry.text, cnf, dnf
+
+
+def equivalence(expression, reference, variables_str, limits=None):
+    """Проверка равносильности ответа эталону: (строка ответа, строка эталона, результат)
+
+    Число переменных не ограничивается: при большом числе переменных
+    проверка идет через SAT без перебора строк.
+    """
+    from logic.equivalence import EquivalenceChecker
+    budget = Budget(**(limits or {}))
+    budget.check_expression(len(expression))
+    budget.check_expression(len(reference))
+    answer = _cache().get(expression, variables_str)
+    expected = _cache().get(reference, variables_str)
+    checker = EquivalenceChecker(answer.expression, expected.expression, answer.variables, budget=budget)
+    return str(answer.expression), str(expected.expression), checker.check()
+
+
+def sat_problem(entry, budget):
+    """Задача SAT по разобранному выражению (новая для каждого запроса: решатель изменяемый)"""
+    return SatProblem(entry.processor.ast, [str(var) for var in entry.variables], budget=budget)
+
+
+def sat(expression, variables_str, mode='solve', limit=1, limits=None):
+    """Выполнимость без перебора таблицы: (строка выражения, результат режима)
+
+    solve - одна модель; models - до limit моделей; count - число моделей
+    (не более limit кубов, иначе нижняя оценка с exact=False).
+    """
+    budget = Budget(**(limits or {}))
+    entry = _parsed_entry(expression, variables_str, budget, enumerate_rows=False)
+    if mode not in SAT_MODES:
+        raise ValueError(f"Неизвестный режим: {mode}")
+    with stage('sat'):
+        problem = sat_problem(entry, budget)
+        if mode == 'solve':
+            model = problem.solve()
+            result = {'satisfiable': model is not None, 'model': model}
+        elif mode == 'models':
+            models = list(problem.models(limit))
+            result = {'models': models, 'complete': len(models) < limit or problem.exhausted()}
+        else:
+            result = problem.count(limit)
+    result['variables'] = problem.variables
+    result['solver'] = dict(problem.solver.stats)
+    return entry.text, result
+
+
+def synthesis(expression, variables_str, limits=None):
+    """Тройка (строка выражения, схема в формате редактора, статистика схемы)
+
+    Схема строится по дереву разбора без перебора строк, поэтому число
+    переменных не ограничивается.
+    """
+    budget = Budget(**(limits or {}))
+    entry = _parsed_entry(expression, variables_str, budget, enumerate_rows=False)
+    scheme, stats = synthesize(entry.processor.ast, [str(var) for var in entry.variables])
+    return entry.text, scheme, stats
+
+
+def batch(jobs, limits=None):
+    """Пакетное выполнение уникальных заданий (выражение, переменные, операции)
+
+    Задания разделяют кэш разбора и таблиц, поэтому нормальные формы строятся
+    по уже вычисленной таблице. Срок бюджета общий на пакет, лимиты размера -
+    на каждое задание. Возвращает список словарей; ошибка задания - в поле error.
+    """
+    budget = Budget(**(limits or {}))
+    results = []
+    for expression, variables_str, operations in jobs:
+        try:
+            budget.check()
+            # Анализ без таблицы идет по диаграмме решений и не перебирает строки
+            enumerate_rows = bool({'truth_table', 'normal_forms', 'kmap'} & set(operations))
+            entry = _parsed_entry(expression, variables_str, budget, enumerate_rows)
+            result = {'expression': entry.text}
+            if 'truth_table' in operations:
+                result['truth_table'] = entry.truth_table(budget)
+            if 'analysis' in operations:
+                result['analysis'] = entry.analysis(budget)
+            if 'normal_forms' in operations:
+                result['cnf'], result['dnf'] = entry.normal_forms(budget)
+            if 'kmap' in operations:
+                result['kmap'] = entry.karnaugh(budget)
+        except BudgetExceeded as e:
+            result = {'error': str(e), 'budget_exceeded': e.to_dict()}
+        except ExpressionError as e:
+            result = {'error': str(e)}
+            if e.position is not None:
+                result['position'] = e.position
+        except Exception as e:
+            result = {'error': f'Server error: {str(e)}'}
+        results.append(result)
+    return results
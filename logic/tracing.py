@@ -0,0 +1,71 @@
+"""Отладочная трассировка вычислений
+
+События пишутся в логгер модуля на уровне DEBUG (форматирование ленивое)
+и, если для текущего запроса включена трассировка, сохраняются в Trace,
+которую API может вернуть клиенту. Когда ни то ни другое не включено,
+trace() не форматирует строк и не выполняет ввода-вывода.
+"""
+import contextvars
+import logging
+import time
+from contextlib import contextmanager
+
+
+_current_trace = contextvars.ContextVar('logic_trace', default=None)
+
+
+class Trace:
+    """События трассировки одного запроса"""
+
+    def __init__(self, max_events=1000):
+        self.max_events = max_events
+        self.events = []
+        self.dropped = 0
+        self._started = time.perf_counter()
+
+    def add(self, source, message, args):
+        if len(self.events) >= self.max_events:
+            self.dropped += 1
+            return
+        elapsed_ms = (time.perf_counter() - self._started) * 1000
+        self.events.append((elapsed_ms, source, message, args))
+
+    def to_list(self):
+        """События в виде списка словарей (форматирование выполняется здесь)"""
+        result = [{
+            'time_ms': round(elapsed_ms, 3),
+            'source': source,
+            'message': message % args if args else message
+        } for elapsed_ms, source, message, args in self.events]
+        if self.dropped:
+            result.append({'time_ms': None, 'source': __name__,
+                           'message': f'Пропущено событий: {self.dropped}'})
+        return result
+
+
+def is_enabled(logger):
+    """Нужно ли собирать события (для защиты дорогих вычислений аргументов)"""
+    return _current_trace.get() is not None or logger.isEnabledFor(logging.DEBUG)
+
+
+def trace(logger, message, *args):
+    """Событие трассировки в стиле logging: message % args"""
+    current = _current_trace.get()
+    if current is not None:
+        current.add(logger.name, message, args)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(message, *args)
+
+
+@contextmanager
+def tracing(enabled=True):
+    """Включение трассировки для текущего контекста; возвращает Trace (или None)"""
+    if not enabled:
+        yield None
+        return
+    current = Trace()
+    token = _current_trace.set(current)
+    try:
+        yield current
+    finally:
+        _current_trace.reset(token)
@@ -0,0 +1,186 @@
+import base64
+import itertools
+
+from logic.metrics import stage
+
+
+def _encode(raw, encoding):
+    if encoding not in TruthTable.ENCODINGS:
+        raise ValueError(f"Неизвестная кодировка: {encoding}")
+    return base64.b64encode(raw).decode('ascii') if encoding == 'base64' else raw.hex()
+
+
+def _decode(data, encoding):
+    return bytes.fromhex(data) if encoding == 'hex' else base64.b64decode(data)
+
+
+class TruthTable:
+    """Компактная таблица истинности
+
+    Хранится только столбец результата в виде битового множества: бит r
+    числа bits - результат строки r. Значения переменных в строке r
+    однозначно следуют из номера строки (первая переменная - старший бит),
+    как в порядке itertools.product.
+    """
+
+    ENCODINGS = ('base64', 'hex')
+
+    def __init__(self, variables, bits=0):
+        self.variables = [str(var) for var in variables]
+        self.bits = bits
+
+    @classmethod
+    def from_results(cls, variables, results):
+        """Построение из последовательности результатов по строкам"""
+        digits = ''.join('1' if result else '0' for result in results)
+        return cls(variables, int(digits[::-1], 2) if digits else 0)
+
+    @property
+    def rows_count(self):
+        return 1 << len(self.variables)
+
+    @property
+    def true_count(self):
+        return self.bits.bit_count()
+
+    def __len__(self):
+        return self.rows_count
+
+    def result(self, index):
+        """Результат строки index"""
+        return bool((self.bits >> index) & 1)
+
+    def values(self, index):
+        """Значения переменных в строке index"""
+        n = len(self.variables)
+        return tuple(bool((index >> (n - 1 - i)) & 1) for i in range(n))
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self.rows_count
+        if not 0 <= index < self.rows_count:
+            raise IndexError('Номер строки вне таблицы')
+        row = dict(zip(self.variables, self.values(index)))
+        row['result'] = self.result(index)
+        return row
+
+    def __iter__(self):
+        results = format(self.bits, f'0{self.rows_count}b')[::-1]
+        for values, result in zip(itertools.product([False, True], repeat=len(self.variables)), results):
+            row = dict(zip(self.variables, values))
+            row['result'] = result == '1'
+            yield row
+
+    def rows(self):
+        """Таблица в виде списка словарей (прежний формат API)"""
+        return list(self)
+
+    def minterms(self):
+        """Номера строк, на которых функция истинна"""
+        return [index for index, bit in enumerate(format(self.bits, 'b')[::-1]) if bit == '1']
+
+    def analyze(self):
+        """Анализ таблицы по количеству единичных битов"""
+        with stage('analyze'):
+            total = self.rows_count
+            true_count = self.true_count
+        false_count = total - true_count
+
+        return {
+            'total_rows': total,
+            'true_results': true_count,
+            'false_results': false_count,
+            'is_tautology': true_count == total,
+            'is_contradiction': false_count == total,
+            'is_satisfiable': true_count > 0
+        }
+
+    def to_bytes(self):
+        """Упаковка столбца: байт k содержит строки 8k..8k+7, младший бит - первая"""
+        return self.bits.to_bytes((self.rows_count + 7) // 8, 'little')
+
+    @property
+    def output_names(self):
+        return ['result']
+
+    def to_packed(self, encoding='base64'):
+        """Компактный формат для передачи по сети"""
+        data = _encode(self.to_bytes(), encoding)
+        return {
+            'variables': self.variables,
+            'rows': self.rows_count,
+            'encoding': encoding,
+            'bit_order': 'lsb-first',
+            'data': data
+        }
+
+    @classmethod
+    def from_packed(cls, packed):
+        """Восстановление таблицы из компактного формата"""
+        raw = _decode(packed['data'], packed.get('encoding'))
+        return cls(packed['variables'], int.from_bytes(raw, 'little'))
+
+
+class MultiOutputTable:
+    """Таблица истинности с несколькими столбцами результата (схема с несколькими выходами)
+
+    Столбцы переменных общие для всех выходов и, как в TruthTable, следуют из
+    номера строки; для каждого выхода хранится только его битовое множество.
+    """
+
+    def __init__(self, variables, outputs):
+        """outputs - список пар (имя выхода, биты столбца)"""
+        self.variables = [str(var) for var in variables]
+        self.outputs = [(str(name), bits) for name, bits in outputs]
+
+    @property
+    def rows_count(self):
+        return 1 << len(self.variables)
+
+    @property
+    def output_names(self):
+        return [name for name, _ in self.outputs]
+
+    def __len__(self):
+        return self.rows_count
+
+    def output(self, name):
+        """Таблица одного выхода"""
+        for output_name, bits in self.outputs:
+            if output_name == name:
+                return TruthTable(self.variables, bits)
+        raise KeyError(name)
+
+    def __iter__(self):
+        columns = [(name, format(bits, f'0{self.rows_count}b')[::-1]) for name, bits in self.outputs]
+        for index, values in enumerate(itertools.product([False, True], repeat=len(self.variables))):
+            row = dict(zip(self.variables, values))
+            for name, results in columns:
+                row[name] = results[index] == '1'
+            yield row
+
+    def rows(self):
+        """Таблица в виде списка словарей: переменные и столбец каждого выхода"""
+        return list(self)
+
+    def analyze(self):
+        """Анализ каждого выхода"""
+        return {name: TruthTable(self.variables, bits).analyze() for name, bits in self.outputs}
+
+    def to_packed(self, encoding='base64'):
+        """Компактный формат: общие (неявные) столбцы переменных и упакованный столбец каждого выхода"""
+        size = (self.rows_count + 7) // 8
+        return {
+            'variables': self.variables,
+            'rows': self.rows_count,
+            'encoding': encoding,
+            'bit_order': 'lsb-first',
+            'outputs': [{'name': name, 'data': _encode(bits.to_bytes(size, 'little'), encoding)}
+                        for name, bits in self.outputs]
+        }
+
+    @classmethod
+    def from_packed(cls, packed):
+        return cls(packed['variables'], [
+            (output['name'], int.from_bytes(_decode(output['data'], packed.get('encoding')), 'little'))
+            for output in packed['outputs']])
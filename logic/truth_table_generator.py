@@ -1,55 +1,116 @@
 import itertools
-from sympy import symbols, simplify_logic, SympifyError
+import logging
+from sympy import simplify_logic
+from logic.bdd import BDD, BDDError
+from logic.budget import UNLIMITED, BudgetExceeded
+from logic.bitset import evaluate_in_chunks
+from logic.compiled_evaluator import CompiledEvaluator, CompilationError
+from logic.metrics import stage, rows_evaluated
+from logic.parser import Node, from_sympy
+from logic.sat import SatProblem
+from logic.tracing import trace
+from logic.truth_table import TruthTable
+
+logger = logging.getLogger(__name__)
 
 
 class TruthTableGenerator:
     """Генератор таблиц истинности"""
 
-    def __init__(self, expression, variables):
+    MODE_COMPILED = 'compiled'
+    MODE_PER_ROW = 'per_row'
+
+    def __init__(self, expression, variables, mode=MODE_COMPILED, budget=UNLIMITED):
         self.expression = expression
         self.variables = variables if isinstance(variables, (list, tuple)) else [variables]
+        self.mode = mode
+        self.budget = budget
         self.table_data = []
+        self.truth_table = None
+
+    def compile(self):
+        """Компиляция выражения в побитовую программу (None, если невозможно)"""
+        try:
+            evaluator = CompiledEvaluator(self.expression, self.variables)
+        except CompilationError as e:
+            trace(logger, 'Построчный режим: %s', e)
+            return None
+        trace(logger, 'Выражение скомпилировано: инструкций %d', len(evaluator.program))
+        return evaluator
 
     def generate(self):
         """Генерация таблицы истинности"""
-        self.table_data = []
+        self.table_data = self.generate_compact().rows()
+        return self.table_data
 
-        # Получаем имена переменных
-        var_names = [str(var) for var in self.variables]
+    def generate_compact(self):
+        """Генерация компактной таблицы (столбец результата в виде битов)"""
+        self.budget.check_variables(len(self.variables))
+        with stage('truth_table'):
+            evaluator = self.compile() if self.mode == self.MODE_COMPILED else None
+            if evaluator is not None:
+                bits = evaluate_in_chunks(evaluator.evaluate, evaluator.rows_count, self.budget.check)
+                self.truth_table = TruthTable(self.variables, bits)
+            else:
+                self.truth_table = TruthTable.from_results(
+                    self.variables, (result for _, result in self.iter_rows(count_rows=False)))
+        rows_evaluated(self.truth_table.rows_count, 'expression')
+        return self.truth_table
+
+    def iter_rows(self, chunk_bits=12, count_rows=True):
+        """Ленивая генерация пар (значения переменных, результат)
+
+        Таблица не хранится: скомпилированная программа вычисляется блоками
+        по 2**chunk_bits строк, поэтому память не зависит от размера таблицы.
+        count_rows - учитывать строки в метриках (по блокам, как source=stream).
+        """
+        self.budget.check_variables(len(self.variables))
 
         # Генерируем все комбинации значений
-        for values in itertools.product([False, True], repeat=len(self.variables)):
-            row = {}
-            substitution = {}
-
-            # Заполняем значения переменных
-            for var, val, name in zip(self.variables, values, var_names):
-                row[name] = val
-                substitution[var] = val
+        combinations = itertools.product([False, True], repeat=len(self.variables))
+        evaluator = self.compile() if self.mode == self.MODE_COMPILED else None
+
+        if evaluator is None:
+            for values in combinations:
+                self.budget.check()
+                yield values, self._evaluate_row(values)
+            if count_rows:
+                rows_evaluated(1 << len(self.variables), 'stream')
+            return
+
+        size = 1 << min(chunk_bits, len(self.variables))
+        for start in range(0, evaluator.rows_count, size):
+            self.budget.check()
+            # Строка битов в порядке строк блока (бит 0 - первая строка)
+            results = format(evaluator.evaluate(start, size), f'0{size}b')[::-1]
+            if count_rows:
+                rows_evaluated(size, 'stream')
+            for values, result in zip(itertools.islice(combinations, size), results):
+                yield values, result == '1'
+
+    def _evaluate_row(self, values):
+        """Вычисление одной строки через подстановку и упрощение SymPy"""
+        substitution = dict(zip(self.variables, values))
+
+        # Вычисляем результат
+        try:
+            # Подставляем значения в выражение
+            result = self.expression.subs(substitution)
+            # Упрощаем результат
+            simplified = simplify_logic(result)
 
-            # Вычисляем результат
-            try:
-                # Подставляем значения в выражение
-                result = self.expression.subs(substitution)
-                # Упрощаем результат
-                simplified = simplify_logic(result)
-
-                # Преобразуем к булевому значению
-                if simplified == True:
-                    row['result'] = True
-                elif simplified == False:
-                    row['result'] = False
-                else:
-                    # Если не удалось упростить, используем прямое вычисление
-                    row['result'] = self._direct_evaluation(result)
-
-            except Exception as e:
-                print(f"Evaluation error: {e}")
-                row['result'] = False
-
-            self.table_data.append(row)
+            # Преобразуем к булевому значению
+            if simplified == True:
+                return True
+            elif simplified == False:
+                return False
+            else:
+                # Если не удалось упростить, используем прямое вычисление
+                return self._direct_evaluation(result)
 
-        return self.table_data
+        except Exception as e:
+            trace(logger, 'Evaluation error: %s', e)
+            return False
 
     def _direct_evaluation(self, expr):
         """Прямое вычисление выражения"""
@@ -74,18 +135,52 @@ class TruthTableGenerator:
             return False
 
     def analyze(self):
-        """Анализ таблицы истинности"""
-        if not self.table_data:
-            self.generate()
-
-        true_count = sum(1 for row in self.table_data if row['result'])
-        false_count = len(self.table_data) - true_count
-
+        """Анализ таблицы истинности
+
+        Если таблица еще не построена, анализ выполняется по диаграмме решений
+        без перебора строк (число переменных не ограничено размером таблицы).
+        Если диаграмма слишком велика, а таблица не помещается в бюджет,
+        выполнимость и тождественность проверяются SAT-решателем (без числа строк).
+        """
+        if self.truth_table is None:
+            with stage('bdd'):
+                analysis = self.analyze_bdd()
+            if analysis is not None:
+                return analysis
+            try:
+                self.budget.check_variables(len(self.variables))
+            except BudgetExceeded as e:
+                try:
+                    node = from_sympy(self.expression)
+                except ValueError:
+                    raise e
+                with stage('sat'):
+                    return self.analyze_sat(node)
+            self.generate_compact()
+
+        return self.truth_table.analyze()
+
+    def analyze_sat(self, node=None):
+        """Анализ по SAT: true_results и false_results не вычисляются (None)"""
+        node = node if node is not None else from_sympy(self.expression)
+        names = [str(var) for var in self.variables]
+        satisfiable = SatProblem(node, names, budget=self.budget).solve() is not None
+        falsifiable = SatProblem(Node('NOT', args=(node,)), names, budget=self.budget).solve() is not None
         return {
-            'total_rows': len(self.table_data),
-            'true_results': true_count,
-            'false_results': false_count,
-            'is_tautology': true_count == len(self.table_data),
-            'is_contradiction': false_count == len(self.table_data),
-            'is_satisfiable': true_count > 0
-        }
\ No newline at end of file
+            'total_rows': 1 << len(names),
+            'true_results': None,
+            'false_results': None,
+            'is_tautology': not falsifiable,
+            'is_contradiction': not satisfiable,
+            'is_satisfiable': satisfiable,
+            'method': 'sat'
+        }
+
+    def analyze_bdd(self):
+        """Анализ по ROBDD (None, если диаграмму построить не удалось)"""
+        try:
+            bdd = BDD.for_expressions([self.expression], self.variables, budget=self.budget)
+            return bdd.analyze(bdd.build(self.expression))
+        except BDDError as e:
+            trace(logger, 'Анализ по таблице: %s', e)
+            return None
@@ -0,0 +1,85 @@
+"""Заполнение хранилища результатов для банка упражнений
+
+Запуск: python precompute.py bank.json [--store results.sqlite] [--max-variables 20]
+
+bank.json - список заданий в формате запросов API:
+    {"expression": "a & ~b", "variables": "a,b"}                  таблица, КНФ и ДНФ
+    {"scheme": {"blocks": [...], "connections": [...]}, "variables": "a,b"}  таблица схемы
+Затем сервер запускается с BOOLTRAINER_RESULT_STORE=results.sqlite и берет
+результаты из хранилища, не вычисляя их заново.
+"""
+import argparse
+import json
+import sys
+
+from logic.budget import Budget, BudgetExceeded
+from logic.cache import ExpressionCache
+from logic.circuit import CircuitError
+from logic.expression_processor import ExpressionError
+from logic.result_store import ResultStore
+from logic.scheme_calculator import SchemeCalculator
+from logic.truth_table import MultiOutputTable
+
+DEFAULT_STORE = 'results.sqlite'
+
+
+def precompute_expression(store, item, budget):
+    cache = ExpressionCache(maxsize=1)
+    expression, variables_str = item['expression'].strip(), item['variables'].strip()
+    entry = cache.get(expression, variables_str)
+    budget.check_variables(len(entry.variables))
+    store.save_expression(cache.make_key(expression, variables_str), entry.text, entry.variables,
+                          entry.truth_table(budget), entry.normal_forms(budget))
+
+
+def precompute_scheme(store, item, budget):
+    calculator = SchemeCalculator(item['scheme'], item['variables'].strip(), budget=budget)
+    truth_table = calculator.calculate_compact()
+    if isinstance(truth_table, MultiOutputTable):
+        columns = [bits for _, bits in truth_table.outputs]
+    else:
+        columns = [truth_table.bits]
+    store.save_circuit(calculator.structure_hash(), calculator.variables, columns)
+
+
+def precompute(store, items, max_variables=20):
+    """Вычисление и сохранение заданий; возвращает (успешно, список ошибок)"""
+    done = 0
+    errors = []
+    for index, item in enumerate(items):
+        budget = Budget(max_variables=max_variables)
+        try:
+            if 'scheme' in item:
+                precompute_scheme(store, item, budget)
+            else:
+                precompute_expression(store, item, budget)
+            done += 1
+        except (BudgetExceeded, ExpressionError, CircuitError, KeyError, AttributeError) as e:
+            errors.append(f"Задание {index}: {e}")
+    store.commit()
+    return done, errors
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Заполнение хранилища результатов BoolTrainer')
+    parser.add_argument('bank', help='JSON-файл со списком заданий')
+    parser.add_argument('--store', default=DEFAULT_STORE, help='файл хранилища SQLite')
+    parser.add_argument('--max-variables', type=int, default=20, help='максимум переменных в задании')
+    args = parser.parse_args(argv)
+
+    with open(args.bank, encoding='utf-8') as file:
+        items = json.load(file)
+
+    store = ResultStore(args.store, readonly=False)
+    try:
+        done, errors = precompute(store, items, args.max_variables)
+    finally:
+        store.close()
+    for error in errors:
+        print(error, file=sys.stderr)
+    print(f"Сохранено заданий: {done} из {len(items)} в {args.store}")
+    return 1 if errors else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,5 +1,7 @@
 // static/js/app.js
 
+const STREAM_VARIABLES_THRESHOLD = 12;  // С этого числа переменных таблица загружается потоком
+
 class BoolTrainerApp {
     constructor() {
         this.schemeManager = new SchemeManager('schemeWorkspace');
@@ -9,6 +11,7 @@ class BoolTrainerApp {
         this.currentConnector = null;
         this.tempLine = null;
         this.selectedElements = new Set();
+        this.schemeSession = null;           // Сессия инкрементального расчета схемы
     }
 
     init() {
@@ -369,18 +372,23 @@ class BoolTrainerApp {
         }
         try {
             const schemeData = this.schemeManager.serialize();
-            const response = await fetch('/api/calculate_scheme', {
-                method: 'POST',
-                headers: {
-                    'Content-Type': 'application/json',
-                    'Accept': 'application/json'
-                },
-                body: JSON.stringify({
+            let result = null;
+            // Сервер хранит схему сессии - отправляем только правки с прошлого расчета
+            if (this.schemeSession && this.schemeSession.variables === variables) {
+                result = await this.postJson(`/api/scheme_session/${this.schemeSession.id}`, {
+                    edits: this.schemeEdits(this.schemeSession, schemeData)
+                });
+                if (result.session_expired) result = null;
+            }
+            if (!result) {
+                result = await this.postJson('/api/scheme_session', {
                     scheme: schemeData,
                     variables: variables
-                })
-            });
-            const result = await response.json();
+                });
+            }
+            this.schemeSession = result.session_id
+                ? this.schemeSnapshot(result.session_id, variables, schemeData)
+                : null;
             if (result.success) {
                 this.displayTruthTable(result.table, 'Логическая схема');
             } else {
@@ -391,6 +399,58 @@ class BoolTrainerApp {
             alert('Ошибка расчета схемы: ' + error.message);
         }
     }
+
+    async postJson(url, body) {
+        const response = await fetch(url, {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+                'Accept': 'application/json'
+            },
+            body: JSON.stringify(body)
+        });
+        return response.json();
+    }
+
+    schemeSnapshot(id, variables, schemeData) {
+        // Состояние схемы, известное серверу (координаты не учитываются)
+        return {
+            id: id,
+            variables: variables,
+            blocks: new Map(schemeData.blocks.map(block => [block.id, block])),
+            connections: new Set(schemeData.connections.map(connection => connection.id))
+        };
+    }
+
+    schemeEdits(snapshot, schemeData) {
+        // Правки от снимка к текущей схеме: удаления, затем добавления
+        const blockKey = block => `${block.type}|${block.variable || ''}`;
+        const blocks = new Map(schemeData.blocks.map(block => [block.id, block]));
+        const connections = new Set(schemeData.connections.map(connection => connection.id));
+        const edits = [];
+        const changed = new Set();
+        snapshot.blocks.forEach((block, id) => {
+            if (!blocks.has(id) || blockKey(blocks.get(id)) !== blockKey(block)) changed.add(id);
+        });
+        // id соединения: "<блок>_input|<блок>_output" - сравниваются id блоков целиком
+        const touchesChanged = id => id.split('|')
+            .some(part => changed.has(part.replace(/_(input|output)$/, '')));
+        snapshot.connections.forEach(id => {
+            if (!connections.has(id) && !touchesChanged(id)) {
+                edits.push({op: 'remove_connection', id: id});
+            }
+        });
+        changed.forEach(id => edits.push({op: 'remove_block', id: id}));
+        blocks.forEach((block, id) => {
+            if (!snapshot.blocks.has(id) || changed.has(id)) {
+                edits.push({op: 'add_block', block: {id: id, type: block.type, variable: block.variable}});
+            }
+        });
+        connections.forEach(id => {
+            if (!snapshot.connections.has(id) || touchesChanged(id)) edits.push({op: 'add_connection', id: id});
+        });
+        return edits;
+    }
     async analyzeExpression(type) {
     const expression = document.getElementById('expressionInput').value;
     const variables = document.getElementById('variablesInput').value;
@@ -400,6 +460,15 @@ class BoolTrainerApp {
         alert('Пожалуйста, введите выражение и переменные');
         return;
     }
+    const variablesCount = variables.split(',').filter(v => v.trim()).length;
+    if (type === 'truth_table' && variablesCount >= STREAM_VARIABLES_THRESHOLD) {
+        try {
+            await this.streamTruthTable(expression, variables);
+        } catch (error) {
+            console.error('Error:', error);
+        }
+        return;
+    }
     try {
         const endpoint = type === 'truth_table' ? '/api/truth_table' : '/api/normal_forms';
         console.log('Sending request to:', endpoint);
@@ -429,6 +498,92 @@ class BoolTrainerApp {
         console.error('Error:', error);
     }
 }
+    // Потоковое получение большой таблицы (NDJSON) с постепенной отрисовкой
+    async streamTruthTable(expression, variables) {
+        const response = await fetch('/api/truth_table', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+                'Accept': 'application/x-ndjson'
+            },
+            body: JSON.stringify({ expression, variables, stream: true })
+        });
+        if (!response.headers.get('Content-Type')?.includes('ndjson')) {
+            const result = await response.json();
+            const truthTableContent = document.getElementById('truthTableContent');
+            if (truthTableContent) truthTableContent.innerHTML = '';
+            this.displayStreamStatus(`<p><strong>Ошибка:</strong> ${result.error || 'Unknown error'}</p>`);
+            throw new Error(result.error || 'Unknown error');
+        }
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+        let tbody = null;
+        let footer = null;
+        let error = null;
+        while (true) {
+            const { done, value } = await reader.read();
+            if (done) break;
+            buffer += decoder.decode(value, { stream: true });
+            const lines = buffer.split('\n');
+            buffer = lines.pop();
+            const rowsHtml = [];
+            lines.filter(line => line).forEach(line => {
+                const message = JSON.parse(line);
+                if (Array.isArray(message)) {
+                    rowsHtml.push(`<tr>${message.map(v => `<td>${v ? '1' : '0'}</td>`).join('')}</tr>`);
+                } else if (message.type === 'header') {
+                    tbody = this.displayTruthTableHeader(message.columns, message.expression);
+                } else if (message.type === 'analysis') {
+                    footer = message.analysis;
+                } else if (message.type === 'error') {
+                    error = message.error;
+                }
+            });
+            if (tbody && rowsHtml.length) tbody.insertAdjacentHTML('beforeend', rowsHtml.join(''));
+        }
+        if (error) {
+            this.displayStreamStatus(`<p><strong>Ошибка:</strong> ${error}</p>`);
+            throw new Error(error);
+        }
+        if (footer) {
+            this.displayStreamStatus(`
+                <p>Строк: ${footer.total_rows}, истинных: ${footer.true_results}, ложных: ${footer.false_results}</p>
+                <p>${footer.is_tautology ? 'Тавтология' : footer.is_contradiction ? 'Противоречие' : 'Выполнимое выражение'}</p>
+            `);
+        }
+    }
+
+    // Итог потоковой таблицы (анализ или ошибка) под строками таблицы
+    displayStreamStatus(html) {
+        const truthTableSection = document.getElementById('truthTableSection');
+        const truthTableContent = document.getElementById('truthTableContent');
+        if (!truthTableContent) return;
+        truthTableContent.insertAdjacentHTML('beforeend', `<div class="stream-status">${html}</div>`);
+        if (truthTableSection) truthTableSection.classList.remove('hidden');
+    }
+
+    displayTruthTableHeader(headers, expression) {
+        const truthTableSection = document.getElementById('truthTableSection');
+        const truthTableContent = document.getElementById('truthTableContent');
+        const transformSection = document.getElementById('transformSection');
+        if (!truthTableContent) return null;
+        truthTableContent.innerHTML = `
+            <h3>Таблица истинности для выражения: ${expression}</h3>
+            <div class="table-container">
+                <table class="truth-table">
+                    <thead>
+                        <tr>${headers.map(h => `<th>${h}</th>`).join('')}</tr>
+                    </thead>
+                    <tbody></tbody>
+                </table>
+            </div>
+        `;
+        if (truthTableSection) truthTableSection.classList.remove('hidden');
+        if (transformSection) transformSection.classList.add('hidden');
+        return truthTableContent.querySelector('tbody');
+    }
+
     // МЕТОДЫ ОТОБРАЖЕНИЯ
 displayTruthTable(table, expression) {
     const truthTableSection = document.getElementById('truthTableSection');
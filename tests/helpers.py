@@ -0,0 +1,21 @@
+"""Общие вспомогательные функции тестов"""
+
+
+def random_expression(rng, names, depth):
+    """Случайное выражение над переменными names глубины не больше depth"""
+    if depth == 0 or rng.random() < 0.2:
+        return rng.choice(names)
+    operator = rng.choice(['&', '|', '^', '->', '<->', '~'])
+    if operator == '~':
+        return f"~({random_expression(rng, names, depth - 1)})"
+    return (f"({random_expression(rng, names, depth - 1)}) {operator} "
+            f"({random_expression(rng, names, depth - 1)})")
+
+
+def make_scheme(blocks, wires):
+    """Схема в формате фронтенда: wires - пары (источник, приемник)"""
+    return {
+        'blocks': [dict(id=block_id, **block) for block_id, block in blocks.items()],
+        'connections': [{'id': '|'.join(sorted([f'{source}_output', f'{target}_input']))}
+                        for source, target in wires]
+    }
@@ -121,6 +121,21 @@ class TestBoolTrainerAPI:
         assert 'error' in data
         assert 'required' in data['error'].lower()
 
+    def test_syntax_error_position(self):
+        """Тест позиции синтаксической ошибки"""
+        test_data = {
+            'expression': 'a & (b | )',
+            'variables': 'a,b'
+        }
+
+        response = self.client.post('/api/truth_table',
+                                    data=json.dumps(test_data),
+                                    content_type='application/json')
+
+        data = response.get_json()
+        assert data['success'] == False
+        assert data['position'] == 9
+
     def test_index_route(self):
         """Тест главной страницы"""
         response = self.client.get('/')
@@ -132,4 +147,249 @@ class TestBoolTrainerAPI:
         # Проверяем что основные элементы присутствуют в HTML
         assert 'Bool Trainer' in response_text
         assert 'expressionInput' in response_text
-        assert 'variablesInput' in response_text
\ No newline at end of file
+        assert 'variablesInput' in response_text
+
+    def test_truth_table_stream(self):
+        """Тест потоковой выдачи таблицы истинности (NDJSON)"""
+        test_data = {
+            'expression': '(a & b) | c',
+            'variables': 'a,b,c',
+            'stream': True
+        }
+
+        response = self.client.post('/api/truth_table',
+                                    data=json.dumps(test_data),
+                                    content_type='application/json')
+
+        assert response.status_code == 200
+        assert response.mimetype == 'application/x-ndjson'
+        lines = [json.loads(line) for line in response.data.decode('utf-8').splitlines()]
+
+        header, rows, footer = lines[0], lines[1:-1], lines[-1]
+        assert header['type'] == 'header'
+        assert header['columns'] == ['a', 'b', 'c', 'result']
+        assert len(rows) == 8
+        assert rows[3] == [False, True, True, True]
+        assert footer['type'] == 'analysis'
+        assert footer['analysis']['true_results'] == 5
+
+    def test_truth_table_stream_fallback_deadline(self):
+        """Построчный режим в потоке (переменная вне списка) ограничен сроком"""
+        original = app.config['BUDGET_TIME_LIMIT']
+        app.config['BUDGET_TIME_LIMIT'] = 0.0
+        try:
+            response = self.client.post('/api/truth_table', json={
+                'expression': 'a & zz', 'variables': 'a,b', 'stream': True})
+            fallback = json.loads(response.data.decode('utf-8').splitlines()[-1])
+            # Скомпилированное выражение выдается без срока
+            response = self.client.post('/api/truth_table', json={
+                'expression': 'a & b', 'variables': 'a,b', 'stream': True})
+            compiled = json.loads(response.data.decode('utf-8').splitlines()[-1])
+        finally:
+            app.config['BUDGET_TIME_LIMIT'] = original
+        assert fallback['type'] == 'error'
+        assert fallback['budget_exceeded']['limit'] == 'time_limit'
+        assert compiled['type'] == 'analysis'
+
+    def test_truth_table_packed_format(self):
+        """Тест упакованного формата таблицы истинности"""
+        test_data = {
+            'expression': '(a & b) | c',
+            'variables': 'a,b,c',
+            'format': 'packed',
+            'encoding': 'hex'
+        }
+
+        response = self.client.post('/api/truth_table',
+                                    data=json.dumps(test_data),
+                                    content_type='application/json')
+
+        data = response.get_json()
+        assert data['success'] == True
+        assert 'table' not in data
+        assert data['table_packed']['data'] == 'ea'
+        assert data['table_packed']['variables'] == ['a', 'b', 'c']
+        assert data['analysis']['true_results'] == 5
+
+    def test_cache_stats(self):
+        """Тест счетчиков кэша при повторном запросе"""
+        test_data = {
+            'expression': 'a | ~b',
+            'variables': 'a,b'
+        }
+        before = self.client.get('/api/cache/stats').get_json()['expressions']
+        for endpoint in ('/api/truth_table', '/api/normal_forms'):
+            self.client.post(endpoint,
+                             data=json.dumps(test_data),
+                             content_type='application/json')
+        after = self.client.get('/api/cache/stats').get_json()['expressions']
+
+        assert after['hits'] - before['hits'] >= 1
+        assert 'evictions' in after
+
+    def test_budget_exceeded(self):
+        """Тест структурированной ошибки при превышении бюджета"""
+        variables = ','.join(f'x{i}' for i in range(app.config['BUDGET_MAX_VARIABLES'] + 1))
+        test_data = {
+            'expression': 'x0 & x1',
+            'variables': variables
+        }
+
+        response = self.client.post('/api/truth_table',
+                                    data=json.dumps(test_data),
+                                    content_type='application/json')
+
+        data = response.get_json()
+        assert data['success'] == False
+        assert data['budget_exceeded']['limit'] == 'max_variables'
+
+    def test_trace_opt_in(self):
+        """Тест трассировки запроса по флагу trace"""
+        test_data = {
+            'expression': 'a | b',
+            'variables': 'a,b'
+        }
+
+        response = self.client.post('/api/normal_forms',
+                                    data=json.dumps(test_data),
+                                    content_type='application/json')
+        assert 'trace' not in response.get_json()
+
+        test_data['trace'] = True
+        response = self.client.post('/api/normal_forms',
+                                    data=json.dumps(test_data),
+                                    content_type='application/json')
+        data = response.get_json()
+        assert data['success'] == True
+        assert isinstance(data['trace'], list)
+
+    def test_batch(self):
+        """Тест пакетной обработки с дедупликацией и ошибками по заданиям"""
+        test_data = {
+            'format': 'packed',
+            'encoding': 'hex',
+            'jobs': [
+                {'expression': 'a & b', 'variables': 'a,b'},
+                {'expression': 'a | b', 'variables': 'a,b', 'operations': ['normal_forms', 'analysis']},
+                {'expression': 'a&&b', 'variables': 'a, b'},
+                {'expression': '', 'variables': 'a'},
+                {'expression': 'a &', 'variables': 'a'}
+            ]
+        }
+
+        response = self.client.post('/api/batch',
+                                    data=json.dumps(test_data),
+                                    content_type='application/json')
+
+        data = response.get_json()
+        assert data['success'] == True
+        assert data['unique_jobs'] == 3
+        results = data['results']
+        assert len(results) == 5
+        assert results[0]['table_packed']['data'] == '08'
+        assert results[2] == results[0]
+        assert results[1]['dnf'] == 'a | b'
+        assert results[1]['analysis']['true_results'] == 3
+        assert 'table_packed' not in results[1]
+        assert results[3]['success'] == False
+        assert results[4]['success'] == False
+
+    def test_equivalence(self):
+        """Тест проверки ответа студента по эталону"""
+        test_data = {
+            'expression': '!(a && b)',
+            'reference': '~a | ~b',
+            'variables': 'a,b'
+        }
+
+        response = self.client.post('/api/equivalence',
+                                    data=json.dumps(test_data),
+                                    content_type='application/json')
+        data = response.get_json()
+        assert data['success'] == True
+        assert data['equivalent'] == True
+        assert data['counterexample'] is None
+
+        test_data['reference'] = 'a | b'
+        response = self.client.post('/api/equivalence',
+                                    data=json.dumps(test_data),
+                                    content_type='application/json')
+        data = response.get_json()
+        assert data['equivalent'] == False
+        assert data['counterexample']['expression'] != data['counterexample']['reference']
+
+    def test_batch_analysis_many_variables(self):
+        """Анализ без таблицы не ограничен числом строк"""
+        names = [f'x{i}' for i in range(40)]
+        test_data = {
+            'jobs': [
+                {'expression': ' | '.join(names), 'variables': ','.join(names), 'operations': ['analysis']},
+                {'expression': ' | '.join(names), 'variables': ','.join(names)}
+            ]
+        }
+
+        response = self.client.post('/api/batch',
+                                    data=json.dumps(test_data),
+                                    content_type='application/json')
+        data = response.get_json()
+        analysis = data['results'][0]['analysis']
+        assert analysis['false_results'] == 1
+        assert analysis['is_satisfiable'] == True
+        assert data['results'][1]['success'] == False
+        assert 'budget_exceeded' in data['results'][1]
+
+    def test_scheme_session(self):
+        """Тест сессии инкрементального расчета схемы"""
+        test_data = {
+            'scheme': {
+                'blocks': [
+                    {'id': 'var_a', 'type': 'VARIABLE', 'variable': 'a'},
+                    {'id': 'var_b', 'type': 'VARIABLE', 'variable': 'b'},
+                    {'id': 'and_1', 'type': 'AND'}
+                ],
+                'connections': [
+                    {'id': 'and_1_input|var_a_output'},
+                    {'id': 'and_1_input|var_b_output'}
+                ]
+            },
+            'variables': 'a,b'
+        }
+
+        response = self.client.post('/api/scheme_session',
+                                    data=json.dumps(test_data),
+                                    content_type='application/json')
+        data = response.get_json()
+        assert data['success'] == True
+        assert [row['result'] for row in data['table']] == [False, False, False, True]
+        session_id = data['session_id']
+
+        edits = {'edits': [
+            {'op': 'add_block', 'block': {'id': 'not_1', 'type': 'NOT'}},
+            {'op': 'add_connection', 'id': 'and_1_output|not_1_input'}
+        ]}
+        response = self.client.post(f'/api/scheme_session/{session_id}',
+                                    data=json.dumps(edits),
+                                    content_type='application/json')
+        data = response.get_json()
+        assert data['success'] == True
+        assert data['recomputed'] == 1
+        assert [row['result'] for row in data['table']] == [True, True, True, False]
+
+        response = self.client.post(f'/api/scheme_session/{session_id}',
+                                    data=json.dumps({'edits': [{'op': 'remove_block', 'id': 'missing'}]}),
+                                    content_type='application/json')
+        data = response.get_json()
+        assert data['success'] == False
+        assert data['session_expired'] == True
+
+    def test_cached_expression_does_not_hide_syntax_error(self):
+        """Ошибка разбора не зависит от того, что уже лежит в кэше"""
+        response = self.client.post('/api/truth_table', json={'expression': 'a -> b', 'variables': 'a,b'})
+        assert response.get_json()['success'] == True
+
+        response = self.client.post('/api/truth_table', json={'expression': 'a - > b', 'variables': 'a,b'})
+        assert response.get_json()['success'] == False
+
+        self.client.post('/api/truth_table', json={'expression': 'ab', 'variables': 'ab'})
+        response = self.client.post('/api/truth_table', json={'expression': 'a b', 'variables': 'ab'})
+        assert response.get_json()['success'] == False
@@ -0,0 +1,139 @@
+import sys
+import os
+import asyncio
+import json
+
+# Добавляем путь к проекту для импорта модулей
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from asgi import ASGIAdapter
+from app import app
+
+
+def call(adapter, method, path, payload=None):
+    """Один запрос к ASGI-приложению: (статус, заголовки, фрагменты тела)"""
+    return asyncio.run(_call(adapter, method, path, payload))
+
+
+async def _call(adapter, method, path, payload=None):
+    body = json.dumps(payload).encode('utf-8') if payload is not None else b''
+    scope = {
+        'type': 'http', 'method': method, 'path': path, 'query_string': b'',
+        'headers': [(b'content-type', b'application/json')],
+    }
+    messages = [{'type': 'http.request', 'body': body, 'more_body': False}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0) if messages else {'type': 'http.disconnect'}
+
+    async def send(message):
+        sent.append(message)
+
+    await adapter(scope, receive, send)
+    start = sent[0]
+    chunks = [message['body'] for message in sent[1:] if message['body']]
+    assert sent[-1]['more_body'] is False
+    return start['status'], dict(start['headers']), chunks
+
+
+class TestASGIAdapter:
+    """Тесты ASGI-адаптера"""
+
+    def setup_method(self):
+        app.config['TESTING'] = True
+        self.adapter = ASGIAdapter(app)
+
+    def teardown_method(self):
+        self.adapter.shutdown()
+
+    def test_routes_endpoints(self):
+        """Адаптер определяет endpoint Flask по методу и пути"""
+        assert self.adapter.endpoint('POST', '/api/truth_table') == 'calculate_truth_table'
+        assert self.adapter.endpoint('GET', '/api/cache/stats') == 'cache_stats'
+        assert self.adapter.endpoint('GET', '/api/missing') is None
+
+    def test_inline_request(self):
+        """Дешевый запрос выполняется без пула потоков"""
+        status, headers, chunks = call(self.adapter, 'GET', '/api/cache/stats')
+        assert status == 200
+        assert json.loads(b''.join(chunks))['success']
+        assert self.adapter._executor is None
+
+    def test_offloaded_request(self):
+        """Вычисление выполняется в пуле потоков и возвращает таблицу"""
+        status, headers, chunks = call(self.adapter, 'POST', '/api/truth_table',
+                                       {'expression': 'a & b', 'variables': 'a,b'})
+        assert status == 200
+        data = json.loads(b''.join(chunks))
+        assert data['success']
+        assert [row['result'] for row in data['table']] == [False, False, False, True]
+        assert self.adapter._executor is not None
+
+    def test_streaming_response(self):
+        """Потоковый ответ передается фрагментами и формируется в одном потоке"""
+        status, headers, chunks = call(self.adapter, 'POST', '/api/truth_table',
+                                       {'expression': 'a | b', 'variables': 'a,b', 'stream': True})
+        assert status == 200
+        assert headers[b'content-type'] == b'application/x-ndjson'
+        lines = [json.loads(line) for line in b''.join(chunks).decode('utf-8').splitlines()]
+        assert len(lines) > 1
+
+    def test_streaming_backpressure(self):
+        """Поток пула не опережает медленного клиента больше чем на размер очереди"""
+        produced = []
+
+        def body():
+            for index in range(200):
+                produced.append(index)
+                yield b'x'
+
+        self.adapter._call_wsgi = lambda environ: (200, [], body())
+        lags = []
+
+        async def send(message):
+            if message['type'] == 'http.response.body' and message['body']:
+                lags.append(len(produced) - len(lags) - 1)
+                await asyncio.sleep(0.0005)
+
+        asyncio.run(self.adapter._respond({}, send, offload=True))
+        assert len(lags) == 200
+        assert max(lags) <= ASGIAdapter.STREAM_QUEUE_SIZE + 1
+
+    def test_not_found(self):
+        status, headers, chunks = call(self.adapter, 'GET', '/api/missing')
+        assert status == 404
+
+    def test_saturated_endpoint(self):
+        """Запрос сверх лимита endpoint'а после ожидания в очереди получает 429"""
+        original = app.config['ASGI_QUEUE_TIMEOUT']
+        app.config['ASGI_QUEUE_TIMEOUT'] = 0.05
+
+        async def scenario():
+            semaphore = self.adapter.semaphore('calculate_truth_table')
+            while not semaphore.locked():
+                await semaphore.acquire()
+            return await _call(self.adapter, 'POST', '/api/truth_table',
+                               {'expression': 'a', 'variables': 'a'})
+
+        try:
+            status, headers, chunks = asyncio.run(scenario())
+        finally:
+            app.config['ASGI_QUEUE_TIMEOUT'] = original
+        assert status == 429
+        assert headers[b'retry-after'] == b'1'
+        assert json.loads(b''.join(chunks))['retry']
+
+    def test_lifespan(self):
+        """Запуск и остановка сервера завершаются подтверждением"""
+        messages = [{'type': 'lifespan.startup'}, {'type': 'lifespan.shutdown'}]
+        sent = []
+
+        async def receive():
+            return messages.pop(0)
+
+        async def send(message):
+            sent.append(message['type'])
+
+        asyncio.run(self.adapter({'type': 'lifespan'}, receive, send))
+        assert sent == ['lifespan.startup.complete', 'lifespan.shutdown.complete']
@@ -0,0 +1,72 @@
+import sys
+import os
+
+# Добавляем путь к проекту для импорта модулей
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from sympy import symbols, And, Or, Xor, Implies, Equivalent, Not
+from logic.bdd import BDD, BDDError, variable_order, ORDER_GIVEN, ORDER_DFS, ORDER_FREQUENCY
+from logic.truth_table_generator import TruthTableGenerator
+
+
+class TestBDD:
+    """Тесты диаграмм решений"""
+
+    def setup_method(self):
+        self.a, self.b, self.c = symbols('a b c')
+
+    def test_canonical_nodes(self):
+        """Равносильные выражения дают один узел"""
+        a, b, c = self.a, self.b, self.c
+        bdd = BDD([a, b, c])
+        assert bdd.build(~(a & b)) == bdd.build(~a | ~b)
+        assert bdd.build(Implies(a, b)) == bdd.build(~a | b)
+        assert bdd.build(a | ~a) == BDD.TRUE
+        assert bdd.build(And(a, Not(a))) == BDD.FALSE
+
+    def test_analysis_matches_truth_table(self):
+        """Анализ по диаграмме совпадает с анализом по таблице"""
+        a, b, c = self.a, self.b, self.c
+        for expression in [a & b, Xor(a, b, c), Equivalent(a, b, c), Implies(a & b, c), a | ~a]:
+            bdd = BDD([a, b, c])
+            generator = TruthTableGenerator(expression, [a, b, c])
+            assert bdd.analyze(bdd.build(expression)) == generator.generate_compact().analyze()
+
+    def test_any_sat(self):
+        """Выполняющий набор действительно выполняет выражение"""
+        a, b, c = self.a, self.b, self.c
+        bdd = BDD([a, b, c])
+        expression = a & ~b & c
+        model = bdd.any_sat(bdd.build(expression))
+        assert model == {a: True, b: False, c: True}
+        assert bdd.any_sat(BDD.FALSE) is None
+
+    def test_variable_order(self):
+        """Эвристики порядка переменных"""
+        x, y, z, w = symbols('x y z w')
+        expression = (z & x) | (z & y)
+        assert variable_order([expression], [x, y, z, w], ORDER_GIVEN) == [x, y, z, w]
+        assert variable_order([expression], [x, y, z, w], ORDER_FREQUENCY)[0] == z
+        order = variable_order([expression], [x, y, z, w], ORDER_DFS)
+        assert sorted(order, key=str) == sorted([x, y, z, w], key=str) and order[-1] == w
+
+    def test_many_variables(self):
+        """Анализ выражения на 100 переменных без перебора строк"""
+        variables = symbols('x0:100')
+        expression = And(*[Or(variables[i], variables[i + 1]) for i in range(0, 100, 2)])
+        generator = TruthTableGenerator(expression, list(variables))
+        analysis = generator.analyze()
+        assert analysis['true_results'] == 3 ** 50
+        assert analysis['total_rows'] == 2 ** 100
+        assert analysis['is_satisfiable'] and not analysis['is_tautology']
+        assert generator.truth_table is None
+
+    def test_node_limit(self):
+        """Превышение числа узлов"""
+        variables = symbols('x0:8')
+        bdd = BDD(variables, max_nodes=5)
+        with pytest.raises(BDDError):
+            bdd.build(Xor(*variables))
+        with pytest.raises(BDDError):
+            bdd.build(self.a)
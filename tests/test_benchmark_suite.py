@@ -0,0 +1,49 @@
+import sys
+import os
+
+# Добавляем путь к проекту для импорта модулей
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.suite import build_expression, build_scheme, depth_for, percentile, measure, compare
+from logic.parser import parse
+from logic.scheme_calculator import SchemeCalculator
+
+
+class TestBenchmarkSuite:
+    """Тесты вспомогательных функций набора бенчмарков"""
+
+    def test_generated_inputs(self):
+        """Выражения детерминированы и содержат все переменные, схема имеет один выход"""
+        expression, variables = build_expression(12, depth_for(12))
+        assert build_expression(12, depth_for(12)) == (expression, variables)
+        assert sorted(parse(expression).variables()) == sorted(variables.split(','))
+
+        scheme, variables = build_scheme(4, 20)
+        table = SchemeCalculator(scheme, variables).calculate_compact()
+        assert table.output_names == ['result']
+
+    def test_percentile(self):
+        samples = list(range(1, 101))
+        assert percentile(samples, 0.5) == 50
+        assert percentile(samples, 0.99) == 99
+        assert percentile([7], 0.99) == 7
+
+    def test_measure(self):
+        metrics = measure(lambda: [0] * 1000, min_repeats=3, min_time=0)
+        assert metrics['repeats'] == 3
+        assert metrics['p50_ms'] <= metrics['p99_ms']
+        assert metrics['throughput'] > 0
+        assert metrics['peak_kib'] > 0
+
+    def test_compare(self):
+        """Регрессия - рост p50 или памяти больше порога; шум и новые сценарии не учитываются"""
+        baseline = {'a': {'p50_ms': 10.0, 'peak_kib': 1000}, 'b': {'p50_ms': 0.01, 'peak_kib': 10}}
+        results = {
+            'a': {'p50_ms': 14.0, 'peak_kib': 1500},
+            'b': {'p50_ms': 0.03, 'peak_kib': 20},
+            'c': {'p50_ms': 100.0, 'peak_kib': 100000},
+        }
+        regressions = compare(results, baseline, threshold=0.25, memory_threshold=0.25)
+        assert len(regressions) == 2
+        assert all(regression.startswith('a:') for regression in regressions)
+        assert compare(results, baseline, threshold=0.5, memory_threshold=0.6) == []
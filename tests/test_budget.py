@@ -0,0 +1,56 @@
+import sys
+import os
+
+import pytest
+
+# Добавляем путь к проекту для импорта модулей
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sympy import symbols
+from logic.budget import Budget, BudgetExceeded
+from logic.normal_form_converter import NormalFormConverter
+from logic.truth_table_generator import TruthTableGenerator
+
+
+class TickingClock:
+    """Часы, продвигающиеся на step при каждом обращении"""
+
+    def __init__(self, step):
+        self.now = 0.0
+        self.step = step
+
+    def __call__(self):
+        self.now += self.step
+        return self.now
+
+
+class TestBudget:
+    """Тесты бюджета запроса"""
+
+    def test_size_limits(self):
+        """Лимиты числа переменных, строк и размера выражения"""
+        budget = Budget(max_variables=4, max_rows=8, max_expression_size=10)
+        budget.check_variables(3)
+        with pytest.raises(BudgetExceeded) as error:
+            budget.check_variables(4)
+        assert error.value.to_dict() == {'limit': 'max_rows', 'value': 16, 'maximum': 8}
+        with pytest.raises(BudgetExceeded):
+            budget.check_expression(11)
+
+    def test_generator_cancelled_by_deadline(self):
+        """Построчная генерация прерывается по сроку"""
+        variables = symbols('a b c d')
+        budget = Budget(time_limit=5, clock=TickingClock(1))
+        generator = TruthTableGenerator(variables[0] & variables[1], list(variables),
+                                        mode=TruthTableGenerator.MODE_PER_ROW, budget=budget)
+        with pytest.raises(BudgetExceeded) as error:
+            generator.generate()
+        assert error.value.limit == 'time_limit'
+
+    def test_normal_forms_respect_variable_limit(self):
+        """Конвертер нормальных форм проверяет число переменных"""
+        variables = symbols('x0:6')
+        converter = NormalFormConverter(variables[0] | variables[5], list(variables),
+                                        budget=Budget(max_variables=5))
+        with pytest.raises(BudgetExceeded):
+            converter.to_dnf()
@@ -0,0 +1,61 @@
+import sys
+import os
+
+# Добавляем путь к проекту для импорта модулей
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from logic.cache import LRUCache, ExpressionCache
+
+
+class FakeClock:
+    """Управляемые часы для проверки TTL"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestCache:
+    """Тесты кэша выражений"""
+
+    def test_lru_eviction(self):
+        """Вытеснение самой старой записи"""
+        cache = LRUCache(maxsize=2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        assert cache.get('a') == 1
+        cache.set('c', 3)
+        assert 'b' not in cache
+        assert cache.get('a') == 1 and cache.get('c') == 3
+        stats = cache.stats()
+        assert stats['evictions'] == 1
+        assert stats['hits'] == 3
+
+    def test_ttl_expiration(self):
+        """Устаревшие записи считаются промахом"""
+        clock = FakeClock()
+        cache = LRUCache(maxsize=4, ttl=10, clock=clock)
+        cache.set('a', 1)
+        clock.now = 11
+        assert cache.get('a') is None
+        assert cache.stats()['expirations'] == 1
+        assert cache.stats()['misses'] == 1
+
+    def test_canonical_key_shares_entry(self):
+        """Запись по каноническому ключу общая для разных написаний"""
+        cache = ExpressionCache(maxsize=8)
+        first = cache.get('a && b', 'a, b')
+        second = cache.get('a&b', 'a,b')
+        assert first is second
+        assert first.analysis()['true_results'] == 1
+        assert cache.stats()['hits'] == 1
+        assert cache.stats()['misses'] == 1
+
+    def test_key_keeps_token_boundaries(self):
+        """Пробелы между лексемами не склеивают разные выражения"""
+        assert ExpressionCache.make_key('a->b', 'a,b') == ExpressionCache.make_key(' a -> b ', 'a, b')
+        assert ExpressionCache.make_key('a - > b', 'a,b') != ExpressionCache.make_key('a -> b', 'a,b')
+        assert ExpressionCache.make_key('a b', 'ab') != ExpressionCache.make_key('ab', 'ab')
+        assert ExpressionCache.make_key('a & True', 'a') == ExpressionCache.make_key('a & 1', 'a')
@@ -0,0 +1,84 @@
+import sys
+import os
+
+import pytest
+
+# Добавляем путь к проекту для импорта модулей
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from logic.cache import CircuitCache
+from logic.circuit import CircuitError
+from logic.circuit_session import CircuitSession
+from logic.scheme_calculator import SchemeCalculator
+from tests.helpers import make_scheme
+
+
+class TestCircuitSession:
+    """Тесты инкрементального пересчета схем"""
+
+    def setup_method(self):
+        self.scheme = make_scheme(
+            {'var_a': {'type': 'VARIABLE', 'variable': 'a'},
+             'var_b': {'type': 'VARIABLE', 'variable': 'b'},
+             'var_c': {'type': 'VARIABLE', 'variable': 'c'},
+             'and_1': {'type': 'AND'},
+             'or_1': {'type': 'OR'},
+             'out': {'type': 'OUTPUT'}},
+            [('var_a', 'and_1'), ('var_b', 'and_1'), ('and_1', 'or_1'), ('var_c', 'or_1'), ('or_1', 'out')])
+        self.session = CircuitSession.from_scheme(self.scheme, ['a', 'b', 'c'])
+
+    def test_matches_full_calculation(self):
+        """Начальная таблица совпадает с полным расчетом"""
+        expected = SchemeCalculator(self.scheme, 'a,b,c').calculate_compact()
+        assert self.session.truth_table().bits == expected.bits
+
+    def test_only_downstream_cone_recomputed(self):
+        """Замена элемента пересчитывает только его конус"""
+        session = self.session
+        session.apply({'op': 'remove_block', 'id': 'and_1'})
+        session.apply({'op': 'add_block', 'block': {'id': 'xor_1', 'type': 'XOR'}})
+        session.apply({'op': 'add_connection', 'id': 'var_a_output|xor_1_input'})
+        session.apply({'op': 'add_connection', 'source': 'var_b', 'target': 'xor_1'})
+        session.apply({'op': 'add_connection', 'source': 'xor_1', 'target': 'or_1'})
+        assert session.recompute() == 3  # xor_1, or_1, out
+
+        table = session.truth_table()
+        for index in range(8):
+            a, b, c = table.values(index)
+            assert table.result(index) == ((a != b) or c)
+
+    def test_incomplete_scheme(self):
+        """Незавершенная схема сообщает причину, после правки снова считается"""
+        session = self.session
+        session.apply({'op': 'remove_connection', 'source': 'var_c', 'target': 'or_1'})
+        session.apply({'op': 'remove_connection', 'source': 'and_1', 'target': 'or_1'})
+        session.recompute()
+        with pytest.raises(CircuitError, match='не подключены входы'):
+            session.truth_table()
+        session.apply({'op': 'add_connection', 'source': 'var_c', 'target': 'or_1'})
+        assert session.recompute() == 2
+        assert session.truth_table().minterms() == [1, 3, 5, 7]
+
+    def test_cycle_rejected(self):
+        """Соединение, образующее цикл, не применяется"""
+        with pytest.raises(CircuitError, match='цикл'):
+            self.session.apply({'op': 'add_connection', 'source': 'or_1', 'target': 'and_1'})
+        assert self.session.inputs['and_1'] == ['var_a', 'var_b']
+
+    def test_shares_circuit_cache(self):
+        """Таблица сессии попадает в общий кэш схем и берется из него"""
+        cache = CircuitCache()
+        session = CircuitSession.from_scheme(self.scheme, ['a', 'b', 'c'], cache=cache)
+        table = session.truth_table()
+        assert cache.stats()['size'] == 1
+
+        # Та же структура через расчет схемы - попадание в кэш без пересчета
+        calculator = SchemeCalculator(self.scheme, 'a,b,c', cache=cache)
+        assert calculator.calculate_compact() is table
+        assert cache.stats()['hits'] == 1
+
+        session.apply({'op': 'remove_connection', 'id': 'out_input|or_1_output'})
+        session.apply({'op': 'add_connection', 'source': 'and_1', 'target': 'out'})
+        session.recompute()
+        assert session.truth_table().minterms() == [6, 7]
+        assert cache.stats()['size'] == 2
@@ -0,0 +1,54 @@
+import sys
+import os
+
+# Добавляем путь к проекту для импорта модулей
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sympy import symbols, Implies, Equivalent, ITE, true
+from logic.compiled_evaluator import CompiledEvaluator
+from logic.parser import parse, to_sympy
+from logic.truth_table_generator import TruthTableGenerator
+
+
+class TestCompiledEvaluator:
+    """Тесты побитового вычислителя"""
+
+    def setup_method(self):
+        self.a, self.b, self.c = symbols('a b c')
+        self.variables = [self.a, self.b, self.c]
+
+    def _tables(self, expression):
+        compiled = TruthTableGenerator(expression, self.variables).generate()
+        per_row = TruthTableGenerator(expression, self.variables,
+                                      mode=TruthTableGenerator.MODE_PER_ROW).generate()
+        return compiled, per_row
+
+    def test_matches_per_row_generation(self):
+        """Скомпилированный режим совпадает с построчным"""
+        a, b, c = self.variables
+        for expression in [a & b, (a & b) | c, ~a | (b & ~c), Implies(a, b),
+                           Equivalent(a, c), ITE(a, b, c), a & true]:
+            compiled, per_row = self._tables(expression)
+            assert compiled == per_row, str(expression)
+
+    def test_negated_constants(self):
+        """Отрицание константы из разобранной строки одинаково в обоих режимах"""
+        symbols_map = {'a': self.a, 'b': self.b, 'c': self.c}
+        for text in ['!1', 'a & !1', '!!0 | b', '!0 & c']:
+            compiled, per_row = self._tables(to_sympy(parse(text), symbols_map))
+            assert compiled == per_row, text
+
+    def test_chunk_evaluation(self):
+        """Вычисление по блокам строк дает тот же столбец"""
+        a, b, c = self.variables
+        evaluator = CompiledEvaluator((a & ~b) | c, self.variables)
+        full = evaluator.result_bits()
+        chunks = [evaluator.evaluate(start, 2) for start in range(0, 8, 2)]
+        assert full == sum(chunk << (i * 2) for i, chunk in enumerate(chunks))
+
+    def test_unknown_symbol_falls_back(self):
+        """Неизвестная переменная - возврат к построчному режиму"""
+        d = symbols('d')
+        generator = TruthTableGenerator(self.a & d, self.variables)
+        assert generator.compile() is None
+        assert len(generator.generate()) == 8
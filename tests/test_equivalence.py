@@ -0,0 +1,58 @@
+import sys
+import os
+
+# Добавляем путь к проекту для импорта модулей
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sympy import symbols, Implies, Or, true, false
+from logic.equivalence import EquivalenceChecker
+
+
+class TestEquivalence:
+    """Тесты проверки равносильности"""
+
+    def test_equivalent_by_bitset(self):
+        """Закон де Моргана и импликация"""
+        a, b = symbols('a b')
+        result = EquivalenceChecker(~(a & b), ~a | ~b, [a, b]).check()
+        assert result == {'equivalent': True, 'counterexample': None, 'method': 'bitset'}
+        assert EquivalenceChecker(Implies(a, b), ~a | b, [a, b]).check()['equivalent']
+
+    def test_counterexample(self):
+        """Контрпример различает выражения"""
+        a, b, c = symbols('a b c')
+        result = EquivalenceChecker(a & b, a & (b | c), [a, b, c]).check()
+        assert not result['equivalent']
+        counterexample = result['counterexample']
+        assert counterexample['values'] == {'a': True, 'b': False, 'c': True}
+        assert counterexample['first'] != counterexample['second']
+
+    def test_counterexample_with_constant_subterm(self):
+        """Значения контрпримера считаются и для невычисленных подвыражений-констант"""
+        a = symbols('a')
+        first = a & Implies(true, false, evaluate=False)
+        result = EquivalenceChecker(first, a, [a]).check()
+        assert not result['equivalent']
+        assert result['counterexample'] == {'values': {'a': True}, 'first': False, 'second': True}
+
+    def test_many_variables_use_bdd(self):
+        """Для большого числа переменных таблица не строится"""
+        variables = symbols('x0:40')
+        first = Or(*variables)
+        second = Or(*reversed(variables))
+        result = EquivalenceChecker(first, second, list(variables)).check()
+        assert result['equivalent'] and result['method'] == 'bdd'
+
+        result = EquivalenceChecker(variables[0] | variables[39], variables[39], list(variables)).check()
+        assert not result['equivalent']
+        values = result['counterexample']['values']
+        assert values['x0'] is True and values['x39'] is False
+
+    def test_sat_fallback(self):
+        """Слишком большая диаграмма - проверка через SAT"""
+        variables = symbols('x0:24')
+        first = Or(*variables)
+        checker = EquivalenceChecker(first, first | variables[0], list(variables))
+        checker.BDD_MAX_NODES = 4
+        result = checker.check()
+        assert result['equivalent'] and result['method'] == 'sat'
@@ -0,0 +1,106 @@
+import sys
+import os
+import random
+
+import pytest
+
+# Добавляем путь к проекту для импорта модулей
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from logic.budget import BudgetExceeded
+from logic.kmap import KarnaughMap, gray_codes
+from logic.minimizer import Minimizer
+from logic.truth_table import TruthTable
+from app import app
+
+
+def table(variables, minterms):
+    return TruthTable(list(variables), sum(1 << m for m in minterms))
+
+
+class TestKarnaughMap:
+    """Тесты раскладки карты Карно и импликант"""
+
+    def test_gray_codes(self):
+        assert gray_codes(2) == [0, 1, 3, 2]
+        assert gray_codes(0) == [0]
+
+    def test_layout_three_variables(self):
+        layout = KarnaughMap(table('abc', [0, 1, 5, 7])).layout()
+        assert layout['row_variables'] == ['a']
+        assert layout['column_variables'] == ['b', 'c']
+        assert layout['column_codes'] == ['00', '01', '11', '10']
+        # Строка a=1, столбцы bc = 00, 01, 11, 10 -> минтермы 4, 5, 7, 6
+        assert layout['maps'] == [{'fixed': '', 'cells': ['1100', '0110']}]
+
+    def test_layout_five_variables(self):
+        layout = KarnaughMap(table('abcde', [16, 31])).layout()
+        assert layout['map_variables'] == ['a']
+        assert [item['fixed'] for item in layout['maps']] == ['0', '1']
+        assert layout['maps'][0]['cells'] == ['0000'] * 4
+        assert layout['maps'][1]['cells'] == ['1000', '0000', '0010', '0000']
+        assert KarnaughMap(TruthTable(list('abcdefg'), 1)).layout() is None
+
+    def test_implicants(self):
+        """f = ~a~b~c + ~ab + ab~c: ~a~c не существенна"""
+        result = KarnaughMap(table('abc', [0, 2, 3, 6])).to_dict()
+        assert result['prime_implicants'] == ['-10', '0-0', '01-']
+        assert result['essential_implicants'] == ['-10', '0-0', '01-']
+
+        result = KarnaughMap(table('abc', [0, 1, 2, 5, 6, 7])).to_dict()
+        assert len(result['prime_implicants']) == 6
+        assert result['essential_implicants'] == []
+
+    def test_constants(self):
+        assert KarnaughMap(table('ab', [])).to_dict()['prime_implicants'] == []
+        assert KarnaughMap(table('ab', range(4))).to_dict()['prime_implicants'] == ['--']
+
+    def test_matches_quine_mccluskey(self):
+        rng = random.Random(3)
+        for n in range(1, 8):
+            for _ in range(20):
+                bits = rng.getrandbits(1 << n)
+                variables = [f"x{index}" for index in range(n)]
+                minimizer = Minimizer(variables, bits)
+                expected = minimizer._prime_implicants(minimizer._minterms(bits), (1 << n) - 1) if bits else set()
+                assert set(KarnaughMap(TruthTable(variables, bits)).prime_implicants()) == expected
+
+    def test_variable_limit(self):
+        with pytest.raises(BudgetExceeded):
+            KarnaughMap(TruthTable([f"x{index}" for index in range(13)], 1))
+
+
+class TestKarnaughAPI:
+    """Тесты карты Карно в /api/truth_table и /api/batch"""
+
+    def setup_method(self):
+        app.config['TESTING'] = True
+        self.client = app.test_client()
+
+    def test_truth_table_with_kmap(self):
+        data = self.client.post('/api/truth_table', json={
+            'expression': 'a & b | ~a & ~b', 'variables': 'a,b', 'kmap': True, 'format': 'packed'}).get_json()
+        assert data['success']
+        assert 'table_packed' in data
+        assert data['kmap']['layout']['maps'] == [{'fixed': '', 'cells': ['10', '01']}]
+        assert data['kmap']['essential_implicants'] == ['00', '11']
+
+        data = self.client.post('/api/truth_table', json={'expression': 'a', 'variables': 'a'}).get_json()
+        assert 'kmap' not in data
+
+    def test_truth_table_kmap_too_many_variables(self):
+        """Карта сверх MAX_VARIABLES не отменяет таблицу"""
+        names = [f"x{index}" for index in range(KarnaughMap.MAX_VARIABLES + 1)]
+        data = self.client.post('/api/truth_table', json={
+            'expression': 'x0 & x12', 'variables': ','.join(names), 'kmap': True, 'format': 'packed'}).get_json()
+        assert data['success']
+        assert data['kmap'] is None
+        assert 'max_kmap_variables' in data['kmap_error']
+        assert data['analysis']['true_results'] == 1 << (len(names) - 2)
+
+    def test_batch_kmap(self):
+        data = self.client.post('/api/batch', json={'jobs': [
+            {'expression': 'a | b', 'variables': 'a,b', 'operations': ['kmap']}]}).get_json()
+        result = data['results'][0]
+        assert result['success']
+        assert result['kmap']['prime_implicants'] == ['-1', '1-']
@@ -0,0 +1,114 @@
+import sys
+import os
+
+# Добавляем путь к проекту для импорта модулей
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from logic import metrics
+from logic.metrics import Registry, Timings, timing, stage, rows_evaluated
+from logic.cache import ExpressionCache
+from app import app
+
+
+class TestMetrics:
+    """Тесты счетчиков, гистограмм и времени этапов"""
+
+    def test_counter_and_histogram_format(self):
+        """Вывод в текстовом формате Prometheus"""
+        registry = Registry()
+        counter = registry.counter('test_total', 'Счетчик', ('kind',))
+        histogram = registry.histogram('test_seconds', 'Гистограмма', buckets=(0.1, 1.0))
+        counter.inc(kind='a')
+        counter.inc(2, kind='a"b')
+        histogram.observe(0.05)
+        histogram.observe(0.5)
+        histogram.observe(5)
+
+        lines = registry.render().splitlines()
+        assert '# TYPE test_total counter' in lines
+        assert 'test_total{kind="a"} 1' in lines
+        assert 'test_total{kind="a\\"b"} 2' in lines
+        assert '# TYPE test_seconds histogram' in lines
+        assert 'test_seconds_bucket{le="0.1"} 1' in lines
+        assert 'test_seconds_bucket{le="1"} 2' in lines
+        assert 'test_seconds_bucket{le="+Inf"} 3' in lines
+        assert 'test_seconds_count 3' in lines
+        assert 'test_seconds_sum 5.55' in lines
+
+    def test_collector(self):
+        registry = Registry()
+        registry.register_collector(lambda: [('test_size', 'gauge', 'Размер', [({'cache': 'x'}, 7)])])
+        assert 'test_size{cache="x"} 7' in registry.render().splitlines()
+
+    def test_stage_timings(self):
+        """Этапы попадают в гистограмму и в Timings текущего контекста"""
+        before = metrics.STAGE_SECONDS.count(stage='test_stage')
+        with timing() as current:
+            with stage('test_stage'):
+                pass
+            with stage('test_stage'):
+                pass
+            rows_evaluated(16, 'test')
+        with stage('test_stage'):
+            pass
+
+        assert metrics.STAGE_SECONDS.count(stage='test_stage') == before + 3
+        assert len(current.stages) == 2
+        assert list(current.totals()) == ['test_stage']
+        assert current.rows == {'test': 16}
+        assert current.header(total=0.5).startswith('test_stage;dur=')
+        assert current.header(total=0.5).endswith('total;dur=500.000')
+
+    def test_merge(self):
+        """Этапы из другого процесса учитываются в текущем запросе"""
+        remote = Timings()
+        remote.add('remote_stage', 0.25)
+        remote.rows['expression'] = 4
+        rows_before = metrics.ROWS_EVALUATED.value(source='expression')
+        with timing() as current:
+            metrics.merge(remote.to_dict())
+        assert current.totals() == {'remote_stage': 0.25}
+        assert metrics.ROWS_EVALUATED.value(source='expression') == rows_before + 4
+
+    def test_engine_stages(self):
+        """Разбор, построение таблицы и анализ замеряются как отдельные этапы"""
+        with timing() as current:
+            entry = ExpressionCache().get('a & b | c', 'a,b,c')
+            entry.truth_table().analyze()
+        assert list(current.totals()) == ['parse', 'sympy', 'truth_table', 'analyze']
+        assert current.rows == {'expression': 8}
+
+
+class TestMetricsEndpoints:
+    """Тесты /metrics и заголовка Server-Timing"""
+
+    def setup_method(self):
+        app.config['TESTING'] = True
+        self.client = app.test_client()
+
+    def test_server_timing_header(self):
+        response = self.client.post('/api/normal_forms', json={'expression': 'x & ~y', 'variables': 'x,y'})
+        assert response.get_json()['success']
+        header = response.headers['Server-Timing']
+        stages = [part.split(';')[0] for part in header.split(', ')]
+        assert stages[-1] == 'total'
+        assert {'cnf', 'dnf', 'serialize'} <= set(stages)
+
+    def test_metrics_endpoint(self):
+        self.client.post('/api/truth_table', json={'expression': 'p | q', 'variables': 'p,q'})
+        response = self.client.get('/metrics')
+        assert response.status_code == 200
+        assert response.mimetype == 'text/plain'
+        text = response.get_data(as_text=True)
+        assert 'booltrainer_request_seconds_count{endpoint="calculate_truth_table"}' in text
+        assert 'booltrainer_requests_total{endpoint="calculate_truth_table",status="200"}' in text
+        assert 'booltrainer_stage_seconds_bucket{stage="truth_table",le="+Inf"}' in text
+        assert 'booltrainer_cache_hits_total{cache="expressions"}' in text
+
+    def test_disabled(self):
+        app.config['METRICS_ENABLED'] = False
+        try:
+            response = self.client.post('/api/truth_table', json={'expression': 'p', 'variables': 'p'})
+        finally:
+            app.config['METRICS_ENABLED'] = True
+        assert 'Server-Timing' not in response.headers
@@ -0,0 +1,51 @@
+import sys
+import os
+import random
+
+# Добавляем путь к проекту для импорта модулей
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sympy import symbols
+from logic.compiled_evaluator import CompiledEvaluator
+from logic.minimizer import Minimizer
+from logic.normal_form_converter import NormalFormConverter
+
+
+class TestMinimizer:
+    """Тесты минимизации нормальных форм"""
+
+    def test_known_minimal_forms(self):
+        """Минимальные ДНФ/КНФ в формате SymPy"""
+        a, b, c = symbols('a b c')
+        converter = NormalFormConverter((a & b) | (a & ~b) | (b & c))
+        assert converter.to_dnf() == 'a | (b & c)'
+        assert converter.to_cnf() == '(a | b) & (a | c)'
+
+    def test_exact_and_heuristic_are_equivalent(self):
+        """Оба режима дают формы, равносильные исходной функции"""
+        variables = symbols('x0:6')
+        rng = random.Random(6)
+        for _ in range(5):
+            bits = rng.getrandbits(64)
+            minimizer = Minimizer(variables, bits)
+            for mode in (Minimizer.MODE_EXACT, Minimizer.MODE_HEURISTIC):
+                sop = minimizer.sop_expression(mode)
+                pos = minimizer.pos_expression(mode)
+                assert CompiledEvaluator(sop, variables).result_bits() == bits
+                assert CompiledEvaluator(pos, variables).result_bits() == bits
+
+    def test_exact_is_not_larger_than_heuristic(self):
+        """Точный режим не хуже эвристического по числу термов"""
+        variables = symbols('x0:5')
+        rng = random.Random(5)
+        for _ in range(5):
+            minimizer = Minimizer(variables, rng.getrandbits(32))
+            exact = minimizer.minimize_sop(Minimizer.MODE_EXACT)
+            assert minimizer.used_mode == Minimizer.MODE_EXACT
+            assert len(exact) <= len(minimizer.minimize_sop(Minimizer.MODE_HEURISTIC))
+
+    def test_constants(self):
+        """Тавтология и противоречие"""
+        a = symbols('a')
+        assert NormalFormConverter(a | ~a).to_dnf() == 'True'
+        assert NormalFormConverter(a & ~a).to_cnf() == 'False'
@@ -0,0 +1,62 @@
+import sys
+import os
+
+# Добавляем путь к проекту для импорта модулей
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from sympy import symbols, Xor, Implies, Equivalent
+from logic.parser import ParseError, parse, to_sympy
+from logic.expression_processor import ExpressionProcessor, ExpressionError
+
+
+class TestParser:
+    """Тесты разбора выражений"""
+
+    def test_precedence(self):
+        """Приоритеты и ассоциативность операций"""
+        assert repr(parse('a | b & c')) == "OR(VAR('a'), AND(VAR('b'), VAR('c')))"
+        assert repr(parse('a ^ b | c')) == "OR(XOR(VAR('a'), VAR('b')), VAR('c'))"
+        assert repr(parse('a -> b -> c')) == "IMPLIES(VAR('a'), IMPLIES(VAR('b'), VAR('c')))"
+        assert repr(parse('a <-> b -> c')) == "EQUIV(VAR('a'), IMPLIES(VAR('b'), VAR('c')))"
+        assert repr(parse('~a & b')) == "AND(NOT(VAR('a')), VAR('b'))"
+        assert repr(parse('a & b & c')) == "AND(VAR('a'), VAR('b'), VAR('c'))"
+
+    def test_alternative_syntax(self):
+        """Операции &&, ||, ! и константы"""
+        assert repr(parse('!(a && b) || 0')) == repr(parse('~(a & b) | False'))
+        assert repr(parse('true & 1')) == "AND(CONST(True), CONST(True))"
+
+    def test_to_sympy(self):
+        """Преобразование в SymPy, в том числе XOR"""
+        a, b, c = symbols('a b c')
+        assert to_sympy(parse('a ^ b')) == Xor(a, b)
+        assert to_sympy(parse('a -> b')) == Implies(a, b)
+        assert to_sympy(parse('a <-> (b | c)')) == Equivalent(a, b | c)
+        assert parse('b & a & b').variables() == ['b', 'a']
+
+    @pytest.mark.parametrize('text, position', [
+        ('a &', 3),
+        ('(a | b', 6),
+        ('a b', 2),
+        ('a $ b', 2),
+        ('a & 2', 4),
+        ('| a', 0),
+        ('', 0),
+    ])
+    def test_error_position(self, text, position):
+        """Позиция синтаксической ошибки"""
+        with pytest.raises(ParseError) as error:
+            parse(text)
+        assert error.value.position == position
+
+    def test_processor(self):
+        """Ленивое построение выражения SymPy и ошибки обработчика"""
+        processor = ExpressionProcessor('a ^ b', 'a, b')
+        processor.parse()
+        assert processor._sympy_expression is None
+        assert processor.sympy_expression == Xor(*processor.sympy_variables)
+
+        with pytest.raises(ExpressionError) as error:
+            ExpressionProcessor('a & (b', 'a, b').parse()
+        assert error.value.position == 6
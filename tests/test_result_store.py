@@ -0,0 +1,118 @@
+import sys
+import os
+import json
+import sqlite3
+
+import pytest
+
+# Добавляем путь к проекту для импорта модулей
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import precompute
+from logic.cache import ExpressionCache, CircuitCache
+from logic.metrics import timing
+from logic.result_store import ResultStore, ResultStoreError, open_store
+from logic.scheme_calculator import SchemeCalculator
+from logic.truth_table import TruthTable
+
+from tests.helpers import make_scheme
+
+
+SCHEME = make_scheme(
+    {'var_a': {'type': 'VARIABLE', 'variable': 'a'},
+     'var_b': {'type': 'VARIABLE', 'variable': 'b'},
+     'xor_1': {'type': 'XOR'}},
+    [('var_a', 'xor_1'), ('var_b', 'xor_1')])
+
+TWO_OUTPUTS = make_scheme(
+    {'var_a': {'type': 'VARIABLE', 'variable': 'a'},
+     'var_b': {'type': 'VARIABLE', 'variable': 'b'},
+     'and_1': {'type': 'AND'},
+     'or_1': {'type': 'OR'},
+     'sum': {'type': 'OUTPUT', 'name': 'and'},
+     'carry': {'type': 'OUTPUT', 'name': 'or'}},
+    [('var_a', 'and_1'), ('var_b', 'and_1'), ('var_a', 'or_1'), ('var_b', 'or_1'),
+     ('and_1', 'sum'), ('or_1', 'carry')])
+
+
+class TestResultStore:
+    """Тесты хранилища заранее вычисленных результатов"""
+
+    @pytest.fixture
+    def store_path(self, tmp_path):
+        bank = tmp_path / 'bank.json'
+        bank.write_text(json.dumps([
+            {'expression': 'a & ~b', 'variables': 'a,b'},
+            {'expression': 'a -> (b | c)', 'variables': 'a,b,c'},
+            {'scheme': SCHEME, 'variables': 'a,b'},
+            {'scheme': TWO_OUTPUTS, 'variables': 'a,b'},
+            {'expression': 'a &', 'variables': 'a'},
+        ]), encoding='utf-8')
+        path = str(tmp_path / 'results.sqlite')
+        assert precompute.main([str(bank), '--store', path]) == 1  # одно задание с ошибкой
+        return path
+
+    def test_expression_round_trip(self, store_path):
+        store = ResultStore(store_path)
+        stored = store.expression(ExpressionCache.make_key('a&~b', 'a, b'))
+        assert stored['text'] == 'a & ~b'
+        assert stored['truth_table'].minterms() == [2]
+        assert stored['normal_forms'] == ('a & ~b', 'a & ~b')
+        assert store.expression(ExpressionCache.make_key('a | b', 'a,b')) is None
+        assert store.stats()['expressions'] == 2
+        assert (store.stats()['hits'], store.stats()['misses']) == (1, 1)
+
+    def test_cache_reads_store_first(self, store_path):
+        """Результаты из хранилища не вычисляются заново"""
+        cache = ExpressionCache(store=ResultStore(store_path))
+        with timing() as current:
+            entry = cache.get('a -> (b | c)', 'a,b,c')
+            table = entry.truth_table()
+            cnf, dnf = entry.normal_forms()
+        assert 'truth_table' not in current.totals()
+        assert 'cnf' not in current.totals()
+        assert table.minterms() == [0, 1, 2, 3, 5, 6, 7]
+        assert entry.text == 'Implies(a, b | c)'
+        assert cnf == 'b | c | ~a'
+
+    def test_circuit_cache_reads_store(self, store_path):
+        store = ResultStore(store_path)
+        cache = CircuitCache(store=store)
+        with timing() as current:
+            table = SchemeCalculator(SCHEME, 'a,b', cache=cache).calculate_compact()
+        assert table.minterms() == [1, 2]
+        assert current.rows == {}
+
+        multi = SchemeCalculator(TWO_OUTPUTS, 'a,b', cache=cache).calculate_compact()
+        assert multi.output_names == ['and', 'or']
+        assert multi.output('or').minterms() == [1, 2, 3]
+        assert store.stats()['hits'] == 2
+
+    def test_missing_store(self, tmp_path):
+        path = str(tmp_path / 'missing.sqlite')
+        with pytest.raises(ResultStoreError):
+            ResultStore(path)
+        assert open_store(path) is None
+        assert open_store(None) is None
+
+    def test_tasks_open_store_lazily(self, store_path, monkeypatch):
+        """Процесс без configure_cache (воркер пула) открывает хранилище при первой задаче"""
+        from logic import tasks
+        monkeypatch.setattr(tasks, 'expression_cache', None)
+        monkeypatch.setenv(tasks.STORE_ENV, store_path)
+        expression, table = tasks.truth_table('a & ~b', 'a,b')
+        assert table.minterms() == [2]
+        assert tasks.expression_cache.store.stats()['hits'] == 1
+        tasks.expression_cache.store.close()
+
+    def test_version_mismatch(self, store_path):
+        store = ResultStore(store_path, readonly=False)
+        store._connection().execute("UPDATE meta SET value = '0' WHERE name = 'results_version'")
+        store.commit()
+        store.close()
+        assert open_store(store_path) is None
+
+    def test_readonly(self, store_path):
+        store = ResultStore(store_path)
+        with pytest.raises(sqlite3.OperationalError):
+            store.save_expression(('x', ('x',)), 'x', ['x'], TruthTable(['x'], 2))
@@ -0,0 +1,195 @@
+import sys
+import os
+import json
+import random
+from itertools import product
+
+import pytest
+
+# Добавляем путь к проекту для импорта модулей
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sympy import symbols, Xor, Implies, ITE
+from sympy.logic.boolalg import Nand, Xnor
+from logic.budget import Budget, BudgetExceeded
+from logic.parser import parse, from_sympy
+from logic.sat import Solver, SatProblem, evaluate_partial
+from logic.truth_table_generator import TruthTableGenerator
+from app import app
+
+from tests.helpers import random_expression
+
+
+def brute_force(node, names):
+    return [dict(zip(names, values)) for values in product([False, True], repeat=len(names))
+            if evaluate_partial(node, dict(zip(names, values)))]
+
+
+class TestSolver:
+    """Тесты CDCL-решателя"""
+
+    def test_clauses(self):
+        solver = Solver()
+        a, b, c = solver.new_var(), solver.new_var(), solver.new_var()
+        solver.add_clause([a, b])
+        solver.add_clause([-a, c])
+        solver.add_clause([-c])
+        assert solver.solve()
+        model = solver.model()
+        assert (model[a], model[b], model[c]) == (False, True, False)
+        solver.add_clause([-b])
+        assert not solver.solve()
+
+    def test_pigeonhole(self):
+        """5 голубей в 4 клетках: невыполнимо, требует обучения клаузам"""
+        solver = Solver()
+        cells = [[solver.new_var() for _ in range(4)] for _ in range(5)]
+        for pigeon in cells:
+            solver.add_clause(pigeon)
+        for hole in range(4):
+            for first in range(5):
+                for second in range(first + 1, 5):
+                    solver.add_clause([-cells[first][hole], -cells[second][hole]])
+        assert not solver.solve()
+        assert solver.stats['learned'] > 0
+
+
+class TestSatProblem:
+    """Тесты выполнимости, перечисления и подсчета моделей"""
+
+    def test_against_brute_force(self):
+        rng = random.Random(7)
+        names = ['a', 'b', 'c', 'd', 'e']
+        for _ in range(60):
+            node = parse(random_expression(rng, names, 4))
+            expected = brute_force(node, names)
+
+            model = SatProblem(node, names).solve()
+            assert (model is not None) == bool(expected)
+            if model is not None:
+                assert evaluate_partial(node, model)
+
+            models = list(SatProblem(node, names).models(100))
+            assert sorted(map(str, models)) == sorted(map(str, expected))
+
+            result = SatProblem(node, names).count(1000)
+            assert (result['count'], result['exact']) == (len(expected), True)
+            assert result['cubes'] <= len(expected)
+
+    def test_count_cubes(self):
+        """Куб без свободных переменных не нужен: a | b дает не более 2 кубов"""
+        result = SatProblem(parse('a | b'), ['a', 'b', 'c']).count(100)
+        assert result['count'] == 6 and result['exact']
+        assert result['cubes'] <= 3
+
+    def test_count_limit(self):
+        result = SatProblem(parse('a ^ b ^ c ^ d'), ['a', 'b', 'c', 'd']).count(2)
+        assert result == {'count': 2, 'exact': False, 'cubes': 2}
+
+    def test_models_limit(self):
+        problem = SatProblem(parse('a | b'), ['a', 'b'])
+        assert len(list(problem.models(2))) == 2
+        assert not problem.exhausted()
+        assert len(list(problem.models(5))) == 1
+        assert problem.exhausted()
+
+    def test_many_variables(self):
+        """Число переменных не ограничено размером таблицы"""
+        names = [f"x{index}" for index in range(60)]
+        node = parse(' & '.join(f"({names[index]} ^ {names[index + 1]})" for index in range(59)))
+        result = SatProblem(node, names).count(10)
+        assert result == {'count': 2, 'exact': True, 'cubes': 2}
+
+    def test_extra_variables(self):
+        """Переменные выражения вне списка добавляются в конец"""
+        problem = SatProblem(parse('a & z'), ['a', 'b'])
+        assert problem.variables == ['a', 'b', 'z']
+        assert problem.solve() == {'a': True, 'b': False, 'z': True}
+
+    def test_deadline(self):
+        budget = Budget(time_limit=0.0)
+        node = parse(' ^ '.join(f"x{index}" for index in range(20)))
+        with pytest.raises(BudgetExceeded):
+            SatProblem(node, budget=budget).count(1 << 20)
+
+    def test_count_deadline_per_cube(self):
+        """Срок проверяется на каждом кубе, а не раз в CHECK_INTERVAL"""
+        blocked = []
+        budget = Budget(time_limit=10, clock=lambda: len(blocked))
+        problem = SatProblem(parse(' ^ '.join(f"x{index}" for index in range(12))), budget=budget)
+        block = problem._block
+        problem._block = lambda cube: (blocked.append(cube), block(cube))
+        with pytest.raises(BudgetExceeded) as error:
+            problem.count(1 << 20)
+        assert error.value.value <= 11
+
+
+class TestFromSympy:
+    """Тесты преобразования выражений SymPy в AST"""
+
+    def test_operators(self):
+        a, b, c = symbols('a b c')
+        names = ['a', 'b', 'c']
+        for expression in [Xor(a, b, c), Implies(a, b), Nand(a, b), Xnor(a, c), ITE(a, b, c)]:
+            node = from_sympy(expression)
+            for values in product([False, True], repeat=3):
+                assignment = dict(zip(names, values))
+                expected = bool(expression.subs({symbols(name): value for name, value in assignment.items()}))
+                assert evaluate_partial(node, assignment) == expected
+
+    def test_analyze_sat(self):
+        a, b = symbols('a b')
+        generator = TruthTableGenerator(a | ~a & b, [a, b])
+        analysis = generator.analyze_sat()
+        assert analysis['method'] == 'sat'
+        assert analysis['is_satisfiable'] and not analysis['is_tautology']
+        assert analysis['true_results'] is None
+
+
+class TestSatAPI:
+    """Тесты /api/sat"""
+
+    def setup_method(self):
+        app.config['TESTING'] = True
+        self.client = app.test_client()
+
+    def test_solve(self):
+        response = self.client.post('/api/sat', json={'expression': 'a & ~b', 'variables': 'a,b'})
+        data = response.get_json()
+        assert data['success']
+        assert data['satisfiable'] and data['model'] == {'a': True, 'b': False}
+        assert data['variables'] == ['a', 'b']
+        assert 'conflicts' in data['solver']
+
+        data = self.client.post('/api/sat', json={'expression': 'a & ~a', 'variables': 'a'}).get_json()
+        assert data['success'] and not data['satisfiable'] and data['model'] is None
+
+    def test_models_and_count(self):
+        data = self.client.post('/api/sat', json={
+            'expression': 'a | b', 'variables': 'a,b', 'mode': 'models', 'limit': 2}).get_json()
+        assert len(data['models']) == 2 and not data['complete']
+
+        names = ','.join(f"x{index}" for index in range(40))
+        data = self.client.post('/api/sat', json={
+            'expression': 'x0 | x1', 'variables': names, 'mode': 'count'}).get_json()
+        assert data['success']
+        assert data['count'] == 3 << 38 and data['exact']
+
+    def test_stream(self):
+        response = self.client.post('/api/sat', json={
+            'expression': 'a ^ b', 'variables': 'a,b', 'mode': 'models', 'stream': True})
+        assert response.mimetype == 'application/x-ndjson'
+        lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+        assert lines[0]['columns'] == ['a', 'b']
+        assert sorted(map(tuple, lines[1:-1])) == [(False, True), (True, False)]
+        assert lines[-1] == {'type': 'done', 'models': 2, 'complete': True}
+
+    def test_errors(self):
+        data = self.client.post('/api/sat', json={
+            'expression': 'a', 'variables': 'a', 'mode': 'minimize'}).get_json()
+        assert not data['success'] and 'mode' in data['error']
+        data = self.client.post('/api/sat', json={'expression': 'a &', 'variables': 'a'}).get_json()
+        assert not data['success'] and 'position' in data
+        data = self.client.post('/api/sat', json={
+            'expression': 'a', 'variables': 'a', 'mode': 'models', 'limit': 'ten'}).get_json()
+        assert data == {'success': False, 'error': 'Limit must be an integer'}
@@ -0,0 +1,164 @@
+import sys
+import os
+import itertools
+
+import pytest
+
+# Добавляем путь к проекту для импорта модулей
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from logic.cache import CircuitCache
+from logic.circuit import CircuitError
+from logic.scheme_calculator import SchemeCalculator
+from logic.tracing import tracing
+
+from tests.helpers import make_scheme
+
+
+class TestSchemeCalculator:
+    """Тесты расчета логических схем"""
+
+    def test_and_not_scheme(self):
+        """Схема a & ~b"""
+        scheme = make_scheme(
+            {'var_a': {'type': 'VARIABLE', 'variable': 'a'},
+             'var_b': {'type': 'VARIABLE', 'variable': 'b'},
+             'not_1': {'type': 'NOT'},
+             'and_1': {'type': 'AND'}},
+            [('var_b', 'not_1'), ('var_a', 'and_1'), ('not_1', 'and_1')])
+        table = SchemeCalculator(scheme, 'a,b').calculate_truth_table()
+        assert [row['result'] for row in table] == [False, False, True, False]
+
+    def test_multilevel_scheme(self):
+        """Многоуровневая схема (a | b) ^ ~(a & c) с явным выходом"""
+        scheme = make_scheme(
+            {'var_a': {'type': 'VARIABLE', 'variable': 'a'},
+             'var_b': {'type': 'VARIABLE', 'variable': 'b'},
+             'var_c': {'type': 'VARIABLE', 'variable': 'c'},
+             'or_1': {'type': 'OR'},
+             'and_1': {'type': 'AND'},
+             'not_1': {'type': 'NOT'},
+             'xor_1': {'type': 'XOR'},
+             'output_1': {'type': 'OUTPUT'}},
+            [('var_a', 'or_1'), ('var_b', 'or_1'), ('var_a', 'and_1'), ('var_c', 'and_1'),
+             ('and_1', 'not_1'), ('or_1', 'xor_1'), ('not_1', 'xor_1'), ('xor_1', 'output_1')])
+        table = SchemeCalculator(scheme, 'a,b,c').calculate_truth_table()
+        for row in table:
+            a, b, c = row['a'], row['b'], row['c']
+            assert row['result'] == ((a or b) != (not (a and c)))
+
+    def test_long_xor_chain(self):
+        """Цепочка из сотен элементов вычисляется корректно"""
+        count = 8
+        blocks = {f'var_{i}': {'type': 'VARIABLE', 'variable': f'x{i}'} for i in range(count)}
+        wires = []
+        previous = 'var_0'
+        for i in range(300):
+            gate = f'xor_{i}'
+            blocks[gate] = {'type': 'XOR'}
+            wires += [(previous, gate), (f'var_{i % count}', gate)]
+            previous = gate
+        variables = ','.join(f'x{i}' for i in range(count))
+        table = SchemeCalculator(make_scheme(blocks, wires), variables).calculate_compact()
+        for index, values in enumerate(itertools.product([0, 1], repeat=count)):
+            expected = values[0]
+            for i in range(300):
+                expected ^= values[i % count]
+            assert table.result(index) == bool(expected)
+
+    def test_cycle_rejected(self):
+        """Схема с циклом отклоняется"""
+        scheme = make_scheme(
+            {'var_a': {'type': 'VARIABLE', 'variable': 'a'},
+             'and_1': {'type': 'AND'},
+             'or_1': {'type': 'OR'}},
+            [('var_a', 'and_1'), ('or_1', 'and_1'), ('and_1', 'or_1')])
+        calculator = SchemeCalculator(scheme, 'a')
+        with pytest.raises(CircuitError):
+            calculator.calculate_truth_table()
+        assert not calculator.validate_scheme()['is_valid']
+
+    def test_trace_is_opt_in(self, capsys):
+        """Без трассировки ничего не выводится, с ней - собираются события"""
+        scheme = make_scheme(
+            {'var_a': {'type': 'VARIABLE', 'variable': 'a'},
+             'not_1': {'type': 'NOT'}},
+            [('var_a', 'not_1')])
+        SchemeCalculator(scheme, 'a').calculate_truth_table()
+        assert capsys.readouterr().out == ''
+
+        with tracing() as current:
+            SchemeCalculator(scheme, 'a').calculate_truth_table()
+        messages = [event['message'] for event in current.to_list()]
+        assert 'Соединение not_1_input|var_a_output: var_a -> not_1' in messages
+        assert 'Блок not_1 (NOT): 10' in messages
+
+    def test_structure_hash(self):
+        """Хэш не зависит от id, координат и порядка, но зависит от структуры"""
+        first = make_scheme(
+            {'var_a': {'type': 'VARIABLE', 'variable': 'a', 'x': 10, 'y': 20},
+             'var_b': {'type': 'VARIABLE', 'variable': 'b'},
+             'and_1': {'type': 'AND'}},
+            [('var_a', 'and_1'), ('var_b', 'and_1')])
+        second = make_scheme(
+            {'g': {'type': 'AND', 'x': 300},
+             'in_b': {'type': 'VARIABLE', 'variable': 'b'},
+             'in_a': {'type': 'VARIABLE', 'variable': 'a', 'x': 50}},
+            [('in_b', 'g'), ('in_a', 'g')])
+        third = make_scheme(
+            {'var_a': {'type': 'VARIABLE', 'variable': 'a'},
+             'var_b': {'type': 'VARIABLE', 'variable': 'b'},
+             'or_1': {'type': 'OR'}},
+            [('var_a', 'or_1'), ('var_b', 'or_1')])
+
+        def structure_hash(scheme, variables='a,b'):
+            return SchemeCalculator(scheme, variables).structure_hash()
+
+        assert structure_hash(first) == structure_hash(second)
+        assert structure_hash(first) != structure_hash(third)
+        assert structure_hash(first) != structure_hash(first, 'b,a')
+
+    def test_circuit_cache(self):
+        """Повторный расчет той же структуры берется из кэша"""
+        cache = CircuitCache()
+        scheme = make_scheme(
+            {'var_a': {'type': 'VARIABLE', 'variable': 'a'},
+             'var_b': {'type': 'VARIABLE', 'variable': 'b'},
+             'xor_1': {'type': 'XOR'}},
+            [('var_a', 'xor_1'), ('var_b', 'xor_1')])
+        table = SchemeCalculator(scheme, 'a,b', cache=cache).calculate_compact()
+        scheme['blocks'][2]['x'] = 100
+        assert SchemeCalculator(scheme, 'a,b', cache=cache).calculate_compact() is table
+        assert table.minterms() == [1, 2]
+        assert cache.stats()['hits'] == 1
+
+        broken = make_scheme({'and_1': {'type': 'AND'}}, [])
+        with pytest.raises(CircuitError):
+            SchemeCalculator(broken, 'a', cache=cache).calculate_compact()
+        assert cache.stats()['size'] == 1
+
+    def test_multiple_outputs(self):
+        """Полусумматор: по столбцу на каждый блок OUTPUT, общие элементы считаются один раз"""
+        scheme = make_scheme(
+            {'var_a': {'type': 'VARIABLE', 'variable': 'a'},
+             'var_b': {'type': 'VARIABLE', 'variable': 'b'},
+             'xor_1': {'type': 'XOR'},
+             'and_1': {'type': 'AND'},
+             'or_1': {'type': 'OR'},
+             'sum': {'type': 'OUTPUT', 'name': 's'},
+             'carry': {'type': 'OUTPUT', 'name': 'c'}},
+            [('var_a', 'xor_1'), ('var_b', 'xor_1'), ('var_a', 'and_1'), ('var_b', 'and_1'),
+             ('var_a', 'or_1'), ('xor_1', 'sum'), ('and_1', 'carry')])
+        calculator = SchemeCalculator(scheme, 'a,b')
+        table = calculator.calculate_compact()
+        assert table.output_names == ['s', 'c']
+        assert [(row['s'], row['c']) for row in table.rows()] == \
+            [(False, False), (True, False), (True, False), (False, True)]
+
+        # Элемент or_1 не подключен к выходам и не вычисляется
+        circuit = calculator.compile()
+        assert circuit.slots['or_1'] not in {step[0] for step in circuit.output_plan}
+
+        packed = table.to_packed('hex')
+        assert [output['data'] for output in packed['outputs']] == ['06', '08']
+        assert 'data' not in packed
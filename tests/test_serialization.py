@@ -0,0 +1,104 @@
+import sys
+import os
+import gzip
+import json
+import random
+
+# Добавляем путь к проекту для импорта модулей
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from logic import serialization
+from logic.serialization import BINARY_MIMETYPE, rows_json, json_with_raw, encode_binary, decode_binary
+from logic.truth_table import TruthTable, MultiOutputTable
+from app import app
+
+from tests.helpers import make_scheme
+
+
+class TestSerialization:
+    """Тесты сериализации таблиц по битовому столбцу"""
+
+    def test_rows_json_matches_rows(self):
+        rng = random.Random(2)
+        for n in range(1, 12):
+            variables = [f"x{index}" for index in range(n)]
+            table = TruthTable(variables, rng.getrandbits(1 << n))
+            assert json.loads(rows_json(table)) == table.rows()
+
+    def test_rows_json_multi_output(self):
+        rng = random.Random(4)
+        variables = ['a', 'b', 'c']
+        for outputs in (2, serialization.OUTPUT_COMBINATIONS_MAX + 2):
+            table = MultiOutputTable(variables, [(f'out "{k}"', rng.getrandbits(8)) for k in range(outputs)])
+            assert json.loads(rows_json(table)) == table.rows()
+
+    def test_json_with_raw(self):
+        assert json_with_raw({'success': True}, table='[1]') == '{"success":true,"table":[1]}'
+        assert json_with_raw({}, table='[]') == '{"table":[]}'
+
+    def test_binary_round_trip(self):
+        table = TruthTable(['a', 'b', 'c'], 0b10010110)
+        header, decoded = decode_binary(encode_binary(table, {'expression': 'a ^ b ^ c'}))
+        assert header['expression'] == 'a ^ b ^ c'
+        assert header['outputs'] == ['result']
+        assert decoded.bits == table.bits and decoded.variables == table.variables
+
+        multi = MultiOutputTable(['a', 'b'], [('sum', 0b0110), ('carry', 0b1000)])
+        _, decoded = decode_binary(encode_binary(multi))
+        assert decoded.outputs == multi.outputs
+
+
+class TestSerializationAPI:
+    """Тесты согласования формата и сжатия ответов"""
+
+    def setup_method(self):
+        app.config['TESTING'] = True
+        self.client = app.test_client()
+
+    def test_json_table(self):
+        data = self.client.post('/api/truth_table', json={'expression': 'a -> b', 'variables': 'a,b'}).get_json()
+        assert data['success']
+        assert [row['result'] for row in data['table']] == [True, True, False, True]
+        assert data['table'][2] == {'a': True, 'b': False, 'result': False}
+
+    def test_binary_table(self):
+        response = self.client.post('/api/truth_table', json={'expression': 'a & b', 'variables': 'a,b'},
+                                    headers={'Accept': BINARY_MIMETYPE})
+        assert response.mimetype == BINARY_MIMETYPE
+        header, table = decode_binary(response.get_data())
+        assert header['success'] and header['analysis']['true_results'] == 1
+        assert table.minterms() == [3]
+
+    def test_binary_scheme(self):
+        scheme = make_scheme(
+            {'var_a': {'type': 'VARIABLE', 'variable': 'a'},
+             'var_b': {'type': 'VARIABLE', 'variable': 'b'},
+             'and_1': {'type': 'AND'},
+             'xor_1': {'type': 'XOR'},
+             'sum': {'type': 'OUTPUT', 'name': 'sum'},
+             'carry': {'type': 'OUTPUT', 'name': 'carry'}},
+            [('var_a', 'and_1'), ('var_b', 'and_1'), ('var_a', 'xor_1'), ('var_b', 'xor_1'),
+             ('xor_1', 'sum'), ('and_1', 'carry')])
+        response = self.client.post('/api/calculate_scheme', json={'scheme': scheme, 'variables': 'a,b'},
+                                    headers={'Accept': BINARY_MIMETYPE})
+        header, table = decode_binary(response.get_data())
+        assert header['outputs'] == ['sum', 'carry']
+        assert table.output('sum').minterms() == [1, 2]
+
+    def test_gzip(self):
+        variables = ','.join(f"x{index}" for index in range(8))
+        request = {'expression': 'x0 ^ x7', 'variables': variables}
+        response = self.client.post('/api/truth_table', json=request, headers={'Accept-Encoding': 'gzip'})
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert 'Accept-Encoding' in response.headers['Vary']
+        data = json.loads(gzip.decompress(response.get_data()))
+        assert len(data['table']) == 256
+
+        plain = self.client.post('/api/truth_table', json=request)
+        assert 'Content-Encoding' not in plain.headers
+        assert plain.get_json() == data
+
+    def test_small_responses_not_compressed(self):
+        response = self.client.post('/api/truth_table', json={'expression': 'a', 'variables': 'a'},
+                                    headers={'Accept-Encoding': 'gzip'})
+        assert 'Content-Encoding' not in response.headers
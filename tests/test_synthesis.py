@@ -0,0 +1,98 @@
+import sys
+import os
+import random
+from itertools import product
+
+# Добавляем путь к проекту для импорта модулей
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from logic.parser import parse
+from logic.sat import evaluate_partial
+from logic.scheme_calculator import SchemeCalculator
+from logic.synthesis import synthesize
+from app import app
+
+from tests.helpers import random_expression
+
+
+def simulate(scheme, names):
+    table = SchemeCalculator(scheme, ','.join(names)).calculate_compact()
+    return [bool(table.result(index)) for index in range(1 << len(names))]
+
+
+def expected_results(node, names):
+    return [bool(evaluate_partial(node, dict(zip(names, values))))
+            for values in product([False, True], repeat=len(names))]
+
+
+class TestSynthesis:
+    """Тесты синтеза схемы по выражению"""
+
+    def test_random_expressions(self):
+        """Таблица синтезированной схемы совпадает с таблицей выражения"""
+        rng = random.Random(11)
+        names = ['a', 'b', 'c', 'd']
+        for _ in range(100):
+            node = parse(random_expression(rng, names, 5))
+            scheme, _ = synthesize(node, names)
+            assert simulate(scheme, names) == expected_results(node, names)
+
+    def test_common_subexpressions(self):
+        """(a & b) встречается трижды, но строится один раз"""
+        scheme, stats = synthesize(parse('(a & b) | c & (b & a) | ~(a & b) & d'), ['a', 'b', 'c', 'd'])
+        assert stats['gate_types']['AND'] == 3
+        assert stats['gate_types']['NOT'] == 1
+
+    def test_constant_propagation(self):
+        _, stats = synthesize(parse('(a & 1) | (b & 0) | (c ^ c)'), ['a', 'b', 'c'])
+        assert stats['gates'] == 0
+        _, stats = synthesize(parse('~~a ^ ~b'), ['a', 'b'])
+        assert stats['gate_types'] == {'XOR': 1, 'NOT': 1}
+
+    def test_constant_output(self):
+        """Константа выражается через первую переменную: в редакторе нет блока константы"""
+        scheme, _ = synthesize(parse('(a -> b) | (a & ~b)'), ['a', 'b'])
+        assert simulate(scheme, ['a', 'b']) == [True] * 4
+        scheme, _ = synthesize(parse('a & b & ~a'), ['a', 'b'])
+        assert simulate(scheme, ['a', 'b']) == [False] * 4
+
+    def test_balanced_depth(self):
+        names = [f"x{index}" for index in range(16)]
+        _, stats = synthesize(parse(' & '.join(names)), names)
+        assert stats['gates'] == 15
+        assert stats['depth'] == 4
+
+    def test_editor_format(self):
+        scheme, _ = synthesize(parse('a & ~b'), ['a', 'b', 'c'])
+        blocks = {block['id']: block for block in scheme['blocks']}
+        assert blocks['var_c']['type'] == 'VARIABLE'
+        assert blocks['output']['type'] == 'OUTPUT'
+        assert all('position' in block for block in scheme['blocks'])
+        assert {'id': 'not_1_input|var_b_output', 'source': 'var_b', 'target': 'not_1'} in scheme['connections']
+
+
+class TestSynthesisAPI:
+    """Тесты /api/synthesize"""
+
+    def setup_method(self):
+        app.config['TESTING'] = True
+        self.client = app.test_client()
+
+    def test_round_trip(self):
+        """Схема из ответа принимается /api/calculate_scheme"""
+        data = self.client.post('/api/synthesize', json={
+            'expression': '(a -> b) <-> (c | a)', 'variables': 'a,b,c'}).get_json()
+        assert data['success']
+        assert data['stats']['gates'] > 0
+
+        table = self.client.post('/api/calculate_scheme', json={
+            'scheme': data['scheme'], 'variables': 'a,b,c'}).get_json()
+        reference = self.client.post('/api/truth_table', json={
+            'expression': '(a -> b) <-> (c | a)', 'variables': 'a,b,c'}).get_json()
+        assert [row['result'] for row in table['table']] == [row['result'] for row in reference['table']]
+
+    def test_errors(self):
+        data = self.client.post('/api/synthesize', json={'expression': 'a |', 'variables': 'a'}).get_json()
+        assert not data['success'] and 'position' in data
+        data = self.client.post('/api/synthesize', json={'expression': 'a'}).get_json()
+        assert not data['success']
@@ -0,0 +1,63 @@
+import sys
+import os
+import subprocess
+import time
+import threading
+
+import pytest
+
+# Добавляем путь к проекту для импорта модулей
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from logic import tasks
+from logic.budget import BudgetExceeded
+from logic.task_pool import TaskPool, TaskTimeout, PoolSaturated
+
+
+class TestTaskPool:
+    """Тесты пула процессов"""
+
+    def setup_method(self):
+        self.pool = TaskPool(workers=1, max_pending=1, warmup_modules=())
+
+    def teardown_method(self):
+        self.pool.shutdown()
+
+    def test_runs_logic_task(self):
+        """Задача выполняется в воркере, исключения передаются обратно"""
+        expression, table = self.pool.submit(tasks.truth_table, 'a & b', 'a,b', timeout=60)
+        assert expression == 'a & b'
+        assert table.minterms() == [3]
+
+        with pytest.raises(BudgetExceeded):
+            self.pool.submit(tasks.truth_table, 'a & b', 'a,b', {'max_variables': 1}, timeout=60)
+
+    def test_hung_worker_is_replaced(self):
+        """Зависшая задача прерывается, воркер перезапускается"""
+        self.pool.submit(abs, -1, timeout=60)  # дожидаемся запуска воркера
+        with pytest.raises(TaskTimeout):
+            self.pool.submit(time.sleep, 30, timeout=0.5)
+        assert self.pool.submit(abs, -2, timeout=60) == 2
+        assert self.pool.stats()['respawns'] == 1
+
+    def test_saturation(self):
+        """При заполненной очереди задача отклоняется сразу"""
+        self.pool.submit(abs, -1, timeout=60)
+        worker = threading.Thread(target=self.pool.submit, args=(time.sleep, 1), kwargs={'timeout': 60})
+        worker.start()
+        time.sleep(0.2)
+        with pytest.raises(PoolSaturated):
+            self.pool.submit(abs, -1)
+        worker.join()
+        assert self.pool.stats()['rejected'] == 1
+
+
+def test_app_import_does_not_load_sympy():
+    """Импорт приложения не загружает SymPy, прогрев - загружает"""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    code = ("import sys, app; loaded = 'sympy' in sys.modules; "
+            "app.start_warmup().join(); print(loaded, 'sympy' in sys.modules)")
+    env = {**os.environ, 'BOOLTRAINER_WARMUP': '0'}
+    output = subprocess.run([sys.executable, '-c', code], cwd=root, env=env,
+                            capture_output=True, text=True, timeout=120).stdout
+    assert output.split() == ['False', 'True']
@@ -0,0 +1,52 @@
+import sys
+import os
+
+# Добавляем путь к проекту для импорта модулей
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sympy import symbols
+from logic.truth_table import TruthTable, MultiOutputTable
+from logic.truth_table_generator import TruthTableGenerator
+
+
+class TestTruthTable:
+    """Тесты компактной таблицы истинности"""
+
+    def setup_method(self):
+        a, b, c = symbols('a b c')
+        self.generator = TruthTableGenerator((a & b) | c, [a, b, c])
+        self.table = self.generator.generate_compact()
+
+    def test_lazy_rows_match_generate(self):
+        """Ленивый доступ к строкам совпадает с прежним форматом"""
+        rows = self.generator.generate()
+        assert self.table.rows() == rows
+        assert self.table[3] == rows[3]
+        assert self.table[-1] == {'a': True, 'b': True, 'c': True, 'result': True}
+        assert self.table.minterms() == [1, 3, 5, 6, 7]
+
+    def test_analyze_by_popcount(self):
+        """Анализ по количеству единичных битов"""
+        analysis = self.table.analyze()
+        assert analysis['true_results'] == 5
+        assert analysis['false_results'] == 3
+        assert analysis['is_satisfiable'] and not analysis['is_tautology']
+
+    def test_packed_roundtrip(self):
+        """Упаковка в base64/hex и обратно"""
+        for encoding in TruthTable.ENCODINGS:
+            packed = self.table.to_packed(encoding)
+            assert packed['rows'] == 8
+            restored = TruthTable.from_packed(packed)
+            assert restored.bits == self.table.bits
+            assert restored.variables == ['a', 'b', 'c']
+        assert self.table.to_packed('hex')['data'] == 'ea'
+
+    def test_multi_output_packed_roundtrip(self):
+        """Несколько выходов: общие столбцы переменных, упаковка каждого выхода"""
+        table = MultiOutputTable(['a', 'b'], [('s', 0b0110), ('c', 0b1000)])
+        assert table.rows()[3] == {'a': True, 'b': True, 's': False, 'c': True}
+        restored = MultiOutputTable.from_packed(table.to_packed())
+        assert restored.outputs == table.outputs
+        assert restored.output('c').minterms() == [3]
+        assert table.analyze()['s']['true_results'] == 2